@@ -0,0 +1,286 @@
+# benchmarks/fake_system.py
+# Deterministic stand-in for the parts of psutil the backends use.
+#
+# FakeSystem simulates N processes with churn (processes exiting and new PIDs
+# appearing every tick) and scripted counter traces for CPU, memory, disk and
+# network. It is plugged in by swapping the `psutil` attribute of the backend
+# modules (see use()), so the code under test runs unmodified.
+import contextlib
+import math
+import os
+import random
+from collections import namedtuple
+
+pmem = namedtuple("pmem", "rss vms")
+svmem = namedtuple("svmem", "total available percent used free")
+sdiskusage = namedtuple("sdiskusage", "total used free percent")
+snetio = namedtuple("snetio", "bytes_sent bytes_recv packets_sent packets_recv errin errout dropin dropout")
+struct_passwd = namedtuple("struct_passwd", "pw_name pw_uid")
+
+USERS = ("root", "bench", "bench", "bench", "daemon", "www-data", "SYSTEM")
+NAMES = ("python", "bash", "chrome", "firefox", "postgres", "nginx", "java",
+         "node", "systemd", "kworker/0:1", "make", "gcc", "code", "sshd")
+
+
+class Error(Exception):
+    pass
+
+
+class NoSuchProcess(Error):
+    def __init__(self, pid=None):
+        super().__init__(f"process {pid} is gone")
+        self.pid = pid
+
+
+class ZombieProcess(NoSuchProcess):
+    pass
+
+
+class AccessDenied(Error):
+    pass
+
+
+class _Proc:
+    __slots__ = ("pid", "ppid", "name", "user", "create_time", "cpu_time", "rss", "load")
+
+    def __init__(self, pid, ppid, name, user, create_time, rss, load):
+        self.pid = pid
+        self.ppid = ppid
+        self.name = name
+        self.user = user
+        self.create_time = create_time
+        self.cpu_time = 0.0
+        self.rss = rss
+        self.load = load
+
+
+class FakeSystem:
+    """A psutil-shaped module object backed by a seeded simulation."""
+
+    Error = Error
+    NoSuchProcess = NoSuchProcess
+    ZombieProcess = ZombieProcess
+    AccessDenied = AccessDenied
+
+    def __init__(self, n_procs=1000, churn=0.01, seed=1, mem_total=16 << 30, tick_seconds=0.25):
+        self.rng = random.Random(seed)
+        self.churn = churn
+        self.mem_total = mem_total
+        self.tick_seconds = tick_seconds
+        self.now = 1_700_000_000.0
+        self.ticks = 0
+        self.procs = {}
+        self._next_pid = 300
+        self._bytes_sent = 0
+        self._bytes_recv = 0
+        self._spawn(1, 0, "systemd", "root")
+        while len(self.procs) < n_procs:
+            self._spawn_random()
+
+        system = self
+
+        class Process:
+            def __init__(self, pid):
+                p = system.procs.get(pid)
+                if p is None:
+                    raise NoSuchProcess(pid)
+                self.pid = pid
+                self._create_time = p.create_time
+                self._last = None
+
+            def _p(self):
+                p = system.procs.get(self.pid)
+                if p is None or p.create_time != self._create_time:
+                    raise NoSuchProcess(self.pid)
+                return p
+
+            def is_running(self):
+                p = system.procs.get(self.pid)
+                return p is not None and p.create_time == self._create_time
+
+            @contextlib.contextmanager
+            def oneshot(self):
+                yield
+
+            def name(self):
+                return self._p().name
+
+            def username(self):
+                return self._p().user
+
+            def ppid(self):
+                return self._p().ppid
+
+            def create_time(self):
+                return self._create_time
+
+            def memory_info(self):
+                p = self._p()
+                return pmem(p.rss, p.rss * 3)
+
+            def memory_percent(self):
+                return self._p().rss / system.mem_total * 100.0
+
+            def cpu_percent(self, interval=None):
+                p = self._p()
+                last, self._last = self._last, (p.cpu_time, system.now)
+                if last is None or system.now <= last[1]:
+                    return 0.0
+                return round((p.cpu_time - last[0]) / (system.now - last[1]) * 100.0, 1)
+
+            def as_dict(self, attrs=(), ad_value=None):
+                return {a: getattr(self, a)() for a in attrs}
+
+        self.Process = Process
+
+    # ----- simulation
+    def _spawn(self, pid, ppid, name, user):
+        load = self.rng.choice((0.0, 0.0, 0.0, 0.01, 0.05, 0.2, 1.0))
+        rss = int(self.rng.lognormvariate(17, 1.5)) // 4096 * 4096   # whole pages, like the kernel
+        self.procs[pid] = _Proc(pid, ppid, name, user, self.now, rss, load)
+
+    def _spawn_random(self):
+        pid = self._next_pid
+        self._next_pid += self.rng.randint(1, 7)
+        parents = list(self.procs) if len(self.procs) < 64 else None
+        ppid = self.rng.choice(parents) if parents else self.rng.choice(tuple(self.procs)[:256])
+        self._spawn(pid, ppid, self.rng.choice(NAMES), self.rng.choice(USERS))
+
+    def tick(self):
+        """Advance the simulation by one sample interval."""
+        self.ticks += 1
+        self.now += self.tick_seconds
+        rng = self.rng
+        n_churn = int(len(self.procs) * self.churn)
+        if n_churn:
+            victims = rng.sample(sorted(pid for pid in self.procs if pid != 1), n_churn)
+            for pid in victims:
+                del self.procs[pid]
+            for p in self.procs.values():
+                if p.ppid not in self.procs:
+                    p.ppid = 1  # orphans are reparented to init
+            for _ in range(n_churn):
+                self._spawn_random()
+        for p in self.procs.values():
+            if p.load:
+                # whole jiffies (1/100 s), as the kernel accounts CPU time
+                p.cpu_time = round(p.cpu_time + self.tick_seconds * p.load * rng.uniform(0.5, 1.5), 2)
+        self._bytes_recv += int(2e6 * (1 + math.sin(self.ticks / 20.0)))
+        self._bytes_sent += int(4e5 * (1 + math.cos(self.ticks / 15.0)))
+
+    # ----- psutil API
+    def pids(self):
+        return sorted(self.procs)
+
+    def process_iter(self, attrs=None, ad_value=None):
+        for pid in self.pids():
+            p = self.Process(pid)
+            if attrs:
+                p.info = p.as_dict(attrs, ad_value)
+                p.info["pid"] = pid
+            yield p
+
+    def cpu_percent(self, interval=None, percpu=False):
+        value = 35.0 + 30.0 * math.sin(self.ticks / 10.0)
+        return [value] * 8 if percpu else value
+
+    def cpu_count(self, logical=True):
+        return 8
+
+    def virtual_memory(self):
+        used = sum(p.rss for p in self.procs.values()) % self.mem_total
+        return svmem(self.mem_total, self.mem_total - used, used / self.mem_total * 100.0,
+                     used, self.mem_total - used)
+
+    def disk_usage(self, path):
+        return sdiskusage(500 << 30, 200 << 30, 300 << 30, 40.0)
+
+    def net_io_counters(self, pernic=False):
+        io = snetio(self._bytes_sent, self._bytes_recv, 0, 0, 0, 0, 0, 0)
+        return {"eth0": io} if pernic else io
+
+    # ----- synthetic /proc tree for the procfs collector
+    def getpwuid(self, uid):
+        """pwd.getpwuid for the uids write_procfs() uses (index into USERS)."""
+        if not 0 <= uid < len(USERS):
+            raise KeyError(f"getpwuid(): uid not found: {uid}")
+        return struct_passwd(USERS[uid], uid)
+
+    def write_procfs(self, root, clock_ticks=100, page_size=4096):
+        """Write (or refresh) a minimal /proc layout for the current state."""
+        os.makedirs(root, exist_ok=True)
+        live = {str(pid) for pid in self.procs}
+        for entry in os.listdir(root):
+            if entry.isdigit() and entry not in live:
+                for f in os.listdir(os.path.join(root, entry)):
+                    os.remove(os.path.join(root, entry, f))
+                os.rmdir(os.path.join(root, entry))
+        boot = 1_690_000_000
+        with open(os.path.join(root, "meminfo"), "w") as f:
+            f.write(f"MemTotal:       {self.mem_total // 1024} kB\n")
+        with open(os.path.join(root, "stat"), "w") as f:
+            f.write(f"cpu  0 0 0 0 0 0 0 0 0 0\nbtime {boot}\n")
+        os.makedirs(os.path.join(root, "self"), exist_ok=True)
+        open(os.path.join(root, "self", "stat"), "w").close()
+        for pid, p in self.procs.items():
+            d = os.path.join(root, str(pid))
+            os.makedirs(d, exist_ok=True)
+            jiffies = round(p.cpu_time * clock_ticks)
+            start = round((p.create_time - boot) * clock_ticks)
+            uid = USERS.index(p.user)
+            fields = ["S", str(p.ppid)] + ["0"] * 9 + [str(jiffies), "0"] + ["0"] * 6 + [str(start)] + ["0"] * 20
+            with open(os.path.join(d, "stat"), "w") as f:
+                f.write(f"{pid} ({p.name[:15]}) {' '.join(fields)}\n")
+            with open(os.path.join(d, "statm"), "w") as f:
+                f.write(f"{p.rss * 3 // page_size} {p.rss // page_size} 0 0 0 0 0\n")
+            with open(os.path.join(d, "status"), "w") as f:
+                f.write(f"Name:\t{p.name[:15]}\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n")
+            with open(os.path.join(d, "cmdline"), "wb") as f:
+                f.write(p.name.encode() + b"\0")
+
+
+def write_drm_sysfs(root, amd=(), intel=(), partial_amd=0):
+    """A /sys/class/drm layout for SysfsProvider.
+
+    amd: (busy %, vram used, vram total) per card; intel: (act MHz, max MHz)
+    per card; partial_amd: amdgpu cards missing mem_info_vram_used. Every card
+    also gets a connector directory, which the provider must skip. Calling it
+    again with new values rewrites the attributes in place.
+    """
+    def write(path, value):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"{value}\n")
+
+    n = 0
+    for busy, used, total in amd:
+        dev = os.path.join(root, f"card{n}", "device")
+        write(os.path.join(dev, "gpu_busy_percent"), busy)
+        write(os.path.join(dev, "mem_info_vram_used"), used)
+        write(os.path.join(dev, "mem_info_vram_total"), total)
+        n += 1
+    for act, top in intel:
+        card = os.path.join(root, f"card{n}")
+        write(os.path.join(card, "gt_act_freq_mhz"), act)
+        write(os.path.join(card, "gt_RP0_freq_mhz"), top)
+        n += 1
+    for _ in range(partial_amd):
+        dev = os.path.join(root, f"card{n}", "device")
+        write(os.path.join(dev, "gpu_busy_percent"), 100)
+        write(os.path.join(dev, "mem_info_vram_total"), 1 << 30)
+        n += 1
+    for i in range(n):
+        os.makedirs(os.path.join(root, f"card{i}-DP-1"), exist_ok=True)
+
+
+@contextlib.contextmanager
+def use(system, *modules):
+    """Temporarily make `modules` see `system` as their psutil."""
+    saved = [(m, m.psutil) for m in modules]
+    for m in modules:
+        m.psutil = system
+    try:
+        yield system
+    finally:
+        for m, original in saved:
+            m.psutil = original
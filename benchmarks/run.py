@@ -0,0 +1,395 @@
+# benchmarks/run.py
+# Times the hot paths of the dashboard against a deterministic fake system.
+#
+#   python -m benchmarks.run                      # 100 / 1k / 10k processes
+#   python -m benchmarks.run --sizes 1000 --out results.json
+#   python -m benchmarks.run --compare old.json   # also print the ratio to a previous run
+#   python -m benchmarks.run --check              # correctness checks only, exit 1 on a mismatch
+#
+# Each stage is timed on its own: process collection, classification/sort,
+# Treeview reconciliation (against an in-memory tree with Treeview
+# semantics), alert rule evaluation and chart rendering (matplotlib Agg, no
+# display needed).
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fake_system import FakeSystem, use, write_drm_sysfs
+from modules.performance import backend as perf_backend
+from modules.processes import backend as proc_backend
+from modules.processes.table import TreeReconciler, VirtualTable, process_rows
+
+SIZES = (100, 1000, 10000)
+
+
+class FakeTree:
+    """The ttk.Treeview calls TreeReconciler makes, with Tk's index semantics."""
+
+    def __init__(self):
+        self.order = []
+        self.rows = {}
+
+    def insert(self, parent, index, iid, values, tags):
+        self.order.insert(len(self.order) if index == "end" else index, iid)
+        self.rows[iid] = (values, tags)
+
+    def delete(self, *iids):
+        gone = set(iids)
+        self.order = [i for i in self.order if i not in gone]
+        for iid in iids:
+            del self.rows[iid]
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def index(self, iid):
+        return self.order.index(iid)
+
+    def item(self, iid, values, tags):
+        self.rows[iid] = (values, tags)
+
+    # selection / events, as far as VirtualTable uses them
+    def bind(self, sequence, func):
+        pass
+
+    def selection(self):
+        return ()
+
+    def selection_set(self, items):
+        pass
+
+    def focus(self, iid=None):
+        return ""
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def _result(name, n, samples, **extra):
+    samples = sorted(samples)
+    return dict(name=name, n=n, iterations=len(samples),
+                mean_ms=round(statistics.fmean(samples), 4),
+                p50_ms=round(samples[len(samples) // 2], 4),
+                p95_ms=round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+                **extra)
+
+
+def bench_collection(n, repeat):
+    system = FakeSystem(n)
+    registry = proc_backend.ProcessRegistry()
+    with use(system, proc_backend):
+        registry.sample()
+
+        def step():
+            system.tick()
+            registry.sample()
+        return _result("collect.registry", n, _timed(step, repeat))
+
+
+def bench_procfs(n, repeat):
+    from modules.processes.procfs import ProcfsCollector
+    system = FakeSystem(n)
+    with tempfile.TemporaryDirectory() as root:
+        system.write_procfs(root)
+        collector = ProcfsCollector(root, clock_ticks=100, page_size=4096)
+        collector.collect()
+        return _result("collect.procfs", n, _timed(collector.collect, repeat))
+
+
+def check_procfs(n=1000, ticks=8):
+    """The /proc reader must report what the psutil registry does on the same fake system."""
+    from modules.processes.procfs import ProcfsCollector
+    system = FakeSystem(n)
+    registry = proc_backend.ProcessRegistry()
+    problems = []
+    with tempfile.TemporaryDirectory() as root, use(system, proc_backend):
+        collector = ProcfsCollector(root, clock_ticks=100, page_size=4096,
+                                    timer=lambda: system.now, getpwuid=system.getpwuid)
+        for tick in range(ticks):
+            if tick:
+                system.tick()
+            system.write_procfs(root)
+            expected = registry.sample()
+            cols = collector.collect()
+            got = {pid: {"ppid": ppid, "name": name, "user": user, "cpu": cpu, "mem": mem,
+                         "rss": rss, "create_time": created}
+                   for pid, ppid, name, user, cpu, mem, rss, created in zip(
+                       cols["pid"], cols["ppid"], cols["name"], cols["username"], cols["cpu_percent"],
+                       cols["memory_percent"], cols["rss"], cols["create_time"])}
+            if got.keys() != expected.keys():
+                problems.append(f"procfs tick {tick}: pid sets differ by {len(got.keys() ^ expected.keys())}")
+                continue
+            for pid, row in got.items():
+                want = expected[pid]
+                for field, value in row.items():
+                    ok = abs(value - want[field]) < 1e-9 if field == "mem" else value == want[field]
+                    if not ok:
+                        problems.append(f"procfs tick {tick} pid {pid} {field}: {value!r} != {want[field]!r}")
+    return problems
+
+
+def bench_classify(n, repeat):
+    system = FakeSystem(n)
+    registry = proc_backend.ProcessRegistry()
+    with use(system, proc_backend):
+        snapshot = registry.sample()
+    apps_sorter = proc_backend.ProcessSorter("name")
+    cpu_sorter = proc_backend.ProcessSorter("cpu", descending=True)
+
+    def step():
+        apps, system = proc_backend.split_processes(snapshot, "bench")
+        apps_sorter.sort(apps)
+        cpu_sorter.sort(system)
+    results = [_result("classify.split_sort", n, _timed(step, repeat))]
+    top = proc_backend.ProcessSorter("cpu", descending=True, limit=50)
+    results.append(_result("classify.top50_cpu", n, _timed(lambda: top.sort(list(snapshot.values())), repeat)))
+    return results
+
+
+def bench_reconcile(n, repeat):
+    system = FakeSystem(n)
+    registry = proc_backend.ProcessRegistry()
+    tree = FakeTree()
+    rec = TreeReconciler(tree)
+    snapshots = []
+    with use(system, proc_backend):
+        for _ in range(repeat + 1):
+            system.tick()
+            snapshots.append(registry.sample())
+    sorter = proc_backend.ProcessSorter("pid")
+    rows = [process_rows(sorter.sort(proc_backend.split_processes(s, "bench")[1])) for s in snapshots]
+    rec.update(rows[0])
+    calls = []
+    samples = []
+    for r in rows[1:]:
+        start = time.perf_counter()
+        calls.append(rec.update(r))
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return _result("render.tree_reconcile", n, samples, tk_calls=round(statistics.fmean(calls), 1))
+
+
+def bench_virtual_table(n, repeat, visible=20):
+    system = FakeSystem(n)
+    registry = proc_backend.ProcessRegistry()
+    table = VirtualTable(FakeTree())
+    table.visible = visible
+    snapshots = []
+    with use(system, proc_backend):
+        for _ in range(repeat + 1):
+            system.tick()
+            snapshots.append(registry.sample())
+    sorter = proc_backend.ProcessSorter("pid")
+    lists = [sorter.sort(proc_backend.split_processes(s, "bench")[1]) for s in snapshots]
+    table.set_items(lists[0])
+    refresh = iter(lists[1:])
+    results = [_result("render.virtual_refresh", n, _timed(lambda: table.set_items(next(refresh)), repeat))]
+    results.append(_result("render.virtual_scroll", n, _timed(lambda: table.scroll(visible // 2), repeat)))
+    return results
+
+
+def bench_search(n, repeat):
+    from modules.processes.search import ProcessIndex
+    system = FakeSystem(n)
+    registry = proc_backend.ProcessRegistry()
+    index = ProcessIndex()
+    with use(system, proc_backend):
+        index.update(registry.sample())
+        # collection is timed separately; this is the index maintenance only
+        snapshots = []
+        for _ in range(repeat):
+            system.tick()
+            snapshots.append(registry.sample())
+    updates = iter(snapshots)
+    results = [_result("search.index_update", n, _timed(lambda: index.update(next(updates)), repeat))]
+    queries = iter(["c", "ch", "chr", "chro", "chrome", "chrome cpu>0.1", "/^k.*r/", "user:root pid:1000-"] * repeat)
+    results.append(_result("search.query", n, _timed(lambda: index.filter(next(queries)), repeat)))
+    return results
+
+
+def bench_alerts(repeat, rules=500):
+    from modules.alerts.backend import AlertEngine
+    # windowed, held and plain rules over every metric (never started: no sampler)
+    specs = []
+    for i in range(rules):
+        metric = perf_backend.METRICS[i % len(perf_backend.METRICS)]
+        if i % 3 == 0:
+            specs.append(f"avg({metric}, {i % 30 + 1}m) > {i % 90 + 5} for {i % 60}s")
+        elif i % 3 == 1:
+            specs.append(f"max({metric}, {i % 10 + 1}m) > {i % 90 + 5} cooldown 1m")
+        else:
+            specs.append(f"{metric} > {i % 90 + 5} for 30s")
+    engine = AlertEngine(specs, sampler=object())
+    snaps = [dict({m: (i * 7 + j * 13) % 100 for j, m in enumerate(perf_backend.METRICS)}, time=i * 0.25)
+             for i in range(repeat)]
+    feed = iter(snaps)
+    return _result("alerts.evaluate", rules, _timed(lambda: engine.on_performance(next(feed)), repeat))
+
+
+def bench_network_delta(repeat):
+    system = FakeSystem(10)
+    prev = {}
+    with use(system, perf_backend):
+        def step():
+            system.tick()
+            perf_backend.get_network_delta(prev)
+        return _result("collect.network_delta", 1, _timed(step, repeat))
+
+
+def bench_chart(repeat):
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from modules.performance.charts import LineChart, PERCENT
+
+    fig = Figure(figsize=(6, 2.4), dpi=100)
+    ax = fig.add_subplot(111)
+    canvas = FigureCanvasAgg(fig)
+    chart = LineChart(ax, canvas, ("#FF7700",), 120, ylim=PERCENT)
+    rng = np.random.default_rng(1)
+    data = rng.uniform(0, 100, 2000)
+    chart.update(data[:120])
+    frames = iter(range(1, 2000 - 120))
+
+    def step():
+        i = next(frames)
+        chart.update(data[i:i + 120])
+    return _result("render.chart_blit", 120, _timed(step, min(repeat, 1500)))
+
+
+def bench_heat_strip(repeat, cores=128):
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from modules.performance.charts import HeatStrip
+
+    fig = Figure(figsize=(6, 2.4), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    strip = HeatStrip(fig.add_subplot(111), canvas, 60)
+    rng = np.random.default_rng(1)
+    columns = rng.uniform(0, 100, (repeat + 1, cores))
+    strip.update(columns[0])
+    frames = iter(columns[1:])
+    return _result("render.heat_strip", cores, _timed(lambda: strip.update(next(frames)), repeat))
+
+
+def _commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def run(sizes=SIZES, repeat=50, charts=True):
+    results = [bench_network_delta(repeat * 10), bench_alerts(repeat * 10)]
+    for n in sizes:
+        results.append(bench_collection(n, repeat))
+        if os.name == "posix":
+            results.append(bench_procfs(n, max(5, repeat // 5)))
+        results.extend(bench_classify(n, repeat))
+        results.append(bench_reconcile(n, repeat))
+        results.extend(bench_virtual_table(n, repeat))
+        results.extend(bench_search(n, repeat))
+    if charts:
+        try:
+            results.append(bench_chart(repeat * 10))
+            results.append(bench_heat_strip(repeat))
+        except ImportError:
+            pass  # matplotlib not installed
+    return {"commit": _commit(), "python": platform.python_version(),
+            "platform": platform.platform(), "time": time.time(), "results": results}
+
+
+def check_gpu_sysfs():
+    """SysfsProvider on a fake DRM tree: amdgpu + i915 cards, re-reads, a broken card."""
+    from modules.performance.gpu import SysfsProvider
+    problems = []
+    with tempfile.TemporaryDirectory() as root:
+        write_drm_sysfs(root, amd=[(40, 1 << 30, 4 << 30)], intel=[(300, 1200)], partial_amd=1)
+        provider = SysfsProvider(root)
+        try:
+            cards = (len(provider._amd), len(provider._intel))
+            if cards != (1, 1):
+                problems.append(f"gpu sysfs: found {cards} amd/intel cards, expected (1, 1)")
+            # attributes stay open: new values must show up on the next sample
+            for values, want in ((dict(amd=[(40, 1 << 30, 4 << 30)], intel=[(300, 1200)]), (40.0, 25.0)),
+                                 (dict(amd=[(5, 3 << 30, 4 << 30)], intel=[(900, 1200)]), (75.0, 75.0))):
+                write_drm_sysfs(root, **values)
+                got = provider.sample()
+                if got != want:
+                    problems.append(f"gpu sysfs: sample {got} != {want}")
+        finally:
+            provider.close()
+        if SysfsProvider(os.path.join(root, "missing")):
+            problems.append("gpu sysfs: provider without cards is truthy")
+    return problems
+
+
+def check():
+    """Run the correctness checks; returns the list of mismatches."""
+    problems = []
+    if os.name == "posix":
+        problems += check_procfs()
+    problems += check_gpu_sysfs()
+    return problems
+
+
+def compare(current, previous):
+    old = {(r["name"], r["n"]): r for r in previous["results"]}
+    lines = []
+    for r in current["results"]:
+        before = old.get((r["name"], r["n"]))
+        ratio = f"{r['mean_ms'] / before['mean_ms']:.2f}x" if before and before["mean_ms"] else "new"
+        lines.append(f"{r['name']:<24}{r['n']:>7}{r['mean_ms']:>12.3f} ms   {ratio}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated process counts (default: 100,1000,10000)")
+    parser.add_argument("--repeat", type=int, default=50, help="iterations per stage")
+    parser.add_argument("--no-charts", action="store_true", help="skip chart rendering")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--check", action="store_true",
+                        help="only check that alternative implementations agree (exit 1 if not)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check()
+        for line in problems[:50]:
+            print(line)
+        print(f"{len(problems)} mismatch(es)" if problems else "all checks passed")
+        return 1 if problems else 0
+
+    sizes = tuple(int(s) for s in args.sizes.split(",") if s)
+    report = run(sizes, args.repeat, charts=not args.no_charts)
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(report, json.load(f)))
+    else:
+        for r in report["results"]:
+            print(f"{r['name']:<24}{r['n']:>7}{r['mean_ms']:>12.3f} ms  (p95 {r['p95_ms']:.3f})")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
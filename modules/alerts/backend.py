@@ -0,0 +1,369 @@
+# modules/alerts/backend.py
+# Threshold alerts evaluated on every sampler snapshot.
+#
+# Rules are one-liners, e.g.
+#
+#   cpu > 90 for 30s
+#   high load: avg(cpu, 5m) > 75 clear 60 cooldown 15m
+#   proc.rss > 4G                  (any process: the largest RSS is checked)
+#
+# proc.* rules are opt-in (none of DEFAULT_RULES): they keep the process
+# source sampling even while the Processes page is hidden, so the engine only
+# subscribes to it when such a rule exists.
+#
+# Each rule is a small state machine (ok -> pending -> firing -> ok). Window
+# aggregates (avg/max/min over a duration) are kept incrementally in one
+# shared _Window per (function, metric, duration), so a sample costs O(1) per
+# rule, however long the window. For proc.* metrics the snapshot is scanned
+# once per distinct field, not once per rule.
+#
+# A firing rule only resolves once the value crosses its clear level
+# (default: HYSTERESIS below/above the threshold) and does not fire again
+# within its cooldown. Events go to the log file, an optional command and any
+# listeners (the in-app banner).
+import json
+import logging
+import logging.handlers
+import operator
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+
+from modules.utils.sampler import get_sampler
+
+HYSTERESIS = 0.05              # default clear level: 5 % on the safe side
+DEFAULT_COOLDOWN = 300.0       # seconds between two firings of one rule
+DEFAULT_RULES = (
+    "cpu > 90 for 30s",
+    "ram > 95 for 10s",
+    "disk > 95",
+)
+
+Alert = namedtuple("Alert", "rule state value time detail")   # state: "firing" | "resolved"
+
+_UNITS = {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+_SECONDS = {"": 1, "s": 1, "m": 60, "h": 3600}
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+_NUM = r"\d+(?:\.\d+)?[kmgt]?"
+_DUR = r"\d+(?:\.\d+)?[smh]?"
+_RULE = re.compile(rf"""^\s*(?:(?P<name>[^:]+?)\s*:\s*)?
+    (?:(?P<agg>avg|max|min)\(\s*(?P<wmetric>[\w.]+)\s*,\s*(?P<window>{_DUR})\s*\)|(?P<metric>[\w.]+))
+    \s*(?P<op>>=|<=|>|<)\s*(?P<value>{_NUM})
+    (?:\s+for\s+(?P<hold>{_DUR}))?
+    (?:\s+clear\s+(?P<clear>{_NUM}))?
+    (?:\s+cooldown\s+(?P<cooldown>{_DUR}))?\s*$""", re.X | re.I)
+
+
+def _number(text):
+    text = text.lower()
+    unit = text[-1] if text[-1] in _UNITS else ""
+    return float(text[:len(text) - len(unit)]) * _UNITS[unit]
+
+
+def _duration(text):
+    text = text.lower()
+    unit = text[-1] if text[-1] in _SECONDS else ""
+    return float(text[:len(text) - len(unit)]) * _SECONDS[unit]
+
+
+def default_rules_path():
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "sysmon", "alerts.json")
+
+
+def default_log_path():
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "sysmon", "alerts.log")
+
+
+# --------------------------------------------------
+# RULES
+# --------------------------------------------------
+class Rule:
+    __slots__ = ("name", "text", "metric", "agg", "window", "op", "value", "clear",
+                 "hold", "cooldown", "source", "state", "since", "last_fired")
+
+    def __init__(self, text, name=None):
+        m = _RULE.match(text)
+        if not m:
+            raise ValueError(f"cannot parse alert rule: {text!r}")
+        self.text = text.strip()
+        self.name = name or m["name"] or self.text
+        self.metric = (m["metric"] or m["wmetric"]).lower()
+        self.agg = (m["agg"] or "").lower() or None
+        self.window = _duration(m["window"]) if m["window"] else 0.0
+        self.op = m["op"]
+        self.value = _number(m["value"])
+        if m["clear"]:
+            self.clear = _number(m["clear"])
+        else:
+            self.clear = self.value * (1 - HYSTERESIS if self.op[0] == ">" else 1 + HYSTERESIS)
+        self.hold = _duration(m["hold"]) if m["hold"] else 0.0
+        self.cooldown = _duration(m["cooldown"]) if m["cooldown"] else DEFAULT_COOLDOWN
+        self.source = "processes" if self.metric.startswith("proc.") else "performance"
+        self.state = "ok"
+        self.since = None          # start of the current breach
+        self.last_fired = float("-inf")
+
+    @property
+    def series(self):
+        """Key of the (possibly aggregated) series this rule reads."""
+        # proc.* ">" and "<" rules see different series (largest vs. smallest)
+        side = self.op[0] if self.source == "processes" else None
+        return (self.agg, self.metric, self.window, side)
+
+    def evaluate(self, value, now):
+        """Advance the state machine; returns "firing"/"resolved" on a transition."""
+        if self.state == "firing":
+            recovered = value < self.clear if self.op[0] == ">" else value > self.clear
+            if recovered:
+                self.state, self.since = "ok", None
+                return "resolved"
+            return None
+        if not _OPS[self.op](value, self.value):
+            self.since = None
+            return None
+        if self.since is None:
+            self.since = now
+        if now - self.since >= self.hold and now - self.last_fired >= self.cooldown:
+            self.state, self.last_fired = "firing", now
+            return "firing"
+        return None
+
+
+class _Window:
+    """avg/max/min of the last `seconds` of a series, updated in O(1) amortized."""
+
+    __slots__ = ("agg", "seconds", "_samples", "_sum", "_extremes")
+
+    def __init__(self, agg, seconds):
+        self.agg = agg
+        self.seconds = seconds
+        self._samples = deque()    # (time, value)
+        self._sum = 0.0
+        self._extremes = deque()   # monotonic candidates for max/min
+
+    def push(self, now, value):
+        self._samples.append((now, value))
+        self._sum += value
+        if self.agg != "avg":
+            better = operator.ge if self.agg == "max" else operator.le
+            ext = self._extremes
+            while ext and better(value, ext[-1][1]):
+                ext.pop()
+            ext.append((now, value))
+        horizon = now - self.seconds
+        samples = self._samples
+        while samples[0][0] <= horizon:
+            self._sum -= samples.popleft()[1]
+        while self._extremes and self._extremes[0][0] <= horizon:
+            self._extremes.popleft()
+        if self.agg == "avg":
+            return self._sum / len(samples)
+        return self._extremes[0][1]
+
+
+# --------------------------------------------------
+# SINKS
+# --------------------------------------------------
+def _describe(alert):
+    detail = f" ({alert.detail})" if alert.detail else ""
+    return f"{alert.state.upper()} {alert.rule.name}: {alert.rule.metric} = {alert.value:.10g}{detail}"
+
+
+class LogSink:
+    """Appends one line per event to a size-rotated log file."""
+
+    def __init__(self, path, max_bytes=1024 * 1024, backup_count=3):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+
+    def __call__(self, alert):
+        self._handler.emit(logging.makeLogRecord({"msg": _describe(alert), "created": alert.time}))
+
+    def close(self):
+        self._handler.close()
+
+
+class CommandSink:
+    """Runs a local command per event, alert details in SYSMON_ALERT_* variables.
+
+    The command is started without a shell and never waited for; finished
+    children are reaped on the next event.
+    """
+
+    def __init__(self, argv):
+        self.argv = list(argv)
+        self._children = []
+
+    def __call__(self, alert):
+        self._children = [p for p in self._children if p.poll() is None]
+        env = dict(os.environ,
+                   SYSMON_ALERT_NAME=alert.rule.name, SYSMON_ALERT_RULE=alert.rule.text,
+                   SYSMON_ALERT_STATE=alert.state, SYSMON_ALERT_METRIC=alert.rule.metric,
+                   SYSMON_ALERT_VALUE=f"{alert.value:.10g}", SYSMON_ALERT_DETAIL=alert.detail or "",
+                   SYSMON_ALERT_TIME=f"{alert.time:.3f}")
+        try:
+            self._children.append(subprocess.Popen(self.argv, env=env, stdin=subprocess.DEVNULL,
+                                                   close_fds=True))
+        except OSError as e:
+            logging.getLogger(__name__).warning("alert command failed: %s", e)
+
+    def close(self):
+        pass
+
+
+# --------------------------------------------------
+# ENGINE
+# --------------------------------------------------
+class AlertEngine:
+    def __init__(self, rules, sinks=(), sampler=None):
+        self.rules = [r if isinstance(r, Rule) else Rule(r) for r in rules]
+        self.sinks = list(sinks)
+        self.sampler = sampler or get_sampler()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._windows = {}
+        for rule in self.rules:
+            if rule.agg and rule.series not in self._windows:
+                self._windows[rule.series] = _Window(rule.agg, rule.window)
+        # rules grouped by source, each source's series computed once per snapshot
+        self._by_source = {}
+        for rule in self.rules:
+            self._by_source.setdefault(rule.source, []).append(rule)
+        proc_rules = self._by_source.get("processes", ())
+        self._proc_high = [r for r in proc_rules if r.op[0] == ">"]
+        self._proc_low = [r for r in proc_rules if r.op[0] == "<"]
+        self._proc_fields = sorted({r.metric[5:] for r in proc_rules})
+
+    @classmethod
+    def from_config(cls, path=None, log_path=None, command=None, sampler=None):
+        """Engine for the rules in `path` (JSON), or DEFAULT_RULES if it doesn't exist.
+
+        The file holds {"rules": [...], "log": path, "command": [argv]}; a rule
+        is a rule string or {"rule": ..., "name": ...}.
+        """
+        path = path or default_rules_path()
+        config = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+        rules = []
+        for entry in config.get("rules", DEFAULT_RULES):
+            if isinstance(entry, dict) and isinstance(entry.get("rule"), str):
+                rules.append(Rule(entry["rule"], entry.get("name")))
+            elif isinstance(entry, str):
+                rules.append(Rule(entry))
+            else:
+                raise ValueError(f"bad rule entry: {entry!r}")
+        sinks = [LogSink(log_path or config.get("log") or default_log_path())]
+        command = command or config.get("command")
+        if command:
+            sinks.append(CommandSink(shlex.split(command) if isinstance(command, str) else command))
+        return cls(rules, sinks, sampler)
+
+    def add_listener(self, callback):
+        """callback(alert) from the sampler thread on every firing/resolved event."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def active(self):
+        """Rules currently firing."""
+        return [r for r in self.rules if r.state == "firing"]
+
+    # ----- evaluation (sampler thread)
+    def _evaluate(self, rules, values, details, now):
+        windows = self._windows
+        computed = {}
+        for rule in rules:
+            key = rule.series
+            value = computed.get(key)
+            if value is None:
+                raw = values.get(rule.metric)
+                if raw is None:
+                    continue
+                value = computed[key] = windows[key].push(now, raw) if rule.agg else raw
+            state = rule.evaluate(value, now)
+            if state is not None:
+                self._emit(Alert(rule, state, value, now, details.get(rule.metric)))
+
+    def _emit(self, alert):
+        with self._lock:
+            targets = self.sinks + self._listeners
+        for sink in targets:
+            try:
+                sink(alert)
+            except Exception:
+                logging.getLogger(__name__).exception("alert sink failed")
+
+    def on_performance(self, snap):
+        rules = self._by_source.get("performance")
+        if rules:
+            self._evaluate(rules, snap, {}, snap["time"] if "time" in snap else time.time())
+
+    def on_processes(self, snapshot):
+        if not self._proc_fields:
+            return
+        high, low, high_detail, low_detail = {}, {}, {}, {}
+        procs = snapshot.values()
+        for field in self._proc_fields:
+            # one pass per field serves every rule on it: ">" rules read the
+            # largest value, "<" rules the smallest
+            hi = lo = None
+            for p in procs:
+                v = p.get(field)
+                if v is None:
+                    continue
+                if hi is None or v > hi[field]:
+                    hi = p
+                if lo is None or v < lo[field]:
+                    lo = p
+            if hi is not None:
+                key = "proc." + field
+                high[key], high_detail[key] = hi[field], f"{hi['name']} [{hi['pid']}]"
+                low[key], low_detail[key] = lo[field], f"{lo['name']} [{lo['pid']}]"
+        now = time.time()
+        if self._proc_high:
+            self._evaluate(self._proc_high, high, high_detail, now)
+        if self._proc_low:
+            self._evaluate(self._proc_low, low, low_detail, now)
+
+    def start(self, processes=True):
+        """Subscribe to the sources the rules need; processes=False leaves proc.* rules idle."""
+        for source, callback in (("performance", self.on_performance), ("processes", self.on_processes)):
+            if self._by_source.get(source) and (processes or source != "processes"):
+                self.sampler.subscribe(source, callback)
+        return self
+
+    def stop(self):
+        self.sampler.unsubscribe("performance", self.on_performance)
+        self.sampler.unsubscribe("processes", self.on_processes)
+        for sink in self.sinks:
+            sink.close()
+
+
+_engine = None
+
+
+def start_engine(path=None, log_path=None, command=None, processes=True):
+    """Create and start the process-wide engine (see AlertEngine.from_config)."""
+    global _engine
+    if _engine is None:
+        _engine = AlertEngine.from_config(path, log_path, command).start(processes)
+    return _engine
+
+
+def get_engine():
+    """The running engine, or None if alerts are off."""
+    return _engine
@@ -0,0 +1,53 @@
+# modules/alerts/ui.py
+# Banner across the top of the window while any alert rule is firing.
+import customtkinter as ctk
+from modules import styles
+
+
+class AlertBanner:
+    def __init__(self, root, engine, before=None):
+        self.root = root
+        self.engine = engine
+        self.before = before
+        self._dismissed = set()   # rule names hidden until they fire again
+
+        self.frame = ctk.CTkFrame(root, fg_color=styles.NEON_PINK, corner_radius=0, height=34)
+        self.label = ctk.CTkLabel(self.frame, text="", text_color=styles.TEXT_PRIMARY,
+                                  font=ctk.CTkFont(size=13, weight="bold"), anchor="w")
+        self.label.pack(side="left", fill="x", expand=True, padx=12, pady=4)
+        ctk.CTkButton(self.frame, text="✕", width=28, height=24, fg_color="transparent",
+                      hover_color=styles.CARD_BG_ALT, text_color=styles.TEXT_PRIMARY,
+                      command=self.dismiss).pack(side="right", padx=8)
+        self._shown = False
+        engine.add_listener(self._on_alert)
+        self._refresh()
+
+    def _on_alert(self, alert):
+        # sampler thread -> Tk thread
+        self.root.after(0, self._refresh, alert)
+
+    def _refresh(self, alert=None):
+        if alert is not None and alert.state == "firing":
+            self._dismissed.discard(alert.rule.name)
+        firing = [r for r in self.engine.active() if r.name not in self._dismissed]
+        if not firing:
+            if self._shown:
+                self.frame.pack_forget()
+                self._shown = False
+            return
+        text = f"⚠  {firing[-1].name}"
+        if alert is not None and alert.state == "firing" and alert.detail:
+            text += f" — {alert.detail}"
+        if len(firing) > 1:
+            text += f"   (+{len(firing) - 1} more)"
+        self.label.configure(text=text)
+        if not self._shown:
+            self.frame.pack(side="top", fill="x", before=self.before)
+            self._shown = True
+
+    def dismiss(self):
+        self._dismissed.update(r.name for r in self.engine.active())
+        self._refresh()
+
+    def dispose(self):
+        self.engine.remove_listener(self._on_alert)
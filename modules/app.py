@@ -0,0 +1,170 @@
+# modules/app.py
+# GUI shell: sidebar + content area hosting one page at a time.
+#
+# Only the shell is imported up front. The window paints first; page modules
+# (matplotlib for Performance, etc.) are imported when a page is first shown,
+# and the rest are preloaded one per idle step afterwards.
+import sys
+import customtkinter as ctk
+
+from modules import styles
+from modules.utils.pages import PageManager
+from modules.utils import startup_profile
+
+PRELOAD_DELAY_MS = 300   # after the first page is up
+PRELOAD_STEP_MS = 50     # between two preloaded page modules
+
+ctk.set_appearance_mode("dark")
+ctk.set_default_color_theme("dark-blue")
+
+
+class MainApp:
+    def __init__(self, root, budget_ms=None, alerts=None):
+        self.root = root
+        self.budget_ms = budget_ms
+        self.exit_code = 0
+        self.root.title("System Monitoring Dashboard")
+        self.root.geometry("1400x820")
+        self.root.minsize(1100, 700)
+
+        self._create_sidebar()
+        self._create_content_area()
+        # pages are built on first visit and then kept alive (hidden + paused)
+        self.pages = PageManager(self.content, {
+            "performance": "modules.performance.ui:PerformanceUI",
+            "processes": "modules.processes.ui:ProcessesUI",
+            "startup": "modules.startup.ui:StartupUI",
+            "settings": "modules.settings.ui:SettingsUI",  # lightweight placeholder
+        })
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.banner = None
+        self.impact = None
+
+        # paint the shell before any heavy page module is imported
+        self.root.update()
+        startup_profile.mark("first paint")
+        self.show_performance()
+        startup_profile.mark("first page ready")
+        if alerts is not None:
+            self._start_alerts(alerts)
+        self.root.after(PRELOAD_DELAY_MS, self._preload_next)
+
+    def _create_sidebar(self):
+        self.sidebar = ctk.CTkFrame(self.root, fg_color=styles.SIDEBAR_BG, width=220, corner_radius=0)
+        self.sidebar.pack(side="left", fill="y")
+        self.sidebar.pack_propagate(False)
+
+        # Title
+        title_frame = ctk.CTkFrame(self.sidebar, fg_color=styles.SIDEBAR_BG)
+        title_frame.pack(fill="x", padx=18, pady=(18, 8))
+        ctk.CTkLabel(title_frame, text="DASHBOARD", font=ctk.CTkFont(size=26, weight="bold"),
+                     text_color=styles.TEXT_PRIMARY).pack(anchor="w")
+        ctk.CTkLabel(title_frame, text="System Monitor", font=ctk.CTkFont(size=11),
+                     text_color=styles.NEON_ORANGE).pack(anchor="w", pady=(2, 4))
+
+        btn_kwargs = dict(width=180, height=44, corner_radius=10)
+        self.btn_perf = ctk.CTkButton(self.sidebar, text="Performance", command=self.show_performance,
+                                      fg_color=styles.NEON_ORANGE, text_color=styles.TEXT_PRIMARY,
+                                      font=ctk.CTkFont(size=14, weight="bold"), **btn_kwargs)
+        self.btn_perf.pack(padx=18, pady=(6, 8))
+
+        self.btn_proc = ctk.CTkButton(self.sidebar, text="Processes", command=self.show_processes,
+                                      fg_color=styles.SIDEBAR_BG, hover_color=styles.CARD_BG_ALT,
+                                      text_color=styles.TEXT_PRIMARY, font=ctk.CTkFont(size=14, weight="bold"),
+                                      **btn_kwargs)
+        self.btn_proc.pack(padx=18, pady=6)
+
+        self.btn_startup = ctk.CTkButton(self.sidebar, text="Startup Apps", command=self.show_startup,
+                                         fg_color=styles.SIDEBAR_BG, hover_color=styles.CARD_BG_ALT,
+                                         text_color=styles.TEXT_PRIMARY, font=ctk.CTkFont(size=14, weight="bold"),
+                                         **btn_kwargs)
+        self.btn_startup.pack(padx=18, pady=6)
+
+        self.btn_settings = ctk.CTkButton(self.sidebar, text="Settings", command=self.show_settings,
+                                          fg_color=styles.SIDEBAR_BG, hover_color=styles.CARD_BG_ALT,
+                                          text_color=styles.TEXT_PRIMARY, font=ctk.CTkFont(size=14, weight="bold"),
+                                          **btn_kwargs)
+        self.btn_settings.pack(padx=18, pady=6)
+
+        ctk.CTkLabel(self.sidebar, text="v1.0 • MONITORING ACTIVE", text_color=styles.TEXT_MUTED,
+                     font=ctk.CTkFont(size=9)).pack(side="bottom", pady=12)
+
+    def _create_content_area(self):
+        self.content = ctk.CTkFrame(self.root, fg_color=styles.BG_MAIN)
+        self.content.pack(side="right", fill="both", expand=True)
+
+    def _start_alerts(self, alerts):
+        # after first paint: the engine pulls in the sampler and its backends
+        from modules.alerts.backend import start_engine
+        from modules.alerts.ui import AlertBanner
+        try:
+            engine = start_engine(*alerts)
+        except (OSError, ValueError) as e:
+            print(f"alerts disabled: {e}", file=sys.stderr)
+            return
+        self.banner = AlertBanner(self.root, engine, before=self.content)
+
+    def _start_impact(self):
+        # measured against boot/login time, so starting after the preload loses
+        # nothing; its first pass (full process scan + startup entries) stays
+        # out of startup
+        from modules.startup import impact
+        self.impact = impact.get_tracker().start()
+
+    def _preload_next(self):
+        pending = self.pages.pending()
+        if pending:
+            self.pages.load(pending[0])
+            self.root.after(PRELOAD_STEP_MS, self._preload_next)
+            return
+        self._start_impact()
+        if startup_profile.enabled():
+            startup_profile.mark("preload done")
+            self._report_startup()
+
+    def _report_startup(self):
+        text, ok = startup_profile.report(self.budget_ms)
+        print(text, file=sys.stderr)
+        if self.budget_ms is not None:
+            # budget check mode: report and quit with a status code
+            self.exit_code = 0 if ok else 1
+            self._on_close()
+
+    def _on_close(self):
+        if self.banner is not None:
+            self.banner.dispose()
+            self.banner.engine.stop()
+        if self.impact is not None:
+            self.impact.stop()
+        self.pages.dispose()
+        self.root.destroy()
+
+    def _highlight_button(self, active_btn):
+        for b in (self.btn_perf, self.btn_proc, self.btn_startup, self.btn_settings):
+            b.configure(fg_color=styles.SIDEBAR_BG)
+        active_btn.configure(fg_color=styles.NEON_ORANGE)
+
+    def show_performance(self):
+        self._highlight_button(self.btn_perf)
+        self.pages.show("performance")
+
+    def show_processes(self):
+        self._highlight_button(self.btn_proc)
+        self.pages.show("processes")
+
+    def show_startup(self):
+        self._highlight_button(self.btn_startup)
+        self.pages.show("startup")
+
+    def show_settings(self):
+        self._highlight_button(self.btn_settings)
+        self.pages.show("settings")
+
+
+def run(budget_ms=None, alerts=None):
+    with startup_profile.phase("create window"):
+        root = ctk.CTk()
+    with startup_profile.phase("build shell"):
+        app = MainApp(root, budget_ms, alerts)
+    root.mainloop()
+    return app.exit_code
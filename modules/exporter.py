@@ -0,0 +1,135 @@
+# modules/exporter.py
+# Local OpenMetrics (Prometheus) endpoint.
+#
+# The exporter subscribes to the shared sampler and keeps the latest
+# performance and process snapshots. Scrapes never call psutil: the text
+# exposition is rendered at most once per new snapshot and every scrape in
+# between is served the same cached bytes.
+import heapq
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from modules.utils.sampler import get_sampler
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9464
+TOP_N = 10
+
+# (snapshot key, metric name, help)
+PERF_GAUGES = (
+    ("cpu", "sysmon_cpu_utilization_percent", "Total CPU utilization."),
+    ("ram", "sysmon_memory_utilization_percent", "Physical memory in use."),
+    ("disk", "sysmon_disk_utilization_percent", "Used space on the root filesystem."),
+    ("disk_read", "sysmon_disk_read_kilobytes_per_second", "Read throughput over all physical disks."),
+    ("disk_write", "sysmon_disk_write_kilobytes_per_second", "Write throughput over all physical disks."),
+    ("disk_iops", "sysmon_disk_operations_per_second", "Read plus write operations per second."),
+    ("disk_busy", "sysmon_disk_busy_percent", "Busy time of the busiest disk."),
+    ("disk_await", "sysmon_disk_await_milliseconds", "Average time per disk operation."),
+    ("net_down", "sysmon_network_receive_kilobytes_per_second", "Network receive rate."),
+    ("net_up", "sysmon_network_transmit_kilobytes_per_second", "Network transmit rate."),
+    ("gpu", "sysmon_gpu_utilization_percent", "GPU utilization."),
+    ("gpu_mem", "sysmon_gpu_memory_utilization_percent", "GPU memory in use."),
+)
+PROC_GAUGES = (
+    ("cpu", "sysmon_process_cpu_percent", "CPU usage of the busiest processes (100 = one core)."),
+    ("mem", "sysmon_process_memory_percent", "Memory share of the busiest processes."),
+    ("rss", "sysmon_process_resident_memory_bytes", "Resident set size of the busiest processes."),
+    ("io_read", "sysmon_process_read_bytes_per_second", "Disk read rate of the busiest processes."),
+    ("io_write", "sysmon_process_write_bytes_per_second", "Disk write rate of the busiest processes."),
+    ("conns", "sysmon_process_connections", "Open TCP/UDP connections of the busiest processes."),
+    ("fds", "sysmon_process_open_fds", "Open file descriptors of the busiest processes."),
+)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(perf, procs, top=TOP_N):
+    """OpenMetrics text for the given snapshots (either may be None)."""
+    out = []
+    if perf is not None:
+        for key, name, help_text in PERF_GAUGES:
+            if key not in perf:
+                continue
+            out.append(f"# TYPE {name} gauge\n# HELP {name} {help_text}\n{name} {float(perf[key])}\n")
+        out.append("# TYPE sysmon_sample_timestamp_seconds gauge\n"
+                   "# HELP sysmon_sample_timestamp_seconds Time of the last performance sample.\n"
+                   f"sysmon_sample_timestamp_seconds {perf['time']}\n")
+    if procs is not None:
+        out.append("# TYPE sysmon_processes gauge\n# HELP sysmon_processes Number of processes.\n"
+                   f"sysmon_processes {len(procs)}\n")
+        busiest = heapq.nlargest(top, procs.values(), key=lambda p: p["cpu"])
+        for key, name, help_text in PROC_GAUGES:
+            out.append(f"# TYPE {name} gauge\n# HELP {name} {help_text}\n")
+            for p in busiest:
+                labels = f'pid="{p["pid"]}",name="{_escape(p["name"])}",user="{_escape(p["user"])}"'
+                out.append(f"{name}{{{labels}}} {float(p.get(key) or 0)}\n")
+    out.append("# EOF\n")
+    return "".join(out).encode("utf-8")
+
+
+class MetricsExporter:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, top=TOP_N, sampler=None):
+        self.host = host
+        self.port = port
+        self.top = top
+        self.sampler = sampler or get_sampler()
+        self._perf = None
+        self._procs = None
+        self._body = render(None, None)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._server = None
+
+    # sampler callbacks: only swap references, rendering happens on demand
+    def _on_perf(self, snap):
+        self._perf = snap
+        self._dirty = True
+
+    def _on_procs(self, snapshot):
+        self._procs = snapshot
+        self._dirty = True
+
+    def body(self):
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self._dirty = False
+                    self._body = render(self._perf, self._procs, self.top)
+        return self._body
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.body()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self.sampler.subscribe("performance", self._on_perf)
+        self.sampler.subscribe("processes", self._on_procs)
+        threading.Thread(target=self._server.serve_forever, name="exporter", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.sampler.unsubscribe("performance", self._on_perf)
+        self.sampler.unsubscribe("processes", self._on_procs)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
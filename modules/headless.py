@@ -0,0 +1,214 @@
+# modules/headless.py
+# Display-less collector: streams samples as newline-delimited JSON.
+#
+# Only the backends and the shared sampler are used here; nothing in this
+# module (or what it imports) pulls in tkinter, customtkinter or matplotlib.
+# The backends themselves are imported in run(), so building the argument
+# parser for the GUI stays cheap.
+import heapq
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+
+PROC_FIELDS = ("pid", "name", "user", "cpu", "mem")
+
+
+def add_arguments(parser):
+    group = parser.add_argument_group("headless mode")
+    group.add_argument("--interval", type=float, default=1.0,
+                       help="seconds between performance samples (default: 1.0)")
+    group.add_argument("--proc-interval", type=float, default=5.0,
+                       help="seconds between process samples, 0 disables (default: 5.0)")
+    group.add_argument("--fields",
+                       help="comma separated performance fields to emit (default: all)")
+    group.add_argument("--top", type=int, default=10,
+                       help="emit the N busiest processes per process sample (default: 10)")
+    group.add_argument("--proc-fields", default=",".join(PROC_FIELDS),
+                       help="comma separated process fields to emit")
+    group.add_argument("--collector", choices=("psutil", "procfs"), default="psutil",
+                       help="process enumerator (procfs is Linux only)")
+    group.add_argument("--output", default="-",
+                       help="output file, '-' for stdout (default)")
+    group.add_argument("--max-bytes", type=int, default=10 * 1024 * 1024,
+                       help="rotate the output file at this size (default: 10 MiB)")
+    group.add_argument("--backup-count", type=int, default=5,
+                       help="rotated files to keep (default: 5)")
+    group.add_argument("--count", type=int, default=0,
+                       help="stop after this many performance samples (default: run forever)")
+    group.add_argument("--replay", type=float, metavar="MINUTES",
+                       help="instead of sampling, emit the on-disk history starting MINUTES ago")
+    group.add_argument("--replay-until", type=float, default=0.0, metavar="MINUTES",
+                       help="end of the replay window, in minutes ago (default: now)")
+    group.add_argument("--speed", type=float, default=0.0,
+                       help="replay pacing: 1 = real time, 0 = as fast as possible (default)")
+
+
+def _split(fields):
+    return tuple(f.strip() for f in fields.split(",") if f.strip())
+
+
+class _RotatingFile(logging.handlers.RotatingFileHandler):
+    def handleError(self, record):
+        raise   # let JsonLinesWriter see the write error instead of logging it
+
+
+class JsonLinesWriter:
+    """Thread-safe line writer to stdout or a size-rotated file.
+
+    The first failed write (closed pipe, full disk) is kept in `error`,
+    on_error(exc) is called once and every later write is dropped.
+    """
+
+    def __init__(self, path="-", max_bytes=0, backup_count=0, on_error=None):
+        self._lock = threading.Lock()
+        self._handler = None
+        self.on_error = on_error
+        self.error = None
+        if path != "-":
+            self._handler = _RotatingFile(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def write(self, record):
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if self.error is not None:
+                return
+            try:
+                if self._handler is None:
+                    sys.stdout.write(line + "\n")
+                    sys.stdout.flush()
+                else:
+                    self._handler.emit(logging.makeLogRecord({"msg": line}))
+            except OSError as e:
+                self.error = e
+                if self._handler is None:
+                    # the reader is gone: keep the exit-time flush from failing again
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        if self.error is not None and self.on_error is not None:
+            self.on_error(self.error)
+
+    def close(self):
+        if self._handler is not None:
+            try:
+                self._handler.close()
+            except OSError as e:
+                self.error = self.error or e
+
+
+def _write_failed(writer):
+    """Exit status for a run whose output may have failed."""
+    if writer.error is None:
+        return 0
+    if not isinstance(writer.error, BrokenPipeError):
+        print(f"output: {writer.error}", file=sys.stderr)
+    return 1
+
+
+def replay(args, fields, writer):
+    from modules.performance import backend as perf_backend
+    from modules.performance.history import HistoryReader
+    if not perf_backend.HISTORY_DIR:
+        print("on-disk history is disabled", file=sys.stderr)
+        return 1
+    reader = HistoryReader(perf_backend.HISTORY_DIR)
+    now = time.time()
+    try:
+        for t, values in reader.replay(now - args.replay * 60, now - args.replay_until * 60, args.speed):
+            record = {"type": "performance", "time": round(t, 3)}
+            for f in fields:
+                if f in values:
+                    record[f] = round(values[f], 2)
+            writer.write(record)
+            if writer.error is not None:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    return _write_failed(writer)
+
+
+def run(args, alerts=None):
+    from modules.utils.sampler import get_sampler
+    from modules.performance import backend as perf_backend
+    from modules.processes import backend as proc_backend
+
+    fields = _split(args.fields) if args.fields else perf_backend.METRICS
+    unknown = [f for f in fields if f not in perf_backend.METRICS]
+    if unknown:
+        print(f"unknown field(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if args.replay is not None:
+        writer = JsonLinesWriter(args.output, args.max_bytes, args.backup_count)
+        try:
+            return replay(args, fields, writer)
+        finally:
+            writer.close()
+    proc_fields = _split(args.proc_fields)
+    proc_backend.set_collector(args.collector)
+    sampler = get_sampler()
+    sampler.set_interval("performance", args.interval)
+    if args.proc_interval > 0:
+        sampler.set_interval("processes", args.proc_interval)
+
+    # alert rules run on the sources configured above; with --proc-interval 0
+    # proc.* rules stay idle instead of sampling processes behind our back
+    wanted = set(proc_fields)
+    if alerts:
+        from modules.alerts.backend import start_engine
+        try:
+            engine = start_engine(*alerts, processes=args.proc_interval > 0)
+        except (OSError, ValueError) as e:
+            print(f"alerts: {e}", file=sys.stderr)
+            return 2
+        proc_rules = [r for r in engine.rules if r.source == "processes"]
+        if proc_rules and args.proc_interval <= 0:
+            print("alerts: process rules ignored (--proc-interval 0)", file=sys.stderr)
+        wanted.update(r.metric[len("proc."):] for r in proc_rules)
+    # the budgeted I/O / connection / FD sampling only when something reads those fields
+    from modules.processes.resources import FIELDS as RESOURCE_FIELDS
+    proc_backend.set_resource_sampling(bool(wanted & set(RESOURCE_FIELDS)) or bool(args.metrics_port))
+
+    done = threading.Event()
+    # a failed write (e.g. `| head` exited) ends the run
+    writer = JsonLinesWriter(args.output, args.max_bytes, args.backup_count,
+                             on_error=lambda e: done.set())
+    emitted = [0]
+
+    def on_perf(snap):
+        record = {"type": "performance", "time": round(snap["time"], 3)}
+        for f in fields:
+            record[f] = round(snap[f], 2)
+        writer.write(record)
+        emitted[0] += 1
+        if args.count and emitted[0] >= args.count:
+            done.set()
+
+    def on_procs(snapshot):
+        top = heapq.nlargest(args.top, snapshot.values(), key=lambda p: p["cpu"]) if args.top else ()
+        writer.write({
+            "type": "processes",
+            "time": round(time.time(), 3),
+            "count": len(snapshot),
+            "top": [{f: p.get(f) for f in proc_fields} for p in top],
+        })
+
+    sampler.subscribe("performance", on_perf)
+    if args.proc_interval > 0:
+        sampler.subscribe("processes", on_procs)
+
+    try:
+        while not done.wait(0.5):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.unsubscribe("performance", on_perf)
+        sampler.unsubscribe("processes", on_procs)
+        writer.close()
+    return _write_failed(writer)
@@ -2,6 +2,12 @@
 import psutil
 import platform
 import time
+import atexit
+import numpy as np
+from modules.performance.store import MetricStore
+from modules.performance import history
+from modules.performance import gpu
+from modules.performance.devices import DISK_FIELDS, is_physical_disk
 
 def get_cpu_percent():
     return psutil.cpu_percent(interval=None)
@@ -16,15 +22,139 @@ def get_disk_percent(path="/"):
         return 0.0
 
 def get_network_delta(prev):
+    """Download and upload KB/s since the previous call."""
     io = psutil.net_io_counters()
     sent = io.bytes_sent
     recv = io.bytes_recv
+    now = time.monotonic()
+    dt = now - prev.get("time", now)
     down_kb = max(0.0, (recv - prev.get("recv", recv)) / 1024.0)
     up_kb = max(0.0, (sent - prev.get("sent", sent)) / 1024.0)
     prev["recv"] = recv
     prev["sent"] = sent
-    return down_kb, up_kb
+    prev["time"] = now
+    if dt <= 0:
+        return 0.0, 0.0
+    return down_kb / dt, up_kb / dt
+
+def get_disk_io_delta(prev):
+    """Disk I/O over all physical disks since the previous call.
+
+    Returns read KB/s, write KB/s, operations/s, busy % of the busiest disk and
+    the average time an operation took (await, ms).
+    """
+    try:
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+    except Exception:
+        counters = {}
+    names = tuple(n for n in counters if is_physical_disk(n))
+    now = time.monotonic()
+    values = np.array([[getattr(counters[n], f, 0) for f in DISK_FIELDS] for n in names],
+                      dtype=np.float64).reshape(len(names), len(DISK_FIELDS))
+    last = prev.get("values")
+    dt = now - prev.get("time", now)
+    same = prev.get("names") == names
+    prev["time"], prev["names"], prev["values"] = now, names, values
+    if last is None or not same or dt <= 0 or not names:
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+
+    d = np.maximum(values - last, 0.0)
+    rb, wb, rc, wc, rt, wt, _ = d.sum(axis=0)
+    ops = rc + wc
+    busy = min(100.0, float(d[:, 6].max()) / (dt * 1000.0) * 100.0)
+    wait = (rt + wt) / ops if ops else 0.0
+    return float(rb / 1024.0 / dt), float(wb / 1024.0 / dt), float(ops / dt), busy, float(wait)
 
 def get_gpu_metrics_placeholder():
     # GPU not available: return zeros
     return 0.0, 0.0
+
+def gpu_available():
+    """True if a GPU provider was detected (detection runs once and is cached)."""
+    return gpu.get_provider() is not None
+
+def get_gpu_metrics():
+    """(utilization %, memory used %); zeros without a GPU or on a read error."""
+    provider = gpu.get_provider()
+    if provider is None:
+        return 0.0, 0.0
+    try:
+        return provider.sample()
+    except (OSError, ValueError, ZeroDivisionError):
+        return 0.0, 0.0
+
+# -------- snapshot source for the shared sampler (modules/utils/sampler.py)
+SAMPLE_INTERVAL = 0.25  # seconds
+METRICS = ("cpu", "ram", "disk", "gpu", "gpu_mem", "net_down", "net_up",
+           "disk_read", "disk_write", "disk_iops", "disk_busy", "disk_await")
+
+# every sample lands here (raw ring + 1 s / 10 s / 1 min rollups)
+store = MetricStore(METRICS)
+
+_prev_net = {}
+_prev_disk = {}
+
+# on-disk history (modules/performance/history.py); set HISTORY_DIR = None to disable
+HISTORY_DIR = history.default_dir()
+SEED_SECONDS = 600  # history replayed into the store on startup
+_history = None
+_history_failed = False
+
+def _history_writer():
+    global _history, _history_failed
+    if _history is None and HISTORY_DIR and not _history_failed:
+        try:
+            _history = history.HistoryWriter(HISTORY_DIR, METRICS)
+            atexit.register(_history.close)
+            _seed_store()
+        except OSError:
+            _history_failed = True  # read-only home etc.: keep running without disk history
+    return _history
+
+def _seed_store():
+    # last few minutes from disk, so the charts are not empty after a restart
+    reader = history.HistoryReader(HISTORY_DIR)
+    # fields=METRICS: segments from before a metric existed read it as NaN
+    recs = reader.read(time.time() - SEED_SECONDS, fields=METRICS)
+    for rec in recs:
+        store.record(float(rec["time"]), {n: float(rec[n]) for n in METRICS})
+    reader.close()
+
+_reader = None
+
+def read_history(seconds, fields=METRICS):
+    """Records of the last `seconds` from disk (structured array, oldest first).
+
+    The newest few seconds may still be in the writer's batch buffer.
+    """
+    global _reader
+    if not HISTORY_DIR:
+        return None
+    if _reader is None:
+        _reader = history.HistoryReader(HISTORY_DIR)
+    return _reader.read(time.time() - seconds, fields=fields)
+
+def sample():
+    down, up = get_network_delta(_prev_net)
+    disk_read, disk_write, disk_iops, disk_busy, disk_await = get_disk_io_delta(_prev_disk)
+    gpu_util, gpu_mem = get_gpu_metrics()
+    snap = {
+        "time": time.time(),
+        "cpu": get_cpu_percent(),
+        "ram": get_ram_percent(),
+        "disk": get_disk_percent(),
+        "gpu": gpu_util,
+        "gpu_mem": gpu_mem,
+        "net_down": down,
+        "net_up": up,
+        "disk_read": disk_read,
+        "disk_write": disk_write,
+        "disk_iops": disk_iops,
+        "disk_busy": disk_busy,
+        "disk_await": disk_await,
+    }
+    writer = _history_writer()
+    store.record(snap["time"], snap)
+    if writer is not None:
+        writer.append(snap["time"], snap)
+    return snap
@@ -0,0 +1,161 @@
+# modules/performance/charts.py
+# Blitted line charts for the performance page.
+#
+# Artists (lines + gradient fills) are created once and updated in place.
+# A full canvas.draw() only happens on the first frame, on resize and when
+# the y-limits change; every other frame restores the cached background and
+# blits the axes region.
+import numpy as np
+from matplotlib.collections import PolyCollection
+from modules import styles
+
+PERCENT = (0.0, 100.0)
+
+
+def nice_ceil(value):
+    """Round up to 1/2/5 x 10^n so autoscaled limits don't jitter."""
+    if value <= 0:
+        return 1.0
+    exp = np.floor(np.log10(value))
+    base = 10.0 ** exp
+    for step in (1.0, 2.0, 5.0, 10.0):
+        if value <= step * base:
+            return step * base
+    return 10.0 * base
+
+
+class LineChart:
+    def __init__(self, ax, canvas, colors, maxlen, ylim=None, fill_alpha=(0.12, 0.08)):
+        self.ax = ax
+        self.canvas = canvas
+        self.fixed_ylim = ylim
+        self._bg = None
+
+        ax.set_ylim(*(ylim or (0.0, 1.0)))
+        self.lines = []
+        self.fills = []
+        for i, color in enumerate(colors):
+            line, = ax.plot([], [], color=color, linewidth=styles.GRAPH_LINEWIDTH, animated=True)
+            fill = PolyCollection([], facecolors=color, edgecolors="none",
+                                  alpha=fill_alpha[min(i, len(fill_alpha) - 1)], animated=True)
+            ax.add_collection(fill, autolim=False)
+            self.lines.append(line)
+            self.fills.append(fill)
+        self._allocate(maxlen)
+
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _allocate(self, maxlen):
+        self.maxlen = maxlen
+        x = np.arange(maxlen, dtype=float)
+        self.ax.set_xlim(0, maxlen - 1)
+        # one y buffer per series; NaN = no sample yet (lines skip NaN)
+        self._y = np.full((len(self.lines), maxlen), np.nan)
+        self._fill_y = []
+        for i, (line, fill) in enumerate(zip(self.lines, self.fills)):
+            line.set_data(x, self._y[i])
+            # polygon: baseline right->left, then the data left->right
+            verts = np.zeros((2 * maxlen, 2))
+            verts[:maxlen, 0] = x[::-1]
+            verts[maxlen:, 0] = x
+            fill.set_verts([verts])
+            # write straight into the path's vertex array (no new Path per frame)
+            self._fill_y.append(fill.get_paths()[0].vertices[maxlen:2 * maxlen, 1])
+
+    def set_window(self, maxlen):
+        """Change how many points the chart shows (forces one full redraw)."""
+        if maxlen != self.maxlen:
+            self._allocate(maxlen)
+            self._bg = None
+
+    def _on_draw(self, event):
+        # full redraw (first frame, resize, limits changed): re-cache the
+        # static background, then paint the animated artists on top
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for fill in self.fills:
+            self.ax.draw_artist(fill)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def _wanted_ylim(self, peak):
+        if self.fixed_ylim:
+            return self.fixed_ylim
+        lo, top = self.ax.get_ylim()
+        # grow immediately, shrink only once the data fell well below the top
+        if peak > top or peak < top * 0.3:
+            return (0.0, nice_ceil(peak * 1.15))
+        return (lo, top)
+
+    def update(self, *series):
+        """Plot the latest samples of each series (sequence, newest last)."""
+        peak = 0.0
+        for i, data in enumerate(series):
+            n = min(len(data), self.maxlen)
+            y = self._y[i]
+            fill_y = self._fill_y[i]
+            if n:
+                tail = data if n == len(data) else data[-n:]
+                y[self.maxlen - n:] = tail
+                fill_y[self.maxlen - n:] = tail
+                peak = max(peak, float(np.nanmax(y)))
+            y[:self.maxlen - n] = np.nan
+            fill_y[:self.maxlen - n] = 0.0
+            self.lines[i].set_ydata(y)
+
+        ylim = self._wanted_ylim(peak)
+        if self._bg is None or ylim != self.ax.get_ylim():
+            self.ax.set_ylim(*ylim)
+            self.canvas.draw()   # fires draw_event -> _on_draw
+            return
+
+        self.canvas.restore_region(self._bg)
+        self._draw_artists()
+        self.canvas.blit(self.ax.bbox)
+
+
+class HeatStrip:
+    """Rows x time heat map (e.g. one row per CPU core), blitted like LineChart.
+
+    One AxesImage holds the whole matrix, so a frame is one set_data() and one
+    image draw whether there are 4 cores or 128.
+    """
+
+    def __init__(self, ax, canvas, width, vmax=100.0, cmap="inferno"):
+        self.ax = ax
+        self.canvas = canvas
+        self.width = width
+        self._bg = None
+        self._data = np.zeros((1, width), dtype=np.float32)
+        self.image = ax.imshow(self._data, aspect="auto", interpolation="nearest", cmap=cmap,
+                               vmin=0.0, vmax=vmax, origin="upper", animated=True)
+        ax.set_xticks([])
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.image)
+
+    def update(self, column):
+        """Append one column (a value per row); rows may appear or disappear."""
+        column = np.asarray(column, dtype=np.float32)
+        rows = len(column)
+        if not rows:
+            return
+        if rows != self._data.shape[0]:
+            self._data = np.zeros((rows, self.width), dtype=np.float32)
+            self.image.set_extent((-0.5, self.width - 0.5, rows - 0.5, -0.5))
+            self.ax.set_yticks(range(0, rows, max(1, rows // 8)))
+            self._bg = None
+        self._data[:, :-1] = self._data[:, 1:]
+        self._data[:, -1] = column
+        self.image.set_data(self._data)
+
+        if self._bg is None:
+            self.canvas.draw()   # fires draw_event -> _on_draw
+            return
+        self.canvas.restore_region(self._bg)
+        self.ax.draw_artist(self.image)
+        self.canvas.blit(self.ax.bbox)
@@ -0,0 +1,126 @@
+# modules/performance/devices.py
+# Per-core CPU, per-disk and per-NIC rates.
+#
+# Each tick reads the three psutil counter tables once, turns them into NumPy
+# matrices (one row per core / disk / interface) and gets every rate from a
+# single vectorized delta against the previous matrix. When the set of devices
+# changes (hotplug, interface up/down) the rows are realigned by name, and
+# counters that went backwards (wrap, driver reset) count as zero.
+import re
+import time
+
+import numpy as np
+import psutil
+
+SAMPLE_INTERVAL = 1.0  # seconds
+
+# read_time/write_time/busy_time are milliseconds spent (busy_time: Linux only)
+DISK_FIELDS = ("read_bytes", "write_bytes", "read_count", "write_count",
+               "read_time", "write_time", "busy_time")
+NIC_FIELDS = ("bytes_recv", "bytes_sent")
+
+# partitions and virtual block devices would double count their disk
+_SKIP_DISK = re.compile(r"^(loop|ram|zram|dm-|md\d+p)|^(sd|vd|hd|xvd)[a-z]+\d+$|^(nvme\d+n\d+|mmcblk\d+)p\d+$")
+_SKIP_NIC = ("lo",)
+
+
+def is_physical_disk(name):
+    """False for partitions and loop/ram/dm devices, which would double count I/O."""
+    return not _SKIP_DISK.search(name)
+
+
+class _Counters:
+    """Previous counter matrix for one device table, keyed by row names."""
+
+    def __init__(self):
+        self.names = ()
+        self.values = None
+
+    def rates(self, names, values, dt):
+        """Per-second deltas, same row order as names."""
+        prev_names, prev = self.names, self.values
+        self.names, self.values = names, values
+        if prev is None or dt <= 0:
+            return np.zeros_like(values)
+        if names != prev_names:
+            # realign: rows that are new this tick have no previous value
+            where = {n: i for i, n in enumerate(prev_names)}
+            aligned = np.array(values, copy=True)
+            for i, n in enumerate(names):
+                if n in where:
+                    aligned[i] = prev[where[n]]
+            prev = aligned
+        return np.maximum(values - prev, 0.0) / dt
+
+
+class DeviceSampler:
+    def __init__(self):
+        self._cpu = None       # previous cpu_times matrix
+        self._mounts = None    # MountTable, opened on first sample
+        self._disks = _Counters()
+        self._nics = _Counters()
+        self._last = None
+
+    def _cores(self):
+        times = psutil.cpu_times(percpu=True)
+        if not times:
+            return np.zeros(0)
+        fields = times[0]._fields
+        m = np.array(times, dtype=np.float64)
+        # guest time is already part of user/nice on Linux
+        total_cols = [i for i, f in enumerate(fields) if f not in ("guest", "guest_nice")]
+        idle_cols = [i for i, f in enumerate(fields) if f in ("idle", "iowait")]
+        prev, self._cpu = self._cpu, m
+        if prev is None or prev.shape != m.shape:
+            return np.zeros(len(m))
+        d = np.maximum(m - prev, 0.0)
+        total = d[:, total_cols].sum(axis=1)
+        idle = d[:, idle_cols].sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            busy = np.where(total > 0, (total - idle) / total * 100.0, 0.0)
+        return np.clip(busy, 0.0, 100.0)
+
+    @staticmethod
+    def _table(counters, fields, skip):
+        names = tuple(sorted(n for n in counters if not skip(n)))
+        values = np.array([[getattr(counters[n], f, 0) for f in fields] for n in names],
+                          dtype=np.float64).reshape(len(names), len(fields))
+        return names, values
+
+    def sample(self):
+        """{"time", "cores", "disks", "nics", "mounts"}.
+
+        cores: busy % per core. disks: (names, [n, len(DISK_FIELDS)]) with
+        every column per second (the *_time columns in ms/s). nics: (names,
+        [n, 2]) bytes per second. mounts: [(mountpoint, % used, disk or None)].
+        """
+        if self._mounts is None:
+            from modules.performance.mounts import MountTable
+            self._mounts = MountTable()
+        now = time.monotonic()
+        dt = now - self._last if self._last is not None else 0.0
+        self._last = now
+
+        try:
+            disks = psutil.disk_io_counters(perdisk=True) or {}
+        except Exception:
+            disks = {}   # e.g. no /proc/diskstats in containers
+        disk_names, disk_values = self._table(disks, DISK_FIELDS, lambda n: not is_physical_disk(n))
+        nics = psutil.net_io_counters(pernic=True) or {}
+        nic_names, nic_values = self._table(nics, NIC_FIELDS, lambda n: n in _SKIP_NIC)
+
+        return {
+            "time": time.time(),
+            "cores": self._cores(),
+            "disks": (disk_names, self._disks.rates(disk_names, disk_values, dt)),
+            "nics": (nic_names, self._nics.rates(nic_names, nic_values, dt)),
+            "mounts": self._mounts.usage(),
+        }
+
+
+_sampler = DeviceSampler()
+
+
+def sample():
+    """Snapshot source for the shared sampler."""
+    return _sampler.sample()
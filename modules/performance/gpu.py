@@ -0,0 +1,160 @@
+# modules/performance/gpu.py
+# GPU utilization / memory providers.
+#
+#   NvmlProvider   NVIDIA, through the optional pynvml package
+#   SysfsProvider  Linux DRM sysfs: amdgpu (gpu_busy_percent, mem_info_vram_*)
+#                  and i915 (actual vs. max GT frequency as a load estimate;
+#                  integrated GPUs have no dedicated memory to report)
+#
+# detect() is run once and cached by get_provider(); None means no GPU, in
+# which case callers skip GPU sampling and hide the GPU charts altogether.
+import abc
+import contextlib
+import glob
+import os
+import threading
+
+DRM_ROOT = "/sys/class/drm"
+
+
+class GpuProvider(abc.ABC):
+    name = "none"
+
+    @abc.abstractmethod
+    def sample(self):
+        """(utilization %, memory used %) over all GPUs of this provider."""
+
+    def close(self):
+        pass
+
+
+class _SysfsValue:
+    """A sysfs attribute kept open and re-read from offset 0."""
+
+    __slots__ = ("_f",)
+
+    def __init__(self, path):
+        self._f = open(path, "rb", buffering=0)
+
+    def read(self):
+        self._f.seek(0)
+        return float(self._f.read().split()[0])
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_all(*paths):
+    """_SysfsValues for all paths; none stay open if one of them can't be opened."""
+    with contextlib.ExitStack() as stack:
+        values = tuple(stack.enter_context(_SysfsValue(p)) for p in paths)
+        stack.pop_all()
+    return values
+
+
+class SysfsProvider(GpuProvider):
+    name = "sysfs"
+
+    def __init__(self, root=DRM_ROOT):
+        self._amd = []    # (busy, vram_used, vram_total)
+        self._intel = []  # (act_freq, max_freq)
+        for card in sorted(glob.glob(os.path.join(root, "card[0-9]*"))):
+            if "-" in os.path.basename(card):
+                continue  # connectors: card0-DP-1 ...
+            dev = os.path.join(card, "device")
+            try:
+                if os.path.exists(os.path.join(dev, "gpu_busy_percent")):
+                    self._amd.append(_open_all(os.path.join(dev, "gpu_busy_percent"),
+                                               os.path.join(dev, "mem_info_vram_used"),
+                                               os.path.join(dev, "mem_info_vram_total")))
+                elif os.path.exists(os.path.join(card, "gt_act_freq_mhz")):
+                    self._intel.append(_open_all(os.path.join(card, "gt_act_freq_mhz"),
+                                                 os.path.join(card, "gt_RP0_freq_mhz")))
+            except OSError:
+                continue  # unreadable attribute: treat the card as absent
+
+    def __bool__(self):
+        return bool(self._amd or self._intel)
+
+    def sample(self):
+        busy = []
+        used = total = 0.0
+        for b, u, t in self._amd:
+            busy.append(b.read())
+            used += u.read()
+            total += t.read()
+        for act, top in self._intel:
+            peak = top.read()
+            busy.append(act.read() / peak * 100.0 if peak else 0.0)
+        util = max(busy) if busy else 0.0
+        return min(util, 100.0), (used / total * 100.0 if total else 0.0)
+
+    def close(self):
+        for values in self._amd + self._intel:
+            for v in values:
+                v.close()
+        self._amd, self._intel = [], []
+
+
+class NvmlProvider(GpuProvider):
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml   # optional dependency
+        pynvml.nvmlInit()
+        self._nvml = pynvml
+        self._handles = [pynvml.nvmlDeviceGetHandleByIndex(i)
+                         for i in range(pynvml.nvmlDeviceGetCount())]
+
+    def __bool__(self):
+        return bool(self._handles)
+
+    def sample(self):
+        nvml = self._nvml
+        util = 0.0
+        used = total = 0
+        for h in self._handles:
+            util = max(util, float(nvml.nvmlDeviceGetUtilizationRates(h).gpu))
+            mem = nvml.nvmlDeviceGetMemoryInfo(h)
+            used += mem.used
+            total += mem.total
+        return util, (used / total * 100.0 if total else 0.0)
+
+    def close(self):
+        self._nvml.nvmlShutdown()
+
+
+def detect(drm_root=DRM_ROOT):
+    """First provider that finds a GPU, or None."""
+    try:
+        nvml = NvmlProvider()
+        if nvml:
+            return nvml
+        nvml.close()
+    except Exception:
+        pass  # pynvml missing, no driver, no device
+    sysfs = SysfsProvider(drm_root)
+    if sysfs:
+        return sysfs
+    return None
+
+
+_provider = None
+_detected = False
+_lock = threading.Lock()
+
+
+def get_provider():
+    """The cached provider (detection runs on the first call only)."""
+    global _provider, _detected
+    with _lock:
+        if not _detected:
+            _provider = detect()
+            _detected = True
+        return _provider
@@ -0,0 +1,273 @@
+# modules/performance/history.py
+# Append-only on-disk metric history.
+#
+# Samples are fixed-size records (float64 time + one float32 per metric) in
+# memory-mapped segment files, one segment per SEGMENT_SECONDS of wall time.
+# The writer buffers samples and copies them into the map in batches, so at
+# 4 Hz the disk sees one small dirty-page write-back every few seconds.
+# Segments older than the retention period are deleted on rotation.
+#
+# Segment layout: HEADER_SIZE bytes of header (magic, count, capacity,
+# JSON field list), then `capacity` records.
+import glob
+import json
+import logging
+import os
+import struct
+import time
+import numpy as np
+
+MAGIC = b"SMHIST01"
+HEADER_SIZE = 512
+_HEAD = struct.Struct("<8sQQ")       # magic, record count, capacity
+SEGMENT_SECONDS = 3600
+RETENTION_SECONDS = 7 * 24 * 3600
+MAX_RATE = 4                         # samples per second a segment is sized for
+FLUSH_RECORDS = 20                   # batch size (5 s at 4 Hz)
+FLUSH_SECONDS = 5.0
+
+
+def record_dtype(fields):
+    return np.dtype([("time", "<f8")] + [(f, "<f4") for f in fields])
+
+
+def _select(recs, fields):
+    """recs with exactly `fields`; ones the segment predates read as NaN."""
+    out = np.full(len(recs), np.nan, dtype=record_dtype(fields))
+    out["time"] = recs["time"]
+    for f in fields:
+        if f in recs.dtype.names:
+            out[f] = recs[f]
+    return out
+
+
+def default_dir():
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "sysmon", "history")
+
+
+class _Segment:
+    def __init__(self, path, fields=None, capacity=0):
+        self.path = path
+        if fields is not None and not os.path.exists(path):
+            self._create(fields, capacity)
+        with open(path, "rb") as f:
+            magic, count, capacity = _HEAD.unpack(f.read(_HEAD.size))
+            if magic != MAGIC:
+                raise ValueError(f"not a history segment: {path}")
+            names = f.read(HEADER_SIZE - _HEAD.size).rstrip(b"\0")
+        self.fields = tuple(json.loads(names))
+        self.dtype = record_dtype(self.fields)
+        self.capacity = capacity
+        self._count = count
+        self._map = None
+
+    def _create(self, fields, capacity):
+        names = json.dumps(list(fields)).encode()
+        if _HEAD.size + len(names) > HEADER_SIZE:
+            raise ValueError("too many fields for the segment header")
+        with open(self.path, "wb") as f:
+            f.write(_HEAD.pack(MAGIC, 0, capacity) + names.ljust(HEADER_SIZE - _HEAD.size, b"\0"))
+            f.truncate(HEADER_SIZE + capacity * record_dtype(fields).itemsize)  # sparse
+
+    def records(self, mode="r"):
+        if self._map is None or (mode == "r+" and self._map.mode != "r+"):
+            self._map = np.memmap(self.path, dtype=self.dtype, mode=mode,
+                                  offset=HEADER_SIZE, shape=(self.capacity,))
+        return self._map[:self._count]
+
+    def refresh(self):
+        """Pick up records appended by a writer in another object/process."""
+        with open(self.path, "rb") as f:
+            self._count = _HEAD.unpack(f.read(_HEAD.size))[1]
+
+    def append(self, rows):
+        """rows: structured array of self.dtype. Returns how many fit."""
+        n = min(len(rows), self.capacity - self._count)
+        if n <= 0:
+            return 0
+        self.records("r+")
+        self._map[self._count:self._count + n] = rows[:n]
+        self._count += n
+        # count goes into the header only after the records are in place
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<Q", self._count))
+        return n
+
+    def full(self):
+        return self._count >= self.capacity
+
+    def close(self):
+        if self._map is not None:
+            if self._map.mode == "r+":
+                self._map.flush()
+            self._map = None
+
+
+def _segment_paths(directory):
+    """(start, path) of the segments in directory, oldest first.
+
+    Segments are <start>.hist or <start>.<n>.hist; other *.hist names are
+    not ours and are skipped.
+    """
+    found = []
+    for path in glob.glob(os.path.join(directory, "*.hist")):
+        parts = os.path.basename(path).split(".")
+        try:
+            key = int(parts[0]), int(parts[1]) if len(parts) > 2 else 0
+        except ValueError:
+            continue
+        found.append((key, path))
+    found.sort()
+    return [(key[0], path) for key, path in found]
+
+
+class HistoryWriter:
+    def __init__(self, directory, fields, segment_seconds=SEGMENT_SECONDS,
+                 retention_seconds=RETENTION_SECONDS, flush_records=FLUSH_RECORDS,
+                 flush_seconds=FLUSH_SECONDS):
+        self.directory = directory
+        self.fields = tuple(fields)
+        self.dtype = record_dtype(self.fields)
+        self.segment_seconds = segment_seconds
+        self.retention_seconds = retention_seconds
+        self.flush_records = flush_records
+        self.flush_seconds = flush_seconds
+        self._pending = np.zeros(flush_records, dtype=self.dtype)
+        self._n = 0
+        self._last_flush = time.monotonic()
+        self._segment = None
+        self._segment_start = None
+        os.makedirs(directory, exist_ok=True)
+
+    def append(self, t, values):
+        row = self._pending[self._n]
+        row["time"] = t
+        for f in self.fields:
+            row[f] = values.get(f, 0.0)
+        self._n += 1
+        if self._n >= self.flush_records or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        rows = self._pending[:self._n]
+        try:
+            while len(rows):
+                seg = self._segment_for(float(rows[0]["time"]))
+                # never let one segment span two time windows
+                window_end = self._segment_start + self.segment_seconds
+                cut = int(np.searchsorted(rows["time"], window_end))
+                written = seg.append(rows[:max(cut, 1)])
+                rows = rows[written:]
+        except OSError as e:
+            # disk full / no permission: drop this batch, keep sampling
+            logging.getLogger(__name__).warning("history: dropped %d samples: %s", len(rows), e)
+        finally:
+            self._n = 0
+
+    def _segment_for(self, t):
+        start = int(t // self.segment_seconds) * self.segment_seconds
+        seg = self._segment
+        if seg is not None and start == self._segment_start and not seg.full():
+            return seg
+        if seg is not None:
+            seg.close()
+        if start != self._segment_start:
+            self._segment_start = start
+            self.prune(t)
+        capacity = self.segment_seconds * MAX_RATE
+        n = 0
+        while True:
+            name = f"{start}.hist" if n == 0 else f"{start}.{n}.hist"
+            path = os.path.join(self.directory, name)
+            try:
+                seg = _Segment(path, self.fields, capacity)
+            except ValueError:
+                seg = None
+            if seg is not None and seg.fields == self.fields and not seg.full():
+                break
+            if seg is not None:
+                seg.close()
+            n += 1
+        self._segment = seg
+        return seg
+
+    def prune(self, now=None):
+        """Delete segments whose whole time window is past the retention period."""
+        cutoff = (now or time.time()) - self.retention_seconds
+        for start, path in _segment_paths(self.directory):
+            if start + self.segment_seconds > cutoff:
+                break
+            if self._segment is not None and path == self._segment.path:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        self.flush()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+
+class HistoryReader:
+    def __init__(self, directory, segment_seconds=SEGMENT_SECONDS):
+        self.directory = directory
+        self.segment_seconds = segment_seconds
+        self._segments = {}   # path -> _Segment (maps stay open between reads)
+
+    def _segment(self, path):
+        seg = self._segments.get(path)
+        if seg is None:
+            seg = self._segments[path] = _Segment(path)
+        else:
+            seg.refresh()
+        return seg
+
+    def read(self, start, end=None, fields=None):
+        """Records with start <= time < end, oldest first, as a structured array."""
+        end = time.time() if end is None else end
+        parts = []
+        for seg_start, path in _segment_paths(self.directory):
+            if seg_start + self.segment_seconds <= start or seg_start >= end:
+                continue
+            try:
+                recs = self._segment(path).records()
+            except (OSError, ValueError):
+                continue
+            lo, hi = np.searchsorted(recs["time"], (start, end))
+            if hi > lo:
+                part = recs[lo:hi]
+                if fields:
+                    part = _select(part, fields)
+                parts.append(part)
+        live = {path for _, path in _segment_paths(self.directory)}
+        for path in [p for p in self._segments if p not in live]:
+            self._segments.pop(path).close()
+        if not parts:
+            return np.zeros(0, dtype=record_dtype(fields or ()))
+        if len(parts) == 1:
+            return parts[0]
+        # segments written with a different metric set are skipped
+        return np.concatenate([p for p in parts if p.dtype == parts[0].dtype])
+
+    def replay(self, start, end=None, speed=0.0):
+        """Yield (time, {field: value}) records; speed > 0 paces them in real time."""
+        recs = self.read(start, end)
+        names = [n for n in recs.dtype.names if n != "time"]
+        prev = None
+        for rec in recs:
+            t = float(rec["time"])
+            if speed > 0 and prev is not None:
+                time.sleep(max(0.0, (t - prev) / speed))
+            prev = t
+            yield t, {n: float(rec[n]) for n in names}
+
+    def close(self):
+        for seg in self._segments.values():
+            seg.close()
+        self._segments.clear()
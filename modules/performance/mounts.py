@@ -0,0 +1,113 @@
+# modules/performance/mounts.py
+# Mounted filesystems and the block device behind each one.
+#
+# On Linux the table comes from /proc/self/mountinfo, which is only re-read
+# when the kernel flags it: the file is kept open and polled for POLLPRI,
+# which fires on every mount/umount in our namespace. Elsewhere it falls back
+# to psutil.disk_partitions() every FALLBACK_SECONDS.
+import os
+import re
+import select
+import time
+from collections import namedtuple
+
+import psutil
+
+MOUNTINFO = "/proc/self/mountinfo"
+FALLBACK_SECONDS = 30.0
+
+Mount = namedtuple("Mount", "mountpoint device fstype disk")
+
+
+_OCTAL = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape(field):
+    # mountinfo escapes space, tab, newline and backslash as \ooo
+    return _OCTAL.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+def _disk_of(major_minor):
+    """Whole-disk name for a device number (a partition's parent), or None."""
+    path = os.path.realpath(f"/sys/dev/block/{major_minor}")
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(os.path.join(path, "partition")):
+        path = os.path.dirname(path)
+    return os.path.basename(path)
+
+
+def parse_mountinfo(text):
+    """Mounts backed by a block device; bind mounts of subdirectories are skipped."""
+    mounts = {}
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            sep = fields.index("-", 6)
+        except ValueError:
+            continue
+        major_minor, root, mountpoint = fields[2], fields[3], _unescape(fields[4])
+        fstype, source = fields[sep + 1], _unescape(fields[sep + 2])
+        block = source.startswith("/dev/") or not major_minor.startswith("0:")
+        if root != "/" or not block:
+            continue
+        # a later line for the same mount point shadows the earlier one
+        mounts[mountpoint] = Mount(mountpoint, source, fstype, _disk_of(major_minor))
+    return list(mounts.values())
+
+
+class MountTable:
+    def __init__(self, path=MOUNTINFO):
+        self._mounts = []
+        self._file = None
+        self._poll = None
+        self._due = 0.0
+        try:
+            self._file = open(path)
+            self._poll = select.poll()
+            self._poll.register(self._file, select.POLLPRI | select.POLLERR)
+        except (OSError, AttributeError):   # no procfs / no poll() (Windows)
+            self._file = self._poll = None
+        self._reload()
+
+    def _reload(self):
+        if self._file is not None:
+            # reading through the polled descriptor also clears the event
+            self._file.seek(0)
+            self._mounts = parse_mountinfo(self._file.read())
+            return
+        try:
+            parts = psutil.disk_partitions(all=False)
+        except Exception:
+            parts = []
+        self._mounts = [Mount(p.mountpoint, p.device, p.fstype, None) for p in parts]
+        self._due = time.monotonic() + FALLBACK_SECONDS
+
+    def changed(self):
+        if self._poll is not None:
+            return bool(self._poll.poll(0))
+        return time.monotonic() >= self._due
+
+    def mounts(self):
+        """Current mounts (re-read only if the mount table changed)."""
+        if self.changed():
+            self._reload()
+        return self._mounts
+
+    def usage(self):
+        """[(mountpoint, percent used, disk)] for every mount that can be stat'ed.
+
+        disk is the whole-disk name as in disk_io_counters(perdisk=True), or None.
+        """
+        out = []
+        for m in self.mounts():
+            try:
+                out.append((m.mountpoint, psutil.disk_usage(m.mountpoint).percent, m.disk))
+            except (OSError, PermissionError):
+                continue
+        return out
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = self._poll = None
@@ -0,0 +1,127 @@
+# modules/performance/store.py
+# Preallocated NumPy ring buffers for metric history.
+#
+# Raw samples are kept for a few minutes; every sample is also folded into
+# 1 s / 10 s / 1 min min/avg/max tiers so hours of history fit in a fixed
+# amount of memory. Readers get zero-copy views, oldest sample first.
+import math
+import numpy as np
+
+RAW_CAPACITY = 1200                              # 5 min at 4 Hz
+TIERS = ((1, 3600), (10, 2160), (60, 1440))      # (bucket seconds, buckets): 1 h, 6 h, 24 h
+
+
+class RingBuffer:
+    """Fixed-capacity ring whose contents are always one contiguous slice.
+
+    Each value is written at i and i + capacity, so view() never has to copy
+    or concatenate around the wrap point.
+    """
+    __slots__ = ("capacity", "count", "_buf", "_pos")
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = capacity
+        self.count = 0
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._pos = 0
+
+    def append(self, value):
+        pos = self._pos
+        self._buf[pos] = value
+        self._buf[pos + self.capacity] = value
+        self._pos = (pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def view(self, last=None):
+        n = self.count if last is None else min(last, self.count)
+        end = self._pos + self.capacity
+        return self._buf[end - n:end]
+
+    def last(self, default=0.0):
+        if not self.count:
+            return default
+        return self._buf[self._pos + self.capacity - 1]
+
+    def __len__(self):
+        return self.count
+
+
+class _Tier:
+    """min/avg/max per fixed-width time bucket for every metric of a store."""
+
+    def __init__(self, width, capacity, names):
+        self.width = width
+        self.times = RingBuffer(capacity)
+        self.min = {n: RingBuffer(capacity) for n in names}
+        self.avg = {n: RingBuffer(capacity) for n in names}
+        self.max = {n: RingBuffer(capacity) for n in names}
+        self._bucket = None
+        self._n = 0
+        self._sum = dict.fromkeys(names, 0.0)
+        self._lo = dict.fromkeys(names, math.inf)
+        self._hi = dict.fromkeys(names, -math.inf)
+
+    def add(self, t, values):
+        bucket = int(t // self.width)
+        if bucket != self._bucket:
+            self.flush()
+            self._bucket = bucket
+        self._n += 1
+        lo, hi, total = self._lo, self._hi, self._sum
+        for name in total:
+            v = values.get(name, 0.0)
+            total[name] += v
+            if v < lo[name]:
+                lo[name] = v
+            if v > hi[name]:
+                hi[name] = v
+
+    def flush(self):
+        if not self._n:
+            return
+        self.times.append(self._bucket * self.width)
+        for name in self._sum:
+            self.min[name].append(self._lo[name])
+            self.avg[name].append(self._sum[name] / self._n)
+            self.max[name].append(self._hi[name])
+            self._sum[name] = 0.0
+            self._lo[name] = math.inf
+            self._hi[name] = -math.inf
+        self._n = 0
+
+
+class MetricStore:
+    def __init__(self, names, raw_capacity=RAW_CAPACITY, tiers=TIERS):
+        self.names = tuple(names)
+        self.times = RingBuffer(raw_capacity)
+        self._raw = {n: RingBuffer(raw_capacity) for n in self.names}
+        self._tiers = {width: _Tier(width, cap, self.names) for width, cap in tiers}
+
+    def record(self, t, values):
+        """Append one sample; `values` maps metric name -> number (extra keys ignored)."""
+        self.times.append(t)
+        for name, ring in self._raw.items():
+            ring.append(values.get(name, 0.0))
+        for tier in self._tiers.values():
+            tier.add(t, values)
+
+    def view(self, name, last=None):
+        """Raw samples of one metric, oldest first (read-only use)."""
+        return self._raw[name].view(last)
+
+    def last(self, name, default=0.0):
+        return self._raw[name].last(default)
+
+    def rollup(self, name, width):
+        """(times, min, avg, max) views of a rollup tier; the open bucket is not included."""
+        tier = self._tiers[width]
+        return tier.times.view(), tier.min[name].view(), tier.avg[name].view(), tier.max[name].view()
+
+    def nbytes(self):
+        total = self.times._buf.nbytes + sum(r._buf.nbytes for r in self._raw.values())
+        for tier in self._tiers.values():
+            total += tier.times._buf.nbytes
+            for group in (tier.min, tier.avg, tier.max):
+                total += sum(r._buf.nbytes for r in group.values())
+        return total
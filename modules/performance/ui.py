@@ -2,37 +2,47 @@
 import customtkinter as ctk
 import matplotlib
 matplotlib.use("TkAgg")
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure  # pyplot is not needed and slow to import
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import threading
 import time
 from modules import styles
+from modules.utils.sampler import get_sampler
+from modules.performance.charts import LineChart, HeatStrip, PERCENT
 from modules.performance import backend as perf_backend
-import collections
 
-UPDATE_INTERVAL = 0.25  # seconds
+# chart time ranges: label -> (data source, points on the chart)
+RANGES = {
+    "30 s": ("live", 120),        # raw samples from the metric store
+    "10 min": ("rollup", 600),    # 1 s averages from the metric store
+    "1 h": ("history", 720),      # on-disk history, 5 s averages
+}
+HISTORY_REFRESH = 5.0  # seconds between disk reads for the history range
+CORE_HISTORY = 60      # columns in the per-core heat strip (one per device sample)
+DEVICE_ROWS = 12       # disks, interfaces and mounts listed in the device card
+
+
+def _rate(value):
+    for unit in ("B/s", "KB/s", "MB/s", "GB/s"):
+        if value < 1024.0:
+            return f"{value:6.1f} {unit}"
+        value /= 1024.0
+    return f"{value:6.1f} TB/s"
 
 class PerformanceUI:
     def __init__(self, parent):
         self.parent = parent
-        self.running = True
-
-        self.prev_net = {"sent": 0, "recv": 0}
+        self.running = False
 
-        # fixed length buffers (60 samples)
-        self.maxlen = 120  # keep a bit more since we update every .25s -> 30s = 120
-        self.cpu_hist = collections.deque(maxlen=self.maxlen)
-        self.ram_hist = collections.deque(maxlen=self.maxlen)
-        self.disk_hist = collections.deque(maxlen=self.maxlen)
-        self.gpu_hist = collections.deque(maxlen=self.maxlen)
-        self.gpu_mem_hist = collections.deque(maxlen=self.maxlen)
-        self.net_down_hist = collections.deque(maxlen=self.maxlen)
-        self.net_up_hist = collections.deque(maxlen=self.maxlen)
+        # history lives in the backend's metric store (and on disk for the 1 h range)
+        self.store = perf_backend.store
+        self.range = "30 s"
+        self.maxlen = RANGES[self.range][1]  # we update every .25s -> 30s = 120
+        self._history_due = 0.0
 
+        self.sampler = get_sampler()
+        # no GPU: its cards are never built, sampled or drawn
+        self.has_gpu = perf_backend.gpu_available()
         self._build_ui()
-        # start background updater
-        self.updater_thread = threading.Thread(target=self._update_loop, daemon=True)
-        self.updater_thread.start()
 
     def _build_ui(self):
         self.parent.configure(fg_color=styles.BG_MAIN)
@@ -44,6 +54,10 @@ class PerformanceUI:
                      text_color=styles.TEXT_PRIMARY).pack(side="left")
         ctk.CTkLabel(header, text="System Resource Monitoring", font=ctk.CTkFont(size=12),
                      text_color=styles.NEON_ORANGE).pack(side="left", padx=10)
+        self.range_select = ctk.CTkSegmentedButton(header, values=list(RANGES), command=self._set_range,
+                                                   selected_color=styles.NEON_ORANGE)
+        self.range_select.set(self.range)
+        self.range_select.pack(side="right")
 
         # Top metric cards (CPU, RAM, DISK, NET)
         top = ctk.CTkFrame(self.parent, fg_color=styles.BG_MAIN)
@@ -58,14 +72,24 @@ class PerformanceUI:
         grid = ctk.CTkFrame(self.parent, fg_color=styles.BG_MAIN)
         grid.pack(fill="both", expand=True, padx=16, pady=(6,16))
         grid.grid_columnconfigure((0,1), weight=1)
-        grid.grid_rowconfigure((0,1,2,3), weight=1)
+        grid.grid_rowconfigure((0,1,2,3,4), weight=1)
 
-        self.card_disk = self._create_graph_card(grid, "Disk Usage", 0, 0, styles.NEON_YELLOW)
+        self.card_disk = self._create_graph_card(grid, "Disk I/O", 0, 0, styles.NEON_YELLOW, multi=True,
+                                                 colors=(styles.NEON_YELLOW, styles.NEON_ORANGE),
+                                                 labels=("Read KB/s", "Write KB/s"))
         self.card_ram = self._create_graph_card(grid, "Memory Usage", 0, 1, styles.NEON_BLUE)
-        self.card_gpu_mem = self._create_graph_card(grid, "GPU Memory", 1, 0, styles.NEON_PINK)
-        self.card_gpu_usage = self._create_graph_card(grid, "GPU Usage", 1, 1, styles.NEON_PURPLE)
+        if self.has_gpu:
+            self.card_gpu_mem = self._create_graph_card(grid, "GPU Memory", 1, 0, styles.NEON_PINK)
+            self.card_gpu_usage = self._create_graph_card(grid, "GPU Usage", 1, 1, styles.NEON_PURPLE)
+        else:
+            self.card_gpu_mem = self.card_gpu_usage = None
+            grid.grid_rowconfigure(1, weight=0)
         self.card_cpu = self._create_graph_card(grid, "CPU Usage", 2, 0, styles.NEON_ORANGE, colspan=2)
         self.card_net = self._create_graph_card(grid, "Network I/O", 3, 0, styles.NEON_CYAN, colspan=2, multi=True)
+        self.card_cores = self._create_heat_card(grid, "CPU Cores", 4, 0)
+        self.device_text = self._create_text_card(grid, "Disks & Interfaces", 4, 1)
+        self.line_cards = [card for card in (self.card_cpu, self.card_ram, self.card_disk, self.card_gpu_usage,
+                                             self.card_gpu_mem, self.card_net) if card is not None]
 
     def _create_value_card(self, parent, title, accent):
         frame = ctk.CTkFrame(parent, fg_color=styles.CARD_BG, corner_radius=styles.CORNER_RADIUS)
@@ -77,7 +101,8 @@ class PerformanceUI:
         val.pack(anchor="w", padx=12, pady=(4,12))
         return val
 
-    def _create_graph_card(self, parent, title, r, c, color, colspan=1, multi=False):
+    def _create_graph_card(self, parent, title, r, c, color, colspan=1, multi=False,
+                           colors=(styles.NEON_CYAN, styles.NEON_LIME), labels=("Download KB/s", "Upload KB/s")):
         card = ctk.CTkFrame(parent, fg_color=styles.CARD_BG, corner_radius=styles.CORNER_RADIUS)
         card.grid(row=r, column=c, columnspan=colspan, sticky="nsew", padx=8, pady=8)
         # title
@@ -85,7 +110,7 @@ class PerformanceUI:
                          font=ctk.CTkFont(size=16, weight="bold"))
         t.pack(anchor="w", padx=10, pady=(10,4))
 
-        fig = plt.Figure(figsize=(6,2.4), dpi=100)
+        fig = Figure(figsize=(6,2.4), dpi=100)
         ax = fig.add_subplot(111)
         ax.set_facecolor(styles.CARD_BG)
         fig.patch.set_facecolor(styles.CARD_BG)
@@ -93,97 +118,150 @@ class PerformanceUI:
         for spine in ax.spines.values():
             spine.set_color("#222225")
 
+        canvas = FigureCanvasTkAgg(fig, master=card)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=8, pady=(6,10))
+
         if multi:
-            # network has two lines
-            line_down, = ax.plot([], [], color=styles.NEON_CYAN, linewidth=styles.GRAPH_LINEWIDTH)
-            line_up, = ax.plot([], [], color=styles.NEON_LIME, linewidth=styles.GRAPH_LINEWIDTH)
-            legend = ax.legend(["Download KB/s", "Upload KB/s"], facecolor=styles.CARD_BG, labelcolor=styles.TEXT_PRIMARY)
+            # two lines (network, disk I/O); legend is static so it lives in the cached background
+            chart = LineChart(ax, canvas, colors, self.maxlen)
+            ax.legend(chart.lines, list(labels), facecolor=styles.CARD_BG, labelcolor=styles.TEXT_PRIMARY)
         else:
-            line, = ax.plot([], [], color=color, linewidth=styles.GRAPH_LINEWIDTH)
-            line_down = line_up = None
+            chart = LineChart(ax, canvas, (color,), self.maxlen, ylim=PERCENT)
 
+        return {"card": card, "ax": ax, "fig": fig, "canvas": canvas, "color": color,
+                "chart": chart, "multi": multi}
+
+    def _create_heat_card(self, parent, title, r, c):
+        card = ctk.CTkFrame(parent, fg_color=styles.CARD_BG, corner_radius=styles.CORNER_RADIUS)
+        card.grid(row=r, column=c, sticky="nsew", padx=8, pady=8)
+        ctk.CTkLabel(card, text=title, text_color=styles.TEXT_PRIMARY,
+                     font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w", padx=10, pady=(10,4))
+
+        fig = Figure(figsize=(6,2.4), dpi=100)
+        ax = fig.add_subplot(111)
+        fig.patch.set_facecolor(styles.CARD_BG)
+        ax.tick_params(colors="white", labelsize=8)
         canvas = FigureCanvasTkAgg(fig, master=card)
         canvas.get_tk_widget().pack(fill="both", expand=True, padx=8, pady=(6,10))
+        # one row per core, newest column on the right
+        return {"card": card, "fig": fig, "canvas": canvas, "chart": HeatStrip(ax, canvas, CORE_HISTORY)}
 
-        return {"card": card, "ax": ax, "fig": fig, "canvas": canvas, "color": color,
-                "line": line if not multi else None, "line_down": line_down, "line_up": line_up, "multi": multi}
-
-    # -------- update loop in background thread (collect samples)
-    def _update_loop(self):
-        while self.running:
-            try:
-                cpu = perf_backend.get_cpu_percent()
-                ram = perf_backend.get_ram_percent()
-                disk = perf_backend.get_disk_percent()
-                down, up = perf_backend.get_network_delta(self.prev_net)
-                gpu, gpu_mem = perf_backend.get_gpu_metrics_placeholder()
-
-                # append
-                self.cpu_hist.append(cpu)
-                self.ram_hist.append(ram)
-                self.disk_hist.append(disk)
-                self.gpu_hist.append(gpu)
-                self.gpu_mem_hist.append(gpu_mem)
-                self.net_down_hist.append(down)
-                self.net_up_hist.append(up)
-
-                # schedule UI update on main thread
-                self.parent.after(0, self._refresh_ui)
-            except Exception:
-                pass
-
-            time.sleep(UPDATE_INTERVAL)
+    def _create_text_card(self, parent, title, r, c):
+        card = ctk.CTkFrame(parent, fg_color=styles.CARD_BG, corner_radius=styles.CORNER_RADIUS)
+        card.grid(row=r, column=c, sticky="nsew", padx=8, pady=8)
+        ctk.CTkLabel(card, text=title, text_color=styles.TEXT_PRIMARY,
+                     font=ctk.CTkFont(size=16, weight="bold")).pack(anchor="w", padx=10, pady=(10,4))
+        text = ctk.CTkLabel(card, text="", text_color=styles.TEXT_MUTED, justify="left", anchor="nw",
+                            font=ctk.CTkFont(family="Courier", size=12))
+        text.pack(fill="both", expand=True, anchor="w", padx=14, pady=(4,10))
+        return text
+
+    # -------- sampler callback (runs on the collector thread)
+    def _on_sample(self, snap):
+        # the backend already recorded the sample; schedule UI update on main thread
+        if not self.running:
+            return
+        self.parent.after(0, self._refresh_ui)
+
+    def _on_devices(self, snap):
+        if not self.running:
+            return
+        self.parent.after(0, self._refresh_devices, snap)
+
+    def _refresh_devices(self, snap):
+        if not self.running:
+            return
+        self.card_cores["chart"].update(snap["cores"])
+
+        lines = []
+        disk_rates = {}
+        names, rates = snap["disks"]
+        for name, (rd, wr, rops, wops, rtime, wtime, busy) in zip(names, rates):
+            disk_rates[name] = (rd, wr)
+            wait = (rtime + wtime) / (rops + wops) if rops + wops else 0.0
+            lines.append(f"{name:<10} R {_rate(rd)}  W {_rate(wr)}  {rops + wops:6.0f} IOPS"
+                         f"  {min(busy / 10.0, 100.0):3.0f}%  {wait:5.1f} ms")
+        names, rates = snap["nics"]
+        for name, (down, up) in zip(names, rates):
+            lines.append(f"{name:<10} \u2193 {_rate(down)}  \u2191 {_rate(up)}")
+        for mountpoint, used, disk in snap["mounts"]:
+            line = f"{mountpoint:<24} {used:5.1f}% used"
+            if disk in disk_rates:
+                # the whole disk's traffic: partitions of one disk show the same
+                rd, wr = disk_rates[disk]
+                line += f"  {disk} R {_rate(rd)}  W {_rate(wr)}"
+            lines.append(line)
+        self.device_text.configure(text="\n".join(lines[:DEVICE_ROWS]) or "no devices")
 
     def _refresh_ui(self):
+        if not self.running or not self.store.times.count:
+            return
+        store = self.store
+
         # update numeric cards
-        if self.cpu_hist:
-            self.val_cpu.configure(text=f"{self.cpu_hist[-1]:.1f}%")
-        if self.ram_hist:
-            self.val_ram.configure(text=f"{self.ram_hist[-1]:.1f}%")
-        if self.disk_hist:
-            self.val_disk.configure(text=f"{self.disk_hist[-1]:.1f}%")
-        if self.net_down_hist:
-            self.val_net.configure(text=f"{self.net_down_hist[-1]:.1f} KB/s")
-
-        # update graphs
-        self._draw_line(self.card_cpu, list(self.cpu_hist), styles.NEON_ORANGE)
-        self._draw_line(self.card_ram, list(self.ram_hist), styles.NEON_BLUE)
-        self._draw_line(self.card_disk, list(self.disk_hist), styles.NEON_YELLOW)
-        # GPU placeholders (zero or flat)
-        self._draw_line(self.card_gpu_usage, list(self.gpu_hist), styles.NEON_PURPLE)
-        self._draw_line(self.card_gpu_mem, list(self.gpu_mem_hist), styles.NEON_PINK)
+        self.val_cpu.configure(text=f"{store.last('cpu'):.1f}%")
+        self.val_ram.configure(text=f"{store.last('ram'):.1f}%")
+        self.val_disk.configure(text=f"{store.last('disk_busy'):.0f}% busy  {store.last('disk_await'):.1f} ms")
+        self.val_net.configure(text=f"{store.last('net_down'):.1f} KB/s")
+
+        # update graphs (artists updated in place and blitted)
+        series = self._series()
+        if series is None:
+            return
+        self.card_cpu["chart"].update(series["cpu"])
+        self.card_ram["chart"].update(series["ram"])
+        self.card_disk["chart"].update(series["disk_read"], series["disk_write"])
+        if self.has_gpu:
+            self.card_gpu_usage["chart"].update(series["gpu"])
+            self.card_gpu_mem["chart"].update(series["gpu_mem"])
         # network multi line
-        self._draw_network(self.card_net, list(self.net_down_hist), list(self.net_up_hist))
+        self.card_net["chart"].update(series["net_down"], series["net_up"])
 
-    def _draw_line(self, card, data, color):
-        ax = card["ax"]
-        ax.clear()
-        ax.set_facecolor(styles.CARD_BG)
-        ax.tick_params(colors="white", labelsize=9)
-        for spine in ax.spines.values():
-            spine.set_color("#222225")
-        if not data:
-            data = [0]
-        x = range(len(data))
-        ax.plot(x, data, color=color, linewidth=styles.GRAPH_LINEWIDTH)
-        # gradient
-        ax.fill_between(x, data, [0]*len(data), color=color, alpha=0.12)
-        card["canvas"].draw()
-
-    def _draw_network(self, card, down, up):
-        ax = card["ax"]
-        ax.clear()
-        ax.set_facecolor(styles.CARD_BG)
-        ax.tick_params(colors="white", labelsize=9)
-        for spine in ax.spines.values():
-            spine.set_color("#222225")
-        x = range(len(down))
-        ax.plot(x, down, color=styles.NEON_CYAN, linewidth=styles.GRAPH_LINEWIDTH)
-        ax.plot(x, up, color=styles.NEON_LIME, linewidth=styles.GRAPH_LINEWIDTH)
-        ax.fill_between(x, down, [0]*len(down), color=styles.NEON_CYAN, alpha=0.12)
-        ax.fill_between(x, up, [0]*len(up), color=styles.NEON_LIME, alpha=0.08)
-        ax.legend(["Download KB/s", "Upload KB/s"], facecolor=styles.CARD_BG, labelcolor=styles.TEXT_PRIMARY)
-        card["canvas"].draw()
-
-    def stop_updates(self):
+    def _series(self):
+        source, points = RANGES[self.range]
+        if source == "live":
+            return {m: self.store.view(m, points) for m in perf_backend.METRICS}
+        if source == "rollup":
+            return {m: self.store.rollup(m, 1)[2][-points:] for m in perf_backend.METRICS}
+
+        # read back from the on-disk history, but not on every tick
+        now = time.monotonic()
+        if now < self._history_due:
+            return None
+        self._history_due = now + HISTORY_REFRESH
+        recs = perf_backend.read_history(3600)
+        if recs is None or not len(recs):
+            return None
+        step = max(1, len(recs) // points)
+        n = len(recs) // step * step
+        return {m: recs[m][len(recs) - n:].reshape(-1, step).mean(axis=1) for m in perf_backend.METRICS}
+
+    def _set_range(self, label):
+        self.range = label
+        self.maxlen = RANGES[label][1]
+        for card in self.line_cards:
+            card["chart"].set_window(self.maxlen)
+        self._history_due = 0.0
+        self._refresh_ui()
+
+    # -------- page lifecycle (modules/utils/pages.py)
+    def start(self):
+        # samples come from the shared collector thread
+        self.running = True
+        self.sampler.subscribe("performance", self._on_sample)
+        self.sampler.subscribe("devices", self._on_devices)
+        self._refresh_ui()
+
+    def pause(self):
         self.running = False
+        self.sampler.unsubscribe("performance", self._on_sample)
+        self.sampler.unsubscribe("devices", self._on_devices)
+
+    def resume(self):
+        self._history_due = 0.0
+        self.start()
+
+    def dispose(self):
+        self.pause()
+        for card in self.line_cards + [self.card_cores]:
+            card["fig"].clear()
@@ -0,0 +1,247 @@
+# modules/processes/actions.py
+# Kill / terminate / suspend / resume / renice many processes off the Tk thread.
+#
+# A batch is split into chunks that run on a small worker pool; every chunk
+# signals its processes and (for kill/terminate) waits for them with
+# psutil.wait_procs, so a chunk never waits on another one. When the last
+# chunk is done the results are merged into one ActionResult and handed to
+# the callback (still on a worker thread).
+#
+# Scopes: "process" (just the PIDs), "tree" (each PID plus all descendants,
+# from one ppid scan) and "group" (the PIDs' process groups: one killpg /
+# setpriority(PRIO_PGRP) per group, POSIX only).
+#
+# With `created` ({pid: create_time} from the snapshot the user picked from),
+# a PID now held by a different process is left alone and reported as
+# "process changed" instead of being acted on.
+import os
+import signal
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+ACTIONS = ("kill", "terminate", "suspend", "resume", "renice")
+SCOPES = ("process", "tree", "group")
+WORKERS = 8
+CHUNK = 64                  # processes per pool task
+WAIT_SECONDS = 3.0          # kill/terminate: how long to wait for exits
+
+_VERB = {"kill": "Killed", "terminate": "Terminated", "suspend": "Suspended",
+         "resume": "Resumed", "renice": "Reniced"}
+_GROUP_SIGNAL = {"kill": "SIGKILL", "terminate": "SIGTERM", "suspend": "SIGSTOP", "resume": "SIGCONT"}
+
+# done: PIDs acted on (for kill/terminate: confirmed gone); alive: still
+# running after the wait; failed: {pid: reason}
+ActionResult = namedtuple("ActionResult", "action scope requested done alive failed elapsed")
+
+
+def summarize(result):
+    """One line for the status bar, e.g. 'Killed 498 of 500 processes; 2 failed (access denied)'."""
+    n = result.requested
+    text = f"{_VERB[result.action]} {len(result.done)} of {n} process{'es' if n != 1 else ''}"
+    if result.alive:
+        text += f"; {len(result.alive)} still running after {WAIT_SECONDS:g} s"
+    if result.failed:
+        reasons = sorted(set(result.failed.values()))
+        text += f"; {len(result.failed)} failed ({', '.join(reasons[:3])})"
+    return text
+
+
+def _reason(exc):
+    if isinstance(exc, psutil.AccessDenied):
+        return "access denied"
+    if isinstance(exc, psutil.NoSuchProcess):
+        return "already exited"
+    return str(exc) or type(exc).__name__
+
+
+def _descendants(roots):
+    """roots plus every descendant, from a single pass over all processes."""
+    children = {}
+    for p in psutil.process_iter(["ppid"]):
+        children.setdefault(p.info["ppid"], []).append(p.pid)
+    out, stack = set(), list(roots)
+    while stack:
+        pid = stack.pop()
+        if pid in out:
+            continue
+        out.add(pid)
+        stack.extend(children.get(pid, ()))
+    return out
+
+
+def _same(p, created):
+    """p is the process whose create_time was recorded (unknown: assume so)."""
+    return not created or abs(p.create_time() - created) < 0.01
+
+
+def _changed(pid, created):
+    """Why pid can't be acted on as selected, or None."""
+    try:
+        return None if _same(psutil.Process(pid), created.get(pid)) else "process changed"
+    except psutil.Error as e:
+        return _reason(e)
+
+
+class _Batch:
+    """Results of one request, merged as its chunks finish."""
+
+    def __init__(self, action, scope, requested, chunks, callback):
+        self.action, self.scope, self.requested = action, scope, requested
+        self.callback = callback
+        self.pending = chunks
+        self.done, self.alive, self.failed = [], [], {}
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def merge(self, done=(), alive=(), failed=None):
+        with self.lock:
+            self.done.extend(done)
+            self.alive.extend(alive)
+            self.failed.update(failed or {})
+            self.pending -= 1
+            last = self.pending <= 0
+        if last and self.callback is not None:
+            self.callback(ActionResult(self.action, self.scope, self.requested, self.done,
+                                       self.alive, self.failed, time.perf_counter() - self.started))
+
+
+class ActionExecutor:
+    def __init__(self, workers=WORKERS, wait=WAIT_SECONDS):
+        self.wait = wait
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="proc-action")
+
+    def submit(self, action, pids, scope="process", value=None, callback=None, created=None):
+        """Queue `action` for pids; callback(ActionResult) runs when all of it is done.
+
+        created: {pid: create_time} the PIDs must still match (PID reuse check).
+        """
+        if action not in ACTIONS or scope not in SCOPES:
+            raise ValueError(f"unknown action/scope: {action}/{scope}")
+        # p.nice(None) would only read the value and still count as done
+        if action == "renice" and (not isinstance(value, int) or isinstance(value, bool)):
+            raise ValueError(f"renice needs an integer nice value, not {value!r}")
+        self._pool.submit(self._plan, action, list(pids), scope, value, callback, dict(created or {}))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ----- worker side
+    def _plan(self, action, pids, scope, value, callback, created):
+        try:
+            self._dispatch(action, pids, scope, value, callback, created)
+        except Exception as e:   # e.g. the process scan failed: still report
+            if callback is not None:
+                callback(ActionResult(action, scope, len(pids), [], [], {pid: _reason(e) for pid in pids}, 0.0))
+
+    def _dispatch(self, action, pids, scope, value, callback, created):
+        protected = {0, os.getpid()}
+        refused = {pid: "refused (this dashboard)" for pid in pids if pid in protected}
+        pids = [pid for pid in pids if pid not in protected]
+        if scope != "process":
+            # the selected roots must still be the selected processes before
+            # their tree / group is looked up (chunks re-check every PID)
+            for pid in pids:
+                reason = _changed(pid, created)
+                if reason:
+                    refused[pid] = reason
+            pids = [pid for pid in pids if pid not in refused]
+        if scope == "group":
+            self._groups(action, pids, value, refused, callback)
+            return
+        targets = sorted(_descendants(pids) - protected) if scope == "tree" else pids
+        chunks = [targets[i:i + CHUNK] for i in range(0, len(targets), CHUNK)]
+        batch = _Batch(action, scope, len(targets) + len(refused), len(chunks) or 1, callback)
+        batch.created = created
+        with batch.lock:
+            batch.failed.update(refused)
+        if not chunks:
+            batch.merge()
+        for chunk in chunks:
+            self._pool.submit(self._run_chunk, batch, chunk, value)
+
+    def _run_chunk(self, batch, pids, value):
+        action = batch.action
+        done, failed, signalled = [], {}, []
+        try:
+            for pid in pids:
+                try:
+                    p = psutil.Process(pid)
+                    if not _same(p, batch.created.get(pid)):
+                        failed[pid] = "process changed"
+                        continue
+                    if action == "renice":
+                        p.nice(value)
+                    else:
+                        getattr(p, action)()
+                    (signalled if action in ("kill", "terminate") else done).append(p)
+                except psutil.Error as e:
+                    failed[pid] = _reason(e)
+            alive = []
+            if signalled:
+                gone, alive = psutil.wait_procs(signalled, timeout=self.wait)
+                done.extend(gone)
+            batch.merge([p.pid for p in done], [p.pid for p in alive], failed)
+        except Exception as e:   # never leave a batch without its callback
+            batch.merge((), (), {**{pid: _reason(e) for pid in pids}, **failed})
+
+    def _groups(self, action, pids, value, refused, callback):
+        started = time.perf_counter()
+        done, failed, members = [], dict(refused), {}
+        if not hasattr(os, "killpg"):
+            failed.update({pid: "process groups need POSIX" for pid in pids})
+            pids = []
+        own = os.getpgid(0) if pids else None
+        groups = {}
+        for pid in pids:
+            try:
+                groups.setdefault(os.getpgid(pid), []).append(pid)
+            except OSError as e:
+                failed[pid] = _reason(psutil.NoSuchProcess(pid)) if isinstance(e, ProcessLookupError) else str(e)
+        if own in groups:
+            failed.update({pid: "refused (this dashboard's group)" for pid in groups.pop(own)})
+        if groups:
+            # the members, so the summary counts processes and kill can wait for them
+            for p in psutil.process_iter():
+                try:
+                    pgid = os.getpgid(p.pid)
+                except OSError:
+                    continue
+                if pgid in groups:
+                    members.setdefault(pgid, []).append(p)
+        signalled = []
+        for pgid in groups:
+            procs = members.get(pgid, [])
+            try:
+                if action == "renice":
+                    os.setpriority(os.PRIO_PGRP, pgid, value)
+                else:
+                    os.killpg(pgid, getattr(signal, _GROUP_SIGNAL[action]))
+            except OSError as e:
+                failed.update({p.pid: "access denied" if isinstance(e, PermissionError) else str(e)
+                               for p in procs})
+                continue
+            (signalled if action in ("kill", "terminate") else done).extend(procs)
+        alive = []
+        if signalled:
+            gone, alive = psutil.wait_procs(signalled, timeout=self.wait)
+            done = done + gone
+        requested = len(failed) + len(done) + len(alive)
+        if callback is not None:
+            callback(ActionResult(action, "group", requested, [p.pid for p in done], [p.pid for p in alive],
+                                  failed, time.perf_counter() - started))
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ActionExecutor()
+        return _executor
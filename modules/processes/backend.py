@@ -1,6 +1,11 @@
 # modules/processes/backend.py
+import heapq
 import psutil
 import threading
+from operator import itemgetter
+from types import MappingProxyType
+
+SAMPLE_INTERVAL = 0.25  # seconds
 
 def fetch_all_processes():
     procs = []
@@ -20,3 +25,269 @@ def fetch_in_thread(callback):
     t = threading.Thread(target=worker, daemon=True)
     t.start()
     return t
+
+_NAME_KEYS = {}
+
+
+def name_key(name):
+    """Case-insensitive sort key for a process name, computed once per distinct name."""
+    key = _NAME_KEYS.get(name)
+    if key is None:
+        if len(_NAME_KEYS) > 8192:
+            _NAME_KEYS.clear()
+        key = _NAME_KEYS[name] = name.casefold()
+    return key
+
+# --------------------------------------------------
+# PROCESS REGISTRY
+# --------------------------------------------------
+class ProcessRegistry:
+    """Long-lived psutil.Process handles keyed by PID.
+
+    Keeping the same Process object across ticks is what makes
+    cpu_percent() deltas correct. A PID whose start time no longer matches
+    (PID reuse) gets a fresh handle: on Linux the start time is read from
+    /proc/<pid>/stat every tick and compared with the one cached at tracking
+    time, elsewhere is_running() does the comparison. Every entry not seen
+    in the current generation is evicted, so the registry never outgrows the
+    live process table. Each sample() publishes a new read-only snapshot;
+    nothing handed to readers is mutated afterwards.
+    """
+
+    _ATTRS = ("name", "ppid", "memory_info", "memory_percent", "cpu_percent")
+
+    def __init__(self):
+        self._entries = {}   # pid -> [Process, username, generation, create_time, start ticks]
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.snapshot = MappingProxyType({})
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, pid):
+        """The registry's Process handle for pid (or None)."""
+        entry = self._entries.get(pid)
+        return entry[0] if entry else None
+
+    @staticmethod
+    def _starttime(pid):
+        """Kernel start time of pid (Linux), None elsewhere."""
+        if not getattr(psutil, "LINUX", False):
+            return None
+        from modules.processes import procfs   # pwd: POSIX only
+        try:
+            return procfs.starttime(pid)
+        except (OSError, ValueError, IndexError):
+            raise psutil.NoSuchProcess(pid) from None
+
+    def _track(self, pid):
+        start = self._starttime(pid)
+        p = psutil.Process(pid)
+        try:
+            user = p.username()
+        except (psutil.AccessDenied, psutil.ZombieProcess, KeyError):
+            user = ""
+        try:
+            created = p.create_time()
+        except psutil.AccessDenied:
+            created = 0.0
+        return [p, user, 0, created, start]
+
+    def _read(self, pid, entry):
+        """(entry, as_dict info) for pid, with a fresh handle if the PID was reused."""
+        if entry is None:
+            entry = self._entries[pid] = self._track(pid)
+            return entry, entry[0].as_dict(self._ATTRS, ad_value=None)
+        if entry[4] is not None:
+            if self._starttime(pid) != entry[4]:
+                return self._read(pid, None)
+        elif not entry[0].is_running():
+            return self._read(pid, None)
+        try:
+            return entry, entry[0].as_dict(self._ATTRS, ad_value=None)
+        except psutil.NoSuchProcess:
+            return self._read(pid, None)   # ours is gone; the PID may be a new process
+
+    def sample(self, annotate=None):
+        """Sample every process and publish the snapshot.
+
+        annotate(snap) may add fields to the entries of the plain dict before
+        it is published; afterwards it is read-only.
+        """
+        with self._lock:
+            self.generation += 1
+            gen = self.generation
+            entries = self._entries
+            snap = {}
+            for pid in psutil.pids():
+                try:
+                    entry, info = self._read(pid, entries.get(pid))
+                except psutil.NoSuchProcess:
+                    entries.pop(pid, None)
+                    continue
+                entry[2] = gen
+                mi = info["memory_info"]
+                name = info["name"] or ""
+                snap[pid] = {
+                    "pid": pid,
+                    "ppid": info["ppid"] or 0,
+                    "name": name,
+                    "name_key": name_key(name),
+                    "user": entry[1],
+                    "cpu": info["cpu_percent"] or 0.0,
+                    "mem": info["memory_percent"] or 0.0,
+                    "rss": mi.rss if mi else 0,
+                    "create_time": entry[3],
+                }
+
+            # generation sweep: drop handles of processes that are gone
+            for pid in [pid for pid, e in entries.items() if e[2] != gen]:
+                del entries[pid]
+
+            if annotate is not None:
+                annotate(snap)
+            self.snapshot = MappingProxyType(snap)
+            return self.snapshot
+
+
+registry = ProcessRegistry()
+
+# --------------------------------------------------
+# CLASSIFICATION
+# --------------------------------------------------
+SYSTEM_USERS = ("system", "nt authority\\system", "local service", "network service", "")
+
+
+def split_processes(snapshot, current_user):
+    """Split a snapshot into (apps, system) lists, unordered (see ProcessSorter)."""
+    apps = []
+    system = []
+    me = current_user.lower()
+
+    for pid, info in snapshot.items():
+        user = (info.get("user") or "").lower()
+
+        if user in SYSTEM_USERS or pid == 0:
+            system.append(info)
+        else:
+            if me in user:
+                apps.append(info)
+            else:
+                system.append(info)
+    return apps, system
+
+
+# --------------------------------------------------
+# SORTING
+# --------------------------------------------------
+# CPU% already arrives rounded to 0.1 from both collectors; RAM% is bucketed
+# to the displayed 0.1 so jitter that does not show in the table does not
+# reorder it either
+SORT_KEYS = {
+    "pid": itemgetter("pid"),
+    "name": itemgetter("name_key"),
+    "cpu": itemgetter("cpu"),
+    "mem": lambda p: int(p["mem"] * 10.0 + 0.5),
+    # not known for every process yet (see resources.py): unknown sorts as 0
+    "io": lambda p: (p.get("io_read") or 0.0) + (p.get("io_write") or 0.0),
+    "conns": lambda p: p.get("conns") or 0,
+    "fds": lambda p: p.get("fds") or 0,
+}
+
+
+class ProcessSorter:
+    """Orders process lists by a column, keeping ties in last tick's order.
+
+    Rows with equal keys (most processes sit at 0.0% CPU) keep the position
+    they had in the previous result, so a refresh only moves rows whose value
+    really changed. With a limit, only the top rows are selected with a heap
+    instead of sorting the whole list.
+    """
+
+    def __init__(self, column="name", descending=False, limit=None):
+        self.column = column
+        self.descending = descending
+        self.limit = limit
+        self._rank = {}   # pid -> position in the previous result
+
+    def toggle(self, column):
+        """Heading click: flip direction on the same column, else switch to it."""
+        if column == self.column:
+            self.descending = not self.descending
+        else:
+            self.column = column
+            self.descending = column not in ("pid", "name")  # busiest first
+        self._rank = {}
+
+    def sort(self, items):
+        primary = SORT_KEYS[self.column]
+        rank = self._rank.get
+        unranked = len(self._rank)
+        # decorate once: (column value, previous position, info); positions are
+        # unique, so the info dicts themselves are never compared
+        if self.descending:
+            # reverse order on the column, previous order among ties
+            keyed = [(primary(p), -rank(p["pid"], unranked + p["pid"]), p) for p in items]
+            pick = heapq.nlargest
+        else:
+            keyed = [(primary(p), rank(p["pid"], unranked + p["pid"]), p) for p in items]
+            pick = heapq.nsmallest
+
+        if self.limit is not None and self.limit < len(keyed):
+            keyed = pick(self.limit, keyed)
+        else:
+            keyed.sort(reverse=self.descending)
+        result = [k[2] for k in keyed]
+        self._rank = {p["pid"]: i for i, p in enumerate(result)}
+        return result
+
+
+# which enumerator sample_processes() uses: "psutil" or "procfs" (Linux only)
+COLLECTOR = "psutil"
+_procfs = None
+# budgeted per-process I/O, connection and FD sampling (see resources.py)
+RESOURCES = True
+
+
+def set_collector(name):
+    global COLLECTOR
+    if name not in ("psutil", "procfs"):
+        raise ValueError(f"unknown collector: {name}")
+    COLLECTOR = name
+
+
+def set_resource_sampling(enabled):
+    global RESOURCES
+    RESOURCES = bool(enabled)
+
+
+def _sample_procfs(annotate=None):
+    global _procfs
+    if _procfs is None:
+        from modules.processes.procfs import ProcfsCollector
+        _procfs = ProcfsCollector()
+    cols = _procfs.collect()
+    snapshot = {}
+    for pid, ppid, name, user, cpu, mem, rss, created in zip(
+            cols["pid"], cols["ppid"], cols["name"], cols["username"],
+            cols["cpu_percent"], cols["memory_percent"], cols["rss"], cols["create_time"]):
+        snapshot[pid] = {"pid": pid, "ppid": ppid, "name": name, "name_key": name_key(name),
+                         "user": user, "cpu": cpu, "mem": mem, "rss": rss, "create_time": created}
+    if annotate is not None:
+        annotate(snapshot)
+    return MappingProxyType(snapshot)
+
+
+# snapshot source for the shared sampler: {pid: info}
+def sample_processes():
+    annotate = None
+    if RESOURCES:
+        # I/O, connections and FDs go in before the snapshot is published
+        from modules.processes import resources
+        annotate = resources.get_sampler().update
+    if COLLECTOR == "procfs":
+        from modules.processes import procfs
+        if procfs.available():
+            return _sample_procfs(annotate)
+    return registry.sample(annotate)
@@ -0,0 +1,82 @@
+# modules/processes/detail.py
+# Detail strip for the selected process: CPU/RAM sparklines over the last
+# minute plus now / avg / max, so a spike can be told apart from a steady hog.
+# The title also carries its disk I/O, connections and open files, once known.
+import tkinter as tk
+import customtkinter as ctk
+from modules import styles
+from modules.processes.table import fmt_rate
+
+
+class Sparkline(tk.Canvas):
+    """A single polyline on a plain Tk canvas; update() only moves its points."""
+
+    def __init__(self, parent, color, width=280, height=36, bg=styles.CARD_BG):
+        super().__init__(parent, width=width, height=height, bg=bg,
+                         highlightthickness=0, borderwidth=0)
+        self.w = width
+        self.h = height
+        self._line = self.create_line(0, height, 0, height, fill=color, width=1.5)
+
+    def update_values(self, values, top=None):
+        if len(values) < 2:
+            self.coords(self._line, 0, self.h, 0, self.h)
+            return
+        top = top or max(max(values), 1.0)
+        step = self.w / (len(values) - 1)
+        scale = (self.h - 2) / top
+        points = []
+        for i, v in enumerate(values):
+            points.append(i * step)
+            points.append(self.h - 1 - min(v, top) * scale)
+        self.coords(self._line, *points)
+
+
+class DetailPane(ctk.CTkFrame):
+    def __init__(self, parent):
+        super().__init__(parent, fg_color=styles.CARD_BG, corner_radius=styles.CORNER_RADIUS_SMALL)
+        self.title = ctk.CTkLabel(self, text="Select a process to see its last minute",
+                                  font=ctk.CTkFont(size=14, weight="bold"),
+                                  text_color=styles.TEXT_PRIMARY, width=260, anchor="w")
+        self.title.grid(row=0, column=0, rowspan=2, padx=(14, 10), pady=8, sticky="w")
+
+        self.sparks = {}
+        self.stats = {}
+        for row, (key, label, color) in enumerate((("cpu", "CPU%", styles.NEON_ORANGE),
+                                                   ("mem", "RAM%", styles.NEON_BLUE))):
+            ctk.CTkLabel(self, text=label, text_color=color, width=44,
+                         font=ctk.CTkFont(size=12, weight="bold")).grid(row=row, column=1, pady=4)
+            self.sparks[key] = Sparkline(self, color)
+            self.sparks[key].grid(row=row, column=2, padx=6, pady=4)
+            self.stats[key] = ctk.CTkLabel(self, text="", text_color=styles.TEXT_MUTED,
+                                           font=ctk.CTkFont(size=12), anchor="w", width=220)
+            self.stats[key].grid(row=row, column=3, padx=(6, 14), sticky="w")
+
+    def show(self, info, series):
+        """info: snapshot entry of the process; series: ProcessHistory.get() result
+        (None: not tracked)."""
+        title = f"{info['name']}  (PID {info['pid']})"
+        if info.get("io_read") is not None:
+            title += f"    read {fmt_rate(info['io_read'])}   write {fmt_rate(info['io_write'])}"
+        if info.get("conns") is not None:
+            title += f"    {info['conns']} connections"
+        if info.get("fds") is not None:
+            title += f"    {info['fds']} open files"
+        self.title.configure(text=title)
+        if series is None:
+            for key in self.sparks:
+                self.sparks[key].update_values(())
+                self.stats[key].configure(text="not tracked")
+            return
+        for key, values in series.items():
+            # scaled to the series' own peak: small but steady load should still show
+            self.sparks[key].update_values(values)
+            if values:
+                now, avg, peak = values[-1], sum(values) / len(values), max(values)
+                self.stats[key].configure(text=f"now {now:.1f}   avg {avg:.1f}   max {peak:.1f}")
+
+    def clear(self):
+        self.title.configure(text="Select a process to see its last minute")
+        for key in self.sparks:
+            self.sparks[key].update_values(())
+            self.stats[key].configure(text="")
@@ -0,0 +1,108 @@
+# modules/processes/history.py
+# Short per-process CPU/RAM history for sparklines and the detail pane.
+#
+# Each tracked process is one _Track: a __slots__ record with two fixed-size
+# float32 rings (array('f')), so the cost per process is bounded:
+#
+#   2 series x LENGTH samples x 4 bytes  = 1920 bytes for the default 240
+#   + array headers, record and dict slot ~  500 bytes
+#   ~ 2.4 KB per process -> ~12 MB for 5k processes (tracemalloc), ~20 MB at MAX_TRACKED
+#
+# A track is dropped as soon as its process exits (or its PID is reused), and
+# beyond MAX_TRACKED the least recently busy processes are evicted first. An
+# evicted process is not tracked again until it exits, so a full table doesn't
+# evict and reallocate the same idle processes on every tick. The process
+# shown in the detail pane is pinned: never evicted, and re-admitted if it was.
+#
+# The rings are written in place by update() on the sampler thread; get()
+# copies a track out as plain lists under the same lock.
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import islice
+
+LENGTH = 240          # samples per process: 60 s at the 0.25 s process interval
+MAX_TRACKED = 8192
+
+
+class _Track:
+    __slots__ = ("create_time", "cpu", "mem", "head", "count")
+
+    def __init__(self, create_time, length):
+        self.create_time = create_time
+        self.cpu = array("f", bytes(4 * length))
+        self.mem = array("f", bytes(4 * length))
+        self.head = 0      # next slot to write
+        self.count = 0
+
+    def append(self, cpu, mem):
+        i = self.head
+        self.cpu[i] = cpu
+        self.mem[i] = mem
+        self.head = (i + 1) % len(self.cpu)
+        if self.count < len(self.cpu):
+            self.count += 1
+
+    def series(self, ring):
+        """Oldest to newest."""
+        if self.count < len(ring):
+            return ring[:self.count].tolist()
+        return (ring[self.head:] + ring[:self.head]).tolist()
+
+
+class ProcessHistory:
+    """Per-PID CPU/RAM rings, fed with process snapshots."""
+
+    def __init__(self, length=LENGTH, max_tracked=MAX_TRACKED):
+        self.length = length
+        self.max_tracked = max_tracked
+        self._tracks = OrderedDict()   # pid -> _Track, least recently busy first
+        self._evicted = {}             # pid -> create_time of evicted, still running processes
+        self._pinned = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def update(self, snapshot):
+        with self._lock:
+            tracks, evicted = self._tracks, self._evicted
+            for pid in tracks.keys() - snapshot.keys():
+                del tracks[pid]
+            for pid in evicted.keys() - snapshot.keys():
+                del evicted[pid]
+            for pid, info in snapshot.items():
+                track = tracks.get(pid)
+                if track is None or track.create_time != info["create_time"]:
+                    if evicted.get(pid) == info["create_time"]:
+                        continue
+                    evicted.pop(pid, None)   # PID reused by a new process
+                    track = tracks[pid] = _Track(info["create_time"], self.length)
+                    tracks.move_to_end(pid)
+                elif info["cpu"]:
+                    tracks.move_to_end(pid)
+                track.append(info["cpu"], info["mem"])
+            excess = len(tracks) - self.max_tracked
+            if excess > 0:
+                pinned = self._pinned
+                for pid in list(islice((p for p in tracks if p != pinned), excess)):
+                    evicted[pid] = tracks.pop(pid).create_time
+
+    def pin(self, pid):
+        """Keep pid tracked (tracking it again from the next update if it was
+        evicted) until another pid or None is pinned."""
+        with self._lock:
+            self._pinned = pid
+            self._evicted.pop(pid, None)
+
+    def get(self, pid):
+        """{"cpu": [...], "mem": [...]} oldest to newest, or None if not tracked."""
+        with self._lock:
+            track = self._tracks.get(pid)
+            if track is None:
+                return None
+            return {"cpu": track.series(track.cpu), "mem": track.series(track.mem)}
+
+    def nbytes(self):
+        """Bytes held by the sample rings (excluding per-object overhead)."""
+        return len(self._tracks) * 2 * self.length * 4
@@ -0,0 +1,154 @@
+# modules/processes/procfs.py
+# Linux-only process enumeration straight from /proc.
+#
+# Reads /proc/[pid]/stat, statm and status directly instead of building a
+# psutil.Process per PID, computes CPU% from jiffy deltas itself and returns
+# the result as compact columns. Field semantics follow psutil (name, real
+# uid username, "" when the uid has no passwd entry, like the registry;
+# per-process cpu_percent rounded to 0.1, rss based memory_percent) so both
+# collectors can be swapped freely.
+import os
+import pwd
+import time
+from array import array
+
+
+def available(root="/proc"):
+    return os.path.isfile(os.path.join(root, "self", "stat"))
+
+
+def starttime(pid, root="/proc"):
+    """Start time of pid in clock ticks after boot (stat field 22); OSError if gone."""
+    with open(f"{root}/{pid}/stat", "rb") as f:
+        stat = f.read()
+    return int(stat[stat.rindex(b")") + 2:].split()[19])
+
+
+class ProcfsCollector:
+    def __init__(self, root="/proc", clock_ticks=None, page_size=None, timer=time.monotonic,
+                 getpwuid=pwd.getpwuid):
+        self.root = root
+        self.clock_ticks = clock_ticks or os.sysconf("SC_CLK_TCK")
+        self.page_size = page_size or os.sysconf("SC_PAGE_SIZE")
+        self.timer = timer
+        self.getpwuid = getpwuid
+        self._users = {}     # uid -> username
+        self._prev = {}      # pid -> (starttime, cpu jiffies, timestamp)
+        self._names = {}     # (pid, starttime, comm) -> resolved long name
+        self._mem_total = None
+        self._boot_time = None
+
+    def _read(self, pid, what):
+        with open(f"{self.root}/{pid}/{what}", "rb") as f:
+            return f.read()
+
+    def _username(self, uid):
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = self.getpwuid(uid).pw_name
+            except KeyError:
+                name = ""
+            self._users[uid] = name
+        return name
+
+    def mem_total(self):
+        if self._mem_total is None:
+            with open(f"{self.root}/meminfo", "rb") as f:
+                for line in f:
+                    if line.startswith(b"MemTotal:"):
+                        self._mem_total = int(line.split()[1]) * 1024
+                        break
+        return self._mem_total
+
+    def boot_time(self):
+        if self._boot_time is None:
+            with open(f"{self.root}/stat", "rb") as f:
+                for line in f:
+                    if line.startswith(b"btime"):
+                        self._boot_time = float(line.split()[1])
+                        break
+        return self._boot_time
+
+    def _long_name(self, pid, start, comm):
+        # comm is cut at 15 chars; psutil recovers the full name from cmdline
+        key = (pid, start, comm)
+        name = self._names.get(key)
+        if name is None:
+            name = comm
+            try:
+                cmdline = self._read(pid, "cmdline").split(b"\0")
+                if cmdline and cmdline[0]:
+                    exe = os.path.basename(cmdline[0].decode("utf-8", "replace"))
+                    if exe.startswith(comm):
+                        name = exe
+            except OSError:
+                pass
+            self._names[key] = name
+        return name
+
+    def collect(self):
+        """Return {column: array/list} for every live process."""
+        pids = array("l")
+        ppids = array("l")
+        cpu = array("d")
+        mem = array("d")
+        rss_col = array("Q")
+        created = array("d")
+        names = []
+        users = []
+
+        mem_total = self.mem_total()
+        boot = self.boot_time() or 0.0
+        ticks = float(self.clock_ticks)
+        now = self.timer()
+        prev = self._prev
+        seen = {}
+
+        for entry in os.listdir(self.root):
+            if not entry.isdigit():
+                continue
+            pid = int(entry)
+            try:
+                stat = self._read(pid, "stat")
+                statm = self._read(pid, "statm")
+                status = self._read(pid, "status")
+            except OSError:
+                continue  # exited while we were looking
+
+            lpar = stat.index(b"(")
+            rpar = stat.rindex(b")")
+            comm = stat[lpar + 1:rpar].decode("utf-8", "replace")
+            fields = stat[rpar + 2:].split()
+            # fields[0] is state (stat field 3): utime=14, stime=15, starttime=22
+            ppid = int(fields[1])
+            jiffies = int(fields[11]) + int(fields[12])
+            start = int(fields[19])
+
+            uid_at = status.index(b"\nUid:")
+            uid = int(status[uid_at + 5:status.index(b"\n", uid_at + 1)].split()[0])
+
+            rss = int(statm.split()[1]) * self.page_size
+
+            last = prev.get(pid)
+            if last is not None and last[0] == start and now > last[2]:
+                pct = round((jiffies - last[1]) / ticks / (now - last[2]) * 100.0, 1)
+            else:
+                pct = 0.0  # first sighting (or PID reused): same as psutil's first call
+            seen[pid] = (start, jiffies, now)
+
+            pids.append(pid)
+            ppids.append(ppid)
+            names.append(self._long_name(pid, start, comm) if len(comm) >= 15 else comm)
+            users.append(self._username(uid))
+            cpu.append(max(pct, 0.0))
+            mem.append(rss / mem_total * 100.0 if mem_total else 0.0)
+            rss_col.append(rss)
+            created.append(boot + start / ticks)
+
+        self._prev = seen
+        if len(self._names) > 2 * len(seen) + 64:
+            self._names = {k: v for k, v in self._names.items() if seen.get(k[0], (None,))[0] == k[1]}
+
+        return {"pid": pids, "ppid": ppids, "name": names, "username": users,
+                "cpu_percent": cpu, "memory_percent": mem, "rss": rss_col, "create_time": created}
@@ -0,0 +1,156 @@
+# modules/processes/resources.py
+# Per-process disk I/O rates, network connections and open file descriptors.
+#
+# These are far more expensive than CPU/RAM (a /proc read per process for
+# I/O, a directory listing for FDs, the whole socket table for connections),
+# so they are not collected for every process on every tick. Each tick gets
+# BUDGET seconds; processes are visited in priority order:
+#
+#   1. the PIDs the user is looking at (focus())
+#   2. the TOP_CPU busiest processes
+#   3. everyone else, round-robin from where the last tick stopped
+#
+# A call is only started if its smoothed cost still fits in the remaining
+# budget, so the worst-case tick stays at BUDGET (+ one call) regardless of
+# the process count. Connections are refreshed at most every CONN_SECONDS
+# per process; processes that deny access are not asked again.
+import heapq
+import time
+from collections import deque
+
+import psutil
+
+BUDGET = 0.008          # seconds per tick
+TOP_CPU = 16
+CONN_SECONDS = 5.0
+FIELDS = ("io_read", "io_write", "conns", "fds")    # added to snapshot entries
+
+_OPS = ("io", "fds", "conns")
+
+
+class _Stats:
+    __slots__ = ("proc", "create_time", "io", "values", "conns_at", "denied")
+
+    def __init__(self, proc, create_time):
+        self.proc = proc
+        self.create_time = create_time
+        self.io = None                    # (time, read bytes, write bytes)
+        self.values = {}                  # the FIELDS known so far
+        self.conns_at = float("-inf")
+        self.denied = set()               # ops this process refused
+
+
+class ResourceSampler:
+    def __init__(self, budget=BUDGET, top=TOP_CPU, conn_seconds=CONN_SECONDS):
+        self.budget = budget
+        self.top = top
+        self.conn_seconds = conn_seconds
+        self._stats = {}
+        self._queue = deque()       # round-robin order of the remaining PIDs
+        self._focus = ()
+        # smoothed seconds per call; a start value so the first tick is careful
+        self.cost = dict.fromkeys(_OPS, 0.0005)
+        self.visited = 0            # processes visited in the last tick
+
+    def focus(self, pids):
+        """PIDs to refresh first on every tick (the selection)."""
+        self._focus = tuple(pids)
+
+    def update(self, snapshot, now=None):
+        """Refresh as many processes as fit in the budget, then annotate snapshot entries.
+
+        Called by the collectors on the snapshot's plain dict, before it is published.
+        """
+        start = time.perf_counter()
+        deadline = start + self.budget
+        now = time.monotonic() if now is None else now
+        stats = self._stats
+
+        # forget exited PIDs (in the rotation too, which may not reach them for
+        # a while when focus/top-CPU visits use the budget), queue new ones
+        gone = stats.keys() - snapshot.keys()
+        if gone:
+            for pid in gone:
+                del stats[pid]
+            self._queue = deque(filter(snapshot.__contains__, self._queue))
+        for pid in snapshot.keys() - stats.keys():
+            stats[pid] = None
+            self._queue.append(pid)
+
+        visited = set()
+        order = list(self._focus)
+        order += [p["pid"] for p in heapq.nlargest(self.top, snapshot.values(), key=lambda p: p["cpu"])]
+        for pid in order:
+            if pid in snapshot and pid not in visited:
+                visited.add(pid)
+                if not self._visit(pid, snapshot[pid], now, deadline):
+                    break
+        else:
+            queue = self._queue
+            for _ in range(len(queue)):
+                if time.perf_counter() >= deadline:
+                    break
+                pid = queue.popleft()
+                queue.append(pid)
+                if pid in visited:
+                    continue
+                visited.add(pid)
+                if not self._visit(pid, snapshot[pid], now, deadline):
+                    break
+        self.visited = len(visited)
+
+        for pid, s in stats.items():
+            if s is not None and s.values:
+                info = snapshot[pid]
+                if info["create_time"] == s.create_time:
+                    info.update(s.values)
+        return time.perf_counter() - start
+
+    def _visit(self, pid, info, now, deadline):
+        """Refresh one process; False once the budget is used up."""
+        s = self._stats.get(pid)
+        if s is None or s.create_time != info["create_time"]:
+            try:
+                s = self._stats[pid] = _Stats(psutil.Process(pid), info["create_time"])
+            except psutil.Error:
+                return True
+        ops = [op for op in ("io", "fds") if op not in s.denied]
+        if "conns" not in s.denied and now - s.conns_at >= self.conn_seconds:
+            ops.append("conns")
+        for op in ops:
+            t0 = time.perf_counter()
+            if t0 + self.cost[op] > deadline:
+                return False
+            try:
+                self._read(s, op, now)
+            except psutil.AccessDenied:
+                s.denied.add(op)
+            except psutil.Error:
+                return True   # gone; dropped on the next tick
+            finally:
+                self.cost[op] += (time.perf_counter() - t0 - self.cost[op]) * 0.2
+        return True
+
+    @staticmethod
+    def _read(s, op, now):
+        p = s.proc
+        if op == "io":
+            io = p.io_counters()
+            prev, s.io = s.io, (now, io.read_bytes, io.write_bytes)
+            if prev is not None and now > prev[0]:
+                dt = now - prev[0]
+                s.values["io_read"] = max(io.read_bytes - prev[1], 0) / dt
+                s.values["io_write"] = max(io.write_bytes - prev[2], 0) / dt
+        elif op == "fds":
+            s.values["fds"] = p.num_fds() if hasattr(p, "num_fds") else p.num_handles()
+        else:
+            conns = p.net_connections(kind="inet") if hasattr(p, "net_connections") else p.connections(kind="inet")
+            s.values["conns"] = len(conns)
+            s.conns_at = now
+
+
+_sampler = ResourceSampler()
+
+
+def get_sampler():
+    return _sampler
@@ -0,0 +1,171 @@
+# modules/processes/search.py
+# Filter bar queries over the process list.
+#
+#   chrome              name contains "chrome" (case-insensitive)
+#   /^kworker/  re:ssh  name matches a regular expression
+#   user:root           user name contains "root"
+#   pid:1000-2000       PID range (either end may be left open: pid:1000-)
+#   cpu>5  mem>=1.5     CPU% / RAM% thresholds (<, <=, >, >=, =)
+#
+# Terms are ANDed. ProcessIndex keeps PIDs grouped by name and by user and a
+# sorted PID list; it is updated with the processes that appeared, exited or
+# changed name since the last snapshot, so a query only scans the distinct
+# names/users (a few hundred even with 10k processes) and the candidates left
+# after those terms.
+#
+# update() runs on the sampler thread and mutates the index in place under
+# _lock; search() and filter() answer from the Tk thread with fresh sets/dicts.
+import bisect
+import operator
+import re
+import threading
+
+_OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+        "=": operator.eq, "==": operator.eq}
+_THRESHOLD = re.compile(r"^(cpu|mem)(>=|<=|==|>|<|=)(\d+(?:\.\d*)?)$")
+_PID_RANGE = re.compile(r"^(\d*)-(\d*)$")
+
+
+class Query:
+    """A parsed filter; see parse_query()."""
+
+    def __init__(self):
+        self.names = []        # casefolded substrings
+        self.patterns = []     # compiled regexes on the name
+        self.users = []        # casefolded substrings
+        self.pid_range = None  # (low, high), inclusive, either may be None
+        self.thresholds = []   # (field, op, value)
+
+    def __bool__(self):
+        return bool(self.names or self.patterns or self.users
+                    or self.pid_range or self.thresholds)
+
+
+def parse_query(text):
+    """Parse filter bar text; raises ValueError on a malformed term."""
+    q = Query()
+    for term in text.split():
+        lower = term.casefold()
+        if len(term) > 2 and term.startswith("/") and term.endswith("/"):
+            q.patterns.append(_compile(term[1:-1]))
+        elif lower.startswith("re:"):
+            q.patterns.append(_compile(term[3:]))
+        elif lower.startswith("user:"):
+            q.users.append(lower[5:])
+        elif lower.startswith("pid:"):
+            spec = lower[4:]
+            m = _PID_RANGE.match(spec)
+            if spec.isdigit():
+                q.pid_range = (int(spec), int(spec))
+            elif m and (m.group(1) or m.group(2)):
+                q.pid_range = (int(m.group(1)) if m.group(1) else None,
+                               int(m.group(2)) if m.group(2) else None)
+            else:
+                raise ValueError(f"bad PID range: {term}")
+        elif _THRESHOLD.match(lower):
+            field, op, value = _THRESHOLD.match(lower).groups()
+            q.thresholds.append((field, _OPS[op], float(value)))
+        else:
+            q.names.append(lower)
+    return q
+
+
+def _compile(pattern):
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"bad regex /{pattern}/: {e}") from None
+
+
+class ProcessIndex:
+    """Incrementally maintained name/user/PID index over process snapshots."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = {}     # pid -> (name_key, user)
+        self._by_name = {}   # name_key -> {pid}
+        self._by_user = {}   # casefolded user -> {pid}
+        self._pids = []      # sorted
+        self.snapshot = {}
+
+    def __len__(self):
+        return len(self._entry)
+
+    def update(self, snapshot):
+        """Apply the processes that appeared, exited or changed since the last call."""
+        with self._lock:
+            entry = self._entry
+            for pid in entry.keys() - snapshot.keys():
+                self._remove(pid)
+            for pid, info in snapshot.items():
+                old = entry.get(pid)
+                # same PID but a new name (exec) or owner (PID reuse): re-index
+                if old is None or old[0] != info["name_key"] or old[1] != info["user"]:
+                    if old is not None:
+                        self._remove(pid)
+                    self._add(pid, info)
+            self.snapshot = snapshot
+
+    def _add(self, pid, info):
+        self._entry[pid] = (info["name_key"], info["user"])
+        self._by_name.setdefault(info["name_key"], set()).add(pid)
+        self._by_user.setdefault(info["user"].casefold(), set()).add(pid)
+        bisect.insort(self._pids, pid)
+
+    def _remove(self, pid):
+        name_key, user = self._entry.pop(pid)
+        for groups, k in ((self._by_name, name_key), (self._by_user, user.casefold())):
+            group = groups[k]
+            group.discard(pid)
+            if not group:
+                del groups[k]
+        i = bisect.bisect_left(self._pids, pid)
+        del self._pids[i]
+
+    def search(self, query):
+        """PIDs matching query (a Query or filter text), as a set."""
+        if isinstance(query, str):
+            query = parse_query(query)
+        with self._lock:
+            candidates = None
+
+            def narrow(pids):
+                nonlocal candidates
+                candidates = pids if candidates is None else candidates & pids
+
+            for sub in query.names:
+                narrow(self._union(self._by_name, lambda k: sub in k))
+            for pattern in query.patterns:
+                narrow(self._union(self._by_name, lambda k: pattern.search(k) is not None))
+            for sub in query.users:
+                narrow(self._union(self._by_user, lambda k: sub in k))
+            if query.pid_range is not None:
+                low, high = query.pid_range
+                lo = 0 if low is None else bisect.bisect_left(self._pids, low)
+                hi = len(self._pids) if high is None else bisect.bisect_right(self._pids, high)
+                narrow(set(self._pids[lo:hi]))
+
+            snapshot = self.snapshot
+            # CPU/RAM change every tick, so thresholds are checked on what is left
+            for field, op, value in query.thresholds:
+                if candidates is None:
+                    candidates = {pid for pid, info in snapshot.items() if op(info[field], value)}
+                else:
+                    candidates = {pid for pid in candidates
+                                  if pid in snapshot and op(snapshot[pid][field], value)}
+            return set(snapshot.keys()) if candidates is None else candidates
+
+    def filter(self, query):
+        """The last snapshot restricted to processes matching query."""
+        snapshot = self.snapshot
+        if not query:
+            return snapshot
+        return {pid: snapshot[pid] for pid in self.search(query) if pid in snapshot}
+
+    @staticmethod
+    def _union(groups, match):
+        hits = set()
+        for key, pids in groups.items():
+            if match(key):
+                hits |= pids
+        return hits
@@ -0,0 +1,306 @@
+# modules/processes/table.py
+# Incremental Treeview updates: rows are keyed by PID (used as the Treeview iid)
+# and only rows that appeared, exited, moved or changed touch Tk.
+#
+# VirtualTable goes one step further for very large process lists: the tree
+# only ever holds the rows that fit on screen, so scrolling and refreshing cost
+# the same with 100 or 100k processes.
+import bisect
+
+
+def fmt(x, precision=1):
+    try:
+        return f"{x:.{precision}f}"
+    except:
+        return "0.0"
+
+
+def fmt_rate(bps):
+    """Bytes/s as B/s, KB/s or MB/s; "–" while not sampled yet."""
+    if bps is None:
+        return "–"
+    if bps < 1024:
+        return f"{bps:.0f} B/s"
+    if bps < 1024 * 1024:
+        return f"{bps / 1024:.0f} KB/s"
+    return f"{bps / (1024 * 1024):.1f} MB/s"
+
+
+def _count(n):
+    return "–" if n is None else n
+
+
+def process_rows(items):
+    """Treeview rows (iid, values) for a list of process infos."""
+    rows = []
+    for it in items:
+        read, write = it.get("io_read"), it.get("io_write")
+        io = None if read is None else read + write
+        rows.append((str(it["pid"]), (it["pid"], it["name"], fmt(it["cpu"],1), fmt(it["mem"],1),
+                                      fmt_rate(io), _count(it.get("conns")), _count(it.get("fds")))))
+    return rows
+
+
+def _stable_rows(positions):
+    """Indices (into positions) of a longest increasing subsequence.
+
+    Rows on that subsequence are already in the right relative order and can
+    stay where they are; every other existing row has to be moved.
+    """
+    tails = []       # tails[k] = index in positions of the smallest tail of a run of length k+1
+    tail_vals = []
+    prev = [-1] * len(positions)
+    for i, pos in enumerate(positions):
+        k = bisect.bisect_left(tail_vals, pos)
+        if k > 0:
+            prev[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_vals.append(pos)
+        else:
+            tails[k] = i
+            tail_vals[k] = pos
+    keep = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+
+class TreeReconciler:
+    def __init__(self, tree, tags=("even", "odd")):
+        self.tree = tree
+        self.tags = tags
+        self._values = {}   # iid -> values currently shown
+        self._tag = {}      # iid -> zebra tag currently shown
+        self._order = []    # iids in display order
+
+    def update(self, rows, offset=0):
+        """rows: ordered list of (iid, values). Returns the number of Tk calls made.
+
+        offset is the position of the first row in a larger list, so zebra
+        stripes stay attached to rows while a virtual window scrolls.
+        """
+        tree = self.tree
+        calls = 0
+        new_order = [iid for iid, _ in rows]
+        wanted = set(new_order)
+
+        # exited rows
+        gone = [iid for iid in self._order if iid not in wanted]
+        if gone:
+            tree.delete(*gone)
+            calls += 1
+            for iid in gone:
+                del self._values[iid]
+                del self._tag[iid]
+        current = [iid for iid in self._order if iid in wanted] if gone else self._order
+
+        # existing rows that need to move (none in the common case)
+        existing = [iid for iid in new_order if iid in self._values]
+        if existing == current:
+            moving = ()
+        else:
+            where = {iid: i for i, iid in enumerate(current)}
+            keep = _stable_rows([where[iid] for iid in existing])
+            moving = {iid for i, iid in enumerate(existing) if i not in keep}
+
+        tags = self.tags
+        for i, (iid, values) in enumerate(rows):
+            tag = tags[(offset + i) % len(tags)]
+            shown = self._values.get(iid)
+            if shown is None or iid in moving:
+                index = tree.index(new_order[i - 1]) + 1 if i else 0
+                if shown is None:
+                    tree.insert("", index, iid=iid, values=values, tags=(tag,))
+                    self._values[iid] = values
+                    self._tag[iid] = tag
+                    calls += 1
+                    continue
+                # Tk counts the target index without the moved row itself
+                if index and tree.index(iid) < index:
+                    index -= 1
+                tree.move(iid, "", index)
+                calls += 1
+            if shown != values or self._tag[iid] != tag:
+                tree.item(iid, values=values, tags=(tag,))
+                self._values[iid] = values
+                self._tag[iid] = tag
+                calls += 1
+
+        self._order = new_order
+        return calls
+
+
+def _pid_key(item):
+    return str(item["pid"])
+
+
+class VirtualTable:
+    """A Treeview that only holds the visible window of a sorted item list.
+
+    The scrollbar, mouse wheel and keyboard move a virtual offset over
+    `items`; values are formatted and reconciled for the window only.
+    Selection and focus are tracked by iid (PID), so they survive scrolling,
+    rows being re-sorted and rows dropping in and out of the window.
+    """
+
+    def __init__(self, tree, scrollbar=None, row_height=42, heading_height=40,
+                 to_rows=process_rows, key=_pid_key, on_focus=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.heading_height = heading_height
+        self.to_rows = to_rows
+        self.key = key
+        self.on_focus = on_focus    # called with the focused iid after user navigation
+        self.reconciler = TreeReconciler(tree)
+        self.items = []
+        self.start = 0
+        self.visible = 1
+        self.selected = set()
+        self.focus = None
+        self.anchor = None
+        self._shown = []
+        self._pos = None    # iid -> position, built on demand per item list
+
+        tree.bind("<<TreeviewSelect>>", self._on_select)
+        tree.bind("<Configure>", self._on_configure)
+        tree.bind("<MouseWheel>", self._on_wheel)
+        tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        tree.bind("<Button-5>", lambda e: self.scroll(3))
+        for keysym, step in (("Up", -1), ("Down", 1), ("Prior", "-page"), ("Next", "page"),
+                             ("Home", "home"), ("End", "end")):
+            tree.bind(f"<{keysym}>", lambda e, s=step: self._key(s, extend=False))
+            tree.bind(f"<Shift-{keysym}>", lambda e, s=step: self._key(s, extend=True))
+
+    # ----- data
+    def set_items(self, items):
+        """Show a new sorted list of items, keeping the scroll offset."""
+        self.items = items
+        self._pos = None
+        self.start = max(0, min(self.start, len(items) - self.visible))
+        self.render()
+
+    def index_of(self, iid):
+        """Position of iid in the current items, or None (O(n) once per refresh)."""
+        if iid in self._shown:
+            return self.start + self._shown.index(iid)
+        if self._pos is None:
+            key = self.key
+            self._pos = {key(it): i for i, it in enumerate(self.items)}
+        return self._pos.get(iid)
+
+    def selected_pids(self):
+        return [int(iid) for iid in self.selected if self.index_of(iid) is not None]
+
+    def select_pid(self, pid, scroll=True):
+        """Select, focus and (with scroll) center a PID; False if it is not in the table."""
+        iid = str(pid)
+        pos = self.index_of(iid)
+        if pos is None:
+            return False
+        self.selected = {iid}
+        self.focus = self.anchor = iid
+        if scroll:
+            self.start = max(0, min(pos - self.visible // 2, len(self.items) - self.visible))
+        self.render()
+        if self.on_focus is not None:
+            self.on_focus(iid)
+        return True
+
+    # ----- drawing
+    def render(self):
+        window = self.items[self.start:self.start + self.visible]
+        rows = self.to_rows(window)
+        self.reconciler.update(rows, offset=self.start)
+        self._shown = [iid for iid, _ in rows]
+
+        tree = self.tree
+        wanted = [iid for iid in self._shown if iid in self.selected]
+        if set(wanted) != set(tree.selection()):
+            tree.selection_set(wanted)
+        if self.focus in self._shown:
+            tree.focus(self.focus)
+
+        if self.scrollbar is not None:
+            total = len(self.items) or 1
+            self.scrollbar.set(self.start / total, min(1.0, (self.start + self.visible) / total))
+
+    def scroll(self, rows):
+        self.scroll_to(self.start + rows)
+        return "break"
+
+    def scroll_to(self, start):
+        start = max(0, min(int(start), len(self.items) - self.visible))
+        if start != self.start:
+            self.start = start
+            self.render()
+
+    def yview(self, *args):
+        """Scrollbar command."""
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            n = int(args[1])
+            self.scroll(n * self.visible if args[2] == "pages" else n)
+
+    # ----- events
+    def _on_select(self, event=None):
+        # the tree only knows about the window; merge its selection into ours
+        self.selected = (self.selected - set(self._shown)) | set(self.tree.selection())
+        focus = self.tree.focus()
+        if focus:
+            changed = focus != self.focus
+            self.focus = focus
+            if len(self.tree.selection()) <= 1:
+                self.anchor = focus
+            if changed and self.on_focus is not None:
+                self.on_focus(focus)
+
+    def _on_configure(self, event):
+        visible = max(1, (event.height - self.heading_height) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.start = max(0, min(self.start, len(self.items) - visible))
+            self.render()
+
+    def _on_wheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _key(self, step, extend):
+        if not self.items:
+            return "break"
+        pos = self.index_of(self.focus) if self.focus is not None else None
+        if pos is None:
+            pos = self.start
+        last = len(self.items) - 1
+        if step == "home":
+            pos = 0
+        elif step == "end":
+            pos = last
+        elif step in ("page", "-page"):
+            pos += self.visible if step == "page" else -self.visible
+        else:
+            pos += step
+        pos = max(0, min(pos, last))
+
+        iid = self.key(self.items[pos])
+        anchor = self.index_of(self.anchor) if extend and self.anchor is not None else None
+        if anchor is None:
+            self.selected = {iid}
+            self.anchor = iid
+        else:
+            lo, hi = sorted((anchor, pos))
+            self.selected = {self.key(it) for it in self.items[lo:hi + 1]}
+        self.focus = iid
+        if self.on_focus is not None:
+            self.on_focus(iid)
+
+        if pos < self.start:
+            self.start = pos
+        elif pos >= self.start + self.visible:
+            self.start = pos - self.visible + 1
+        self.render()
+        return "break"
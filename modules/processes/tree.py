@@ -0,0 +1,183 @@
+# modules/processes/tree.py
+# Parent/child process tree with rolled-up CPU/RAM per subtree.
+#
+# The ppid graph is kept across snapshots. Each update applies only what
+# changed: exited processes are detached, new ones attached, reparented ones
+# moved, and a process whose own CPU/RAM changed pushes the difference up its
+# ancestor path. Subtree totals are never recomputed from scratch, so a tick
+# costs O(changed processes x tree depth).
+#
+# The graph is shared between the sampler thread (update) and the Tk thread
+# (rows), both under _lock; rows() copies what it needs into new dicts.
+import threading
+
+
+class _Node:
+    __slots__ = ("pid", "ppid", "name", "name_key", "create_time", "parent", "children",
+                 "cpu", "mem", "rss", "sub_cpu", "sub_mem", "sub_rss", "info")
+
+    def __init__(self, info):
+        self.pid = info["pid"]
+        self.ppid = info["ppid"]
+        self.name = info["name"]
+        self.name_key = info["name_key"]
+        self.create_time = info["create_time"]
+        self.parent = None
+        self.children = set()
+        self.cpu = self.sub_cpu = info["cpu"]
+        self.mem = self.sub_mem = info["mem"]
+        self.rss = self.sub_rss = info["rss"]
+        self.info = info     # latest snapshot entry (own I/O, connections, FDs)
+
+
+def _add_up(node, cpu, mem, rss):
+    """Add a delta to the subtree totals of node and all its ancestors."""
+    while node is not None:
+        node.sub_cpu += cpu
+        node.sub_mem += mem
+        node.sub_rss += rss
+        node = node.parent
+
+
+class ProcessTree:
+    def __init__(self):
+        self._nodes = {}
+        self._roots = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def get(self, pid):
+        """The live node for pid (mutated by update(): not for the Tk thread)."""
+        return self._nodes.get(pid)
+
+    # ----- incremental maintenance
+    def update(self, snapshot):
+        with self._lock:
+            nodes = self._nodes
+            detached = []
+            for pid in nodes.keys() - snapshot.keys():
+                detached.extend(self._remove(nodes[pid]))
+
+            for pid, info in snapshot.items():
+                node = nodes.get(pid)
+                if node is not None and node.create_time != info["create_time"]:
+                    detached.extend(self._remove(node))   # PID reused
+                    node = None
+                if node is None:
+                    node = nodes[pid] = _Node(info)
+                    self._roots.add(node)
+                    detached.append(node)
+                    continue
+
+                node.name = info["name"]
+                node.name_key = info["name_key"]
+                node.info = info
+                d_cpu = info["cpu"] - node.cpu
+                d_mem = info["mem"] - node.mem
+                d_rss = info["rss"] - node.rss
+                if d_cpu or d_mem or d_rss:
+                    node.cpu, node.mem, node.rss = info["cpu"], info["mem"], info["rss"]
+                    _add_up(node, d_cpu, d_mem, d_rss)
+                if info["ppid"] != node.ppid:
+                    node.ppid = info["ppid"]
+                    self._detach(node)
+                    detached.append(node)
+
+            for node in detached:
+                if node.parent is None and nodes.get(node.pid) is node:
+                    self._attach(node)
+
+    def _remove(self, node):
+        """Drop node; returns its children, which are roots until re-attached."""
+        self._detach(node)
+        self._roots.discard(node)
+        del self._nodes[node.pid]
+        orphans = list(node.children)
+        for child in orphans:
+            child.parent = None
+            self._roots.add(child)
+        node.children.clear()
+        return orphans
+
+    def _detach(self, node):
+        parent = node.parent
+        if parent is None:
+            return
+        _add_up(parent, -node.sub_cpu, -node.sub_mem, -node.sub_rss)
+        parent.children.discard(node)
+        node.parent = None
+        self._roots.add(node)
+
+    def _attach(self, node):
+        parent = self._nodes.get(node.ppid)
+        # no parent, PID 0 style self-parents, or a reused PID younger than the child
+        if parent is None or parent is node or parent.create_time > node.create_time:
+            return
+        ancestor = parent
+        while ancestor is not None:       # never create a cycle
+            if ancestor is node:
+                return
+            ancestor = ancestor.parent
+        node.parent = parent
+        parent.children.add(node)
+        self._roots.discard(node)
+        _add_up(parent, node.sub_cpu, node.sub_mem, node.sub_rss)
+
+    # ----- flattening for the table
+    def rows(self, collapsed=(), column="name", descending=False, only=None):
+        """Depth-first list of row dicts (subtree totals as cpu/mem/rss).
+
+        Siblings are ordered by `column`; `collapsed` PIDs hide their children;
+        with `only` (a set of PIDs), just those and their ancestors are listed.
+        """
+        key = _SIBLING_KEYS[column]
+        with self._lock:
+            keep = None
+            if only is not None:
+                keep = set()
+                for pid in only:
+                    node = self._nodes.get(pid)
+                    while node is not None and node.pid not in keep:
+                        keep.add(node.pid)
+                        node = node.parent
+
+            out = []
+            stack = [(n, 0) for n in sorted(self._roots, key=key, reverse=not descending)]
+            while stack:
+                node, depth = stack.pop()
+                if keep is not None and node.pid not in keep:
+                    continue
+                folded = node.pid in collapsed
+                info = node.info
+                if not node.children:
+                    marker = "   "
+                else:
+                    marker = "▸ " if folded else "▾ "
+                out.append({
+                    "pid": node.pid, "ppid": node.ppid, "depth": depth,
+                    "name": "    " * depth + marker + node.name, "name_key": node.name_key,
+                    "cpu": max(node.sub_cpu, 0.0), "mem": max(node.sub_mem, 0.0),
+                    "rss": max(node.sub_rss, 0), "own_cpu": node.cpu, "own_mem": node.mem,
+                    "children": len(node.children),
+                    # not rolled up: these are the process's own
+                    "io_read": info.get("io_read"), "io_write": info.get("io_write"),
+                    "conns": info.get("conns"), "fds": info.get("fds"),
+                })
+                if node.children and not folded:
+                    # pushed in reverse so the first sibling is popped first
+                    for child in sorted(node.children, key=key, reverse=not descending):
+                        stack.append((child, depth + 1))
+            return out
+
+
+_SIBLING_KEYS = {
+    "pid": lambda n: n.pid,
+    "name": lambda n: n.name_key,
+    "cpu": lambda n: n.sub_cpu,
+    "mem": lambda n: n.sub_mem,
+    "io": lambda n: (n.info.get("io_read") or 0.0) + (n.info.get("io_write") or 0.0),
+    "conns": lambda n: n.info.get("conns") or 0,
+    "fds": lambda n: n.info.get("fds") or 0,
+}
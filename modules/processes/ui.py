@@ -1,14 +1,18 @@
 # modules/processes/ui.py
 import os
-import threading
-import time
 import getpass
-import psutil
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import ttk, messagebox
-
-REFRESH_INTERVAL = 0.25
+from tkinter import ttk
+from modules.utils.sampler import get_sampler
+from modules.processes.table import VirtualTable
+from modules.processes.backend import split_processes, ProcessSorter
+from modules.processes.search import ProcessIndex, Query, parse_query
+from modules.processes.history import ProcessHistory
+from modules.processes.detail import DetailPane
+from modules.processes.tree import ProcessTree
+from modules.processes.actions import get_executor, summarize
+from modules.processes import resources
 
 # THEME A COLORS
 BG_MAIN = "#0f0e0f"        # Main background
@@ -21,13 +25,15 @@ NEON_ACCENT = "#ff8a2b"    # Neon orange strip
 NEON_LIME = "#8CFF3E"   # Neon lime for suspend
 
 CORNER = 12
+ROW_HEIGHT = 42
 
-
-def fmt(x, precision=1):
-    try:
-        return f"{x:.{precision}f}"
-    except:
-        return "0.0"
+HEADINGS = {"pid": "PID", "name": "Name", "cpu": "CPU%", "mem": "RAM%",
+            "io": "Disk I/O", "conns": "Conns", "fds": "FDs"}
+SHOW_LIMITS = {"All": None, "Top 25": 25, "Top 100": 100}
+VIEWS = ("Split", "Tree")
+# what a process action applies to
+SCOPES = {"Process": "process", "Subtree": "tree", "Group": "group"}
+NICE_LEVELS = (("Lower priority (nice 10)", 10), ("Normal (nice 0)", 0), ("Higher priority (nice -5)", -5))
 
 
 class ProcessesUI(ctk.CTkFrame):
@@ -35,10 +41,20 @@ class ProcessesUI(ctk.CTkFrame):
         super().__init__(parent, fg_color=BG_MAIN)
         self.parent = parent
         self.current_user = getpass.getuser()
-        self._stop = threading.Event()
-        self._process_cache = {}
+        self._snapshot = {}
+        self.index = ProcessIndex()
+        self.history = ProcessHistory()
+        self.process_tree = ProcessTree()
+        self._view = "Split"
+        self._collapsed = set()
+        self._titles = {}
+        self._detail_pid = None
+        self._query = Query()
+        self._tables = {}
+        self._sorters = {}
+        self.sampler = get_sampler()
+        self._active = False
         self._build_ui()
-        self._start_background_updates()
 
     # --------------------------------------------------
     # BUILD INTERFACE
@@ -56,18 +72,56 @@ class ProcessesUI(ctk.CTkFrame):
 
         # Top buttons
         top = ctk.CTkFrame(self, fg_color="transparent")
-        top.pack(fill="x", padx=padx, pady=(8, 16))
+        top.pack(fill="x", padx=padx, pady=(8, 8))
 
         self.btn_refresh = ctk.CTkButton(top, text="Refresh", width=120,fg_color="#124c0c", command=self.refresh_now)
-        self.btn_kill = ctk.CTkButton(top, text="Kill Selected", width=140, fg_color="#e66b6b")
-        self.btn_suspend = ctk.CTkButton(top, text="Suspend", width=120, fg_color="#ff9b4a")
+        self.btn_kill = ctk.CTkButton(top, text="Kill Selected", width=140, fg_color="#e66b6b",
+                                      command=self._kill_selected)
+        self.btn_suspend = ctk.CTkButton(top, text="Suspend", width=120, fg_color="#ff9b4a",
+                                         command=self._suspend_selected)
+        self.scope_select = ctk.CTkSegmentedButton(top, values=list(SCOPES))
+        self.scope_select.set("Process")
+        self.action_status = ctk.CTkLabel(top, text="", text_color=TEXT_PRIMARY, anchor="w")
+
+        self.show_select = ctk.CTkSegmentedButton(top, values=list(SHOW_LIMITS),
+                                                  command=self._set_limit)
+        self.show_select.set("All")
 
         self.btn_refresh.grid(row=0, column=0, padx=(0,12))
         self.btn_kill.grid(row=0, column=1, padx=(0,12))
         self.btn_suspend.grid(row=0, column=2)
+        self.view_select = ctk.CTkSegmentedButton(top, values=list(VIEWS), command=self._set_view)
+        self.view_select.set("Split")
+        self.show_select.grid(row=0, column=3, padx=(24,0))
+        self.view_select.grid(row=0, column=4, padx=(12,0))
+        self.scope_select.grid(row=0, column=5, padx=(12,0))
+        self.action_status.grid(row=0, column=6, padx=(16,0), sticky="w")
+        self._action_color = self.action_status.cget("text_color")
+
+        # right-click: every action on the selection
+        self.menu = tk.Menu(self, tearoff=0)
+        for label, action in (("Kill", "kill"), ("Terminate", "terminate"),
+                              ("Suspend", "suspend"), ("Resume", "resume")):
+            self.menu.add_command(label=label, command=lambda a=action: self._run_action(a))
+        nice = tk.Menu(self.menu, tearoff=0)
+        for label, value in NICE_LEVELS:
+            nice.add_command(label=label, command=lambda v=value: self._run_action("renice", v))
+        self.menu.add_cascade(label="Renice", menu=nice)
+
+        # Filter bar
+        self.filter_entry = ctk.CTkEntry(
+            self, height=34,
+            placeholder_text="Filter:  name   /regex/   user:root   pid:100-200   cpu>5   mem>=1")
+        self.filter_entry.pack(fill="x", padx=padx, pady=(0, 16))
+        self._filter_border = self.filter_entry.cget("border_color")
+        self.filter_entry.bind("<KeyRelease>", self._on_filter)
+
+        # Selected process: last minute of CPU/RAM
+        self.detail = DetailPane(self)
+        self.detail.pack(fill="x", padx=padx, pady=(0, 16))
 
         # Content area
-        content = ctk.CTkFrame(self, fg_color="transparent")
+        content = self.content = ctk.CTkFrame(self, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=padx, pady=(0, pady))
 
         content.grid_rowconfigure(0, weight=1)
@@ -99,28 +153,32 @@ class ProcessesUI(ctk.CTkFrame):
                            font=ctk.CTkFont(size=16, weight="bold"), 
                            text_color=TEXT_PRIMARY)
         lbl.pack(anchor="w", padx=12, pady=(0, 10))
+        self._titles[title] = lbl
 
         # Table frame
         table_frame = ctk.CTkFrame(inner, fg_color="transparent")
         table_frame.pack(fill="both", expand=True, padx=12, pady=4)
 
         # Treeview
-        columns = ("pid", "name", "cpu", "mem")
+        columns = ("pid", "name", "cpu", "mem", "io", "conns", "fds")
         tree = ttk.Treeview(table_frame, columns=columns, show="headings", selectmode="extended")
 
-        tree.heading("pid", text="PID")
-        tree.heading("name", text="Name")
-        tree.heading("cpu", text="CPU%")
-        tree.heading("mem", text="RAM%")
+        # click a heading to sort by it, click again to reverse
+        for col in columns:
+            tree.heading(col, text=HEADINGS[col], command=lambda c=col, t=tree: self._sort_by(t, c))
 
         tree.column("pid", width=100, anchor="w")
         tree.column("name", anchor="w")
         tree.column("cpu", width=90, anchor="center")
         tree.column("mem", width=90, anchor="center")
+        tree.column("io", width=110, anchor="center")
+        tree.column("conns", width=80, anchor="center")
+        tree.column("fds", width=80, anchor="center")
 
-        vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+        # vertical scrolling is virtual: the tree only holds the visible rows
+        vsb = ttk.Scrollbar(table_frame, orient="vertical")
         hsb = ttk.Scrollbar(table_frame, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        tree.configure(xscrollcommand=hsb.set)
 
         tree.pack(side="top", fill="both", expand=True)
         vsb.pack(side="right", fill="y")
@@ -134,7 +192,7 @@ class ProcessesUI(ctk.CTkFrame):
                         background=ROW_ODD,
                         foreground=TEXT_PRIMARY,
                         fieldbackground=ROW_ODD,
-                        rowheight=42,
+                        rowheight=ROW_HEIGHT,
                         font=("Segoe UI", 14))
 
         style.configure("Treeview.Heading",
@@ -145,82 +203,169 @@ class ProcessesUI(ctk.CTkFrame):
 
         tree.tag_configure("odd", background=ROW_ODD)
         tree.tag_configure("even", background=ROW_EVEN)
+        table = VirtualTable(tree, vsb, row_height=ROW_HEIGHT, on_focus=self._show_detail)
+        vsb.configure(command=table.yview)
+        self._tables[tree] = table
+        tree.bind("<Button-3>", lambda e, t=tree: self._on_context_menu(t, e))
 
         # Store tree based on title
         if "Application" in title:
             self.apps_tree = tree
+            # tree view folding (only reacts while the Tree view is shown)
+            tree.bind("<Double-1>", self._on_tree_double_click)
+            tree.bind("<Left>", lambda e: self._on_tree_fold_key(True))
+            tree.bind("<Right>", lambda e: self._on_tree_fold_key(False))
+            self._sorters[tree] = ProcessSorter("name")
         else:
             self.system_tree = tree
+            self._sorters[tree] = ProcessSorter("pid")
+        self._show_sort(tree)
 
         return outer
 
     # --------------------------------------------------
-    # BACKGROUND REFRESH LOOP
+    # PAGE LIFECYCLE (sampling only while visible)
     # --------------------------------------------------
-    def _start_background_updates(self):
-        threading.Thread(target=self._updater_loop, daemon=True).start()
-
-    def _updater_loop(self):
-        while not self._stop.is_set():
-            try:
-                procs = list(psutil.process_iter(attrs=["pid","name","username","cpu_percent","memory_percent"]))
-
-                for p in procs:
-                    info = p.info
-                    pid = info.get("pid")
-                    try:
-                        cpu = p.cpu_percent(interval=None)
-                    except:
-                        cpu = info.get("cpu_percent", 0.0)
-
-                    mem = info.get("memory_percent", 0.0)
+    def start(self):
+        self._active = True
+        self.sampler.subscribe("processes", self._on_sample)
 
-                    self._process_cache[pid] = {
-                        "pid": pid,
-                        "name": info.get("name") or "",
-                        "user": info.get("username") or "",
-                        "cpu": cpu,
-                        "mem": mem
-                    }
+    def pause(self):
+        # hidden page: no sampling, no rendering
+        self._active = False
+        self.sampler.unsubscribe("processes", self._on_sample)
 
-                self.parent.after(0, self._update_ui)
+    def resume(self):
+        self.start()
+        self._update_ui()
 
-            except:
-                pass
+    def dispose(self):
+        self.destroy()
 
-            time.sleep(REFRESH_INTERVAL)
+    def _on_sample(self, snapshot):
+        # collector thread: index/history/tree lock internally; UI reads copies
+        self.index.update(snapshot)
+        self.history.update(snapshot)
+        self.process_tree.update(snapshot)
+        self._snapshot = snapshot
+        self.parent.after(0, self._update_ui)
 
     # --------------------------------------------------
     # UI POPULATION
     # --------------------------------------------------
     def _update_ui(self):
-        apps = []
-        system = []
+        if not self._active:
+            return
+        if self._view == "Tree":
+            self._fill_process_tree()
+        else:
+            procs = self.index.filter(self._query)
+            apps, system = split_processes(procs, self.current_user)
+            self._fill_tree(self.apps_tree, apps)
+            self._fill_tree(self.system_tree, system)
+        self._refresh_detail()
 
-        for pid, info in self._process_cache.items():
-            user = (info.get("user") or "").lower()
+    def _fill_tree(self, tree, items):
+        # only the visible window is formatted and reconciled (PID is the iid)
+        self._tables[tree].set_items(self._sorters[tree].sort(items))
 
-            if user in ("system","nt authority\\system","local service","network service","") or pid == 0:
-                system.append(info)
-            else:
-                if self.current_user.lower() in user:
-                    apps.append(info)
-                else:
-                    system.append(info)
+    # --------------------------------------------------
+    # TREE VIEW (parent/child with subtree totals)
+    # --------------------------------------------------
+    def _set_view(self, view):
+        self._view = view
+        title = self._titles["Application Processes"]
+        if view == "Tree":
+            title.configure(text="Process Tree  (CPU/RAM include children; double-click to fold)")
+            self.sys_card.grid_remove()
+            self.content.grid_rowconfigure(1, weight=0)
+        else:
+            title.configure(text="Application Processes")
+            self.sys_card.grid()
+            self.content.grid_rowconfigure(1, weight=1)
+        # row values change meaning, so start from a fresh table
+        table = self._tables[self.apps_tree]
+        table.start = 0
+        self._update_ui()
 
-        apps = sorted(apps, key=lambda x: x["name"].lower() if x["name"] else "")
-        system = sorted(system, key=lambda x: x["pid"])
+    def _fill_process_tree(self):
+        sorter = self._sorters[self.apps_tree]
+        only = self.index.search(self._query) if self._query else None
+        rows = self.process_tree.rows(self._collapsed, sorter.column, sorter.descending, only)
+        self._tables[self.apps_tree].set_items(rows)
 
-        self._fill_tree(self.apps_tree, apps)
-        self._fill_tree(self.system_tree, system)
+    def _toggle_fold(self, pid):
+        if self._view != "Tree" or pid is None:
+            return
+        self._collapsed ^= {pid}
+        self._update_ui()
 
-    def _fill_tree(self, tree, items):
-        tree.delete(*tree.get_children())
-        for i, it in enumerate(items):
-            tag = "even" if i % 2 == 0 else "odd"
-            tree.insert("", "end",
-                        values=(it["pid"], it["name"], fmt(it["cpu"],1), fmt(it["mem"],1)),
-                        tags=(tag,))
+    def _on_tree_double_click(self, event):
+        iid = self.apps_tree.identify_row(event.y)
+        if self._view == "Tree" and iid:
+            self._toggle_fold(int(iid))
+            return "break"
+
+    def _on_tree_fold_key(self, fold):
+        focus = self._tables[self.apps_tree].focus
+        if self._view != "Tree" or focus is None:
+            return
+        pid = int(focus)
+        if (pid in self._collapsed) != fold:
+            self._toggle_fold(pid)
+        return "break"
+
+    def _show_detail(self, iid):
+        self._detail_pid = int(iid)
+        self.history.pin(self._detail_pid)
+        # the selection's I/O, connections and FDs are refreshed first every tick
+        resources.get_sampler().focus(self._get_selected_pids() or [self._detail_pid])
+        self._refresh_detail()
+
+    def _refresh_detail(self):
+        pid = self._detail_pid
+        if pid is None:
+            return
+        info = self._snapshot.get(pid)
+        if info is None:
+            # exited (its history went with it)
+            self._detail_pid = None
+            self.history.pin(None)
+            self.detail.clear()
+            return
+        # None: evicted before it was selected; pinned, so tracked from the next tick
+        self.detail.show(info, self.history.get(pid))
+
+    # --------------------------------------------------
+    # SORTING
+    # --------------------------------------------------
+    def _sort_by(self, tree, column):
+        self._sorters[tree].toggle(column)
+        self._show_sort(tree)
+        self._update_ui()
+
+    def _show_sort(self, tree):
+        sorter = self._sorters[tree]
+        for col, text in HEADINGS.items():
+            if col == sorter.column:
+                text += " \u25bc" if sorter.descending else " \u25b2"
+            tree.heading(col, text=text)
+
+    def _on_filter(self, event=None):
+        try:
+            query = parse_query(self.filter_entry.get())
+        except ValueError:
+            # half-typed regex or range: keep the last valid filter
+            self.filter_entry.configure(border_color="#e66b6b")
+            return
+        self.filter_entry.configure(border_color=self._filter_border)
+        self._query = query
+        self._update_ui()
+
+    def _set_limit(self, label):
+        for sorter in self._sorters.values():
+            sorter.limit = SHOW_LIMITS[label]
+        self._update_ui()
 
     # --------------------------------------------------
     # BUTTON ACTIONS
@@ -229,33 +374,44 @@ class ProcessesUI(ctk.CTkFrame):
         self._update_ui()
 
     def _get_selected_pids(self):
+        # selection is kept per table by PID, including rows scrolled out of view
         pids = []
         for tree in (self.apps_tree, self.system_tree):
-            for sel in tree.selection():
-                try:
-                    pids.append(int(sel))
-                except:
-                    pass
+            pids.extend(self._tables[tree].selected_pids())
         return pids
 
-    def _kill_selected(self):
+    def _on_context_menu(self, tree, event):
+        iid = tree.identify_row(event.y)
+        if iid and int(iid) not in self._tables[tree].selected_pids():
+            self._tables[tree].select_pid(int(iid), scroll=False)   # the row is on screen
+        self.menu.tk_popup(event.x_root, event.y_root)
+
+    def _run_action(self, action, value=None):
+        # runs on the executor's worker pool; one summary comes back when all of it is done
         pids = self._get_selected_pids()
         if not pids:
             return
-        for pid in pids:
-            try:
-                psutil.Process(pid).kill()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to kill PID {pid}\n{e}")
+        scope = SCOPES[self.scope_select.get()]
+        what = f"{len(pids)} process{'es' if len(pids) != 1 else ''}"
+        if scope != "process":
+            what += " (" + self.scope_select.get().lower() + ")"
+        self.action_status.configure(text=f"{action.capitalize()}: {what} …", text_color=self._action_color)
+        # the processes as listed: a PID reused since then is not touched
+        created = {pid: self._snapshot[pid]["create_time"] for pid in pids if pid in self._snapshot}
+        get_executor().submit(action, pids, scope, value, created=created,
+                              callback=lambda result: self.parent.after(0, self._show_action_result, result))
+
+    def _show_action_result(self, result):
+        trouble = result.failed or result.alive
+        self.action_status.configure(text=summarize(result),
+                                     text_color="#e66b6b" if trouble else self._action_color)
+
+    def _kill_selected(self):
+        self._run_action("kill")
 
     def _suspend_selected(self):
-        pids = self._get_selected_pids()
-        for pid in pids:
-            try:
-                psutil.Process(pid).suspend()
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to suspend PID {pid}\n{e}")
+        self._run_action("suspend")
 
     def destroy(self):
-        self._stop.set()
+        self.pause()
         super().destroy()
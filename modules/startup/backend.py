@@ -1,6 +1,6 @@
 # modules/startup/backend.py
 import platform
-import os
+import subprocess
 apps = []
 
 if platform.system().lower() == "windows":
@@ -26,20 +26,28 @@ def list_startup_apps():
             while True:
                 try:
                     name, cmd, _ = winreg.EnumValue(reg, idx)
-                    result.append({"name": name, "command": cmd, "location": f"{hive}\\{path}", "enabled": True, "hive": hive, "path": path})
+                    loc = "HKCU" if hive == winreg.HKEY_CURRENT_USER else "HKLM"
+                    result.append({"name": name, "command": cmd, "location": f"{loc}:{path}", "enabled": True, "status": "Yes", "id": f"{loc}:{name}", "hive": hive, "path": path})
                 except OSError:
                     break
                 idx += 1
     elif system == "linux":
-        conf = os.path.expanduser("~/.config/autostart")
-        if os.path.isdir(conf):
-            for f in os.listdir(conf):
-                if f.endswith(".desktop"):
-                    p = os.path.join(conf, f)
-                    result.append({"name": f.replace(".desktop",""), "command": p, "location": p, "enabled": True})
+        # XDG autostart, systemd units and @reboot cron jobs (mtime-cached)
+        from modules.startup import linux
+        result = linux.get_scanner().scan()
     return result
 
+def _set_linux(app, enabled):
+    from modules.startup import linux
+    try:
+        linux.get_scanner().set_enabled(app, enabled)
+        return True
+    except (OSError, subprocess.SubprocessError):
+        return False
+
 def disable_startup(app):
+    if platform.system().lower() == "linux":
+        return _set_linux(app, False)
     if platform.system().lower() == "windows" and winreg and app.get("name"):
         try:
             reg = winreg.OpenKey(app["hive"], app["path"], 0, winreg.KEY_SET_VALUE)
@@ -49,7 +57,10 @@ def disable_startup(app):
             return False
     return False
 
-def enable_startup(name, cmd):
+def enable_startup(app):
+    if platform.system().lower() == "linux":
+        return _set_linux(app, True)
+    name, cmd = app.get("name"), app.get("command")
     if platform.system().lower() == "windows" and winreg:
         try:
             reg = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run", 0, winreg.KEY_SET_VALUE)
@@ -0,0 +1,294 @@
+# modules/startup/impact.py
+# How much each startup entry costs at boot / login.
+#
+# A background thread watches the first MEASURE_SECONDS after the entry's
+# anchor (boot for system units and cron, session start for XDG autostart and
+# user units). Only PIDs it has not seen before are inspected: a new process
+# belongs to an entry if it started within SPAWN_SECONDS of the anchor and
+# its systemd unit (cgroup) or executable matches, or if its parent already
+# belongs to one. Matched processes are then polled for CPU time, RSS and I/O
+# until the window closes.
+#
+# Results are kept per boot (default_path()); a later run in the same boot picks
+# up the saved per-process counters and only polls what is still missing, and
+# once the window is closed it just loads the ranking. A first run that starts
+# after the window has closed only sees lifetime counters, which say nothing
+# about startup cost: those entries are reported as not measured (impact None).
+import json
+import os
+import shlex
+import threading
+import time
+
+import psutil
+
+MEASURE_SECONDS = 300       # how long after the anchor processes are followed
+SPAWN_SECONDS = 120         # a startup entry's own process must start this early
+POLL_SECONDS = 5.0
+# Task Manager style: CPU seconds / disk bytes for high and medium impact
+HIGH = (1.0, 3 * 1024 * 1024)
+MEDIUM = (0.3, 300 * 1024)
+_SYSTEM_KINDS = ("systemd", "cron", "crontab")
+_WRAPPERS = ("env", "nice", "ionice", "nohup", "setsid", "exec")
+_SHELLS = ("sh", "bash", "dash", "zsh")
+
+
+def default_path():
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "sysmon", "startup_impact.json")
+
+
+def boot_id():
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as f:
+            return f.read().strip()
+    except OSError:
+        return str(int(psutil.boot_time()))
+
+
+def session_start():
+    """Creation time of this user's oldest process (the session manager / login)."""
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    oldest = None
+    for p in psutil.process_iter(["uids", "username", "create_time"]):
+        info = p.info
+        if uid is not None:
+            if not info["uids"] or info["uids"].real != uid:
+                continue
+        elif info["username"] != psutil.Process().username():
+            continue
+        if info["create_time"] and (oldest is None or info["create_time"] < oldest):
+            oldest = info["create_time"]
+    return oldest or psutil.boot_time()
+
+
+def command_key(command):
+    """Executable name a startup command runs (wrappers and `sh -c` unwrapped)."""
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        argv = command.split()
+    while argv:
+        head = os.path.basename(argv[0])
+        if "=" in argv[0] or head in _WRAPPERS:
+            argv = argv[1:]
+            # the wrapper's own options, e.g. nice -n 5 / ionice -c 3
+            while argv and (argv[0].startswith("-") or argv[0].isdigit()):
+                argv = argv[1:]
+        elif head in _SHELLS and len(argv) > 2 and argv[1] == "-c":
+            return command_key(argv[2])
+        elif head == "flatpak" and "run" in argv:
+            # flatpak run [opts] org.example.App -> "App"
+            rest = [a for a in argv[argv.index("run") + 1:] if not a.startswith("-")]
+            return rest[0].rsplit(".", 1)[-1].lower() if rest else head
+        else:
+            return head.lower()
+    return ""
+
+
+def rank(cpu, io):
+    if cpu >= HIGH[0] or io >= HIGH[1]:
+        return "high"
+    if cpu >= MEDIUM[0] or io >= MEDIUM[1]:
+        return "medium"
+    return "low"
+
+
+def _cgroup_unit(pid):
+    """systemd unit of a process from its cgroup path, or None."""
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            path = f.read().rsplit(":", 1)[-1].strip()
+    except OSError:
+        return None
+    for part in reversed(path.split("/")):
+        if part.endswith((".service", ".scope", ".socket", ".timer")):
+            return part
+    return None
+
+
+class ImpactTracker:
+    def __init__(self, path=None, measure=MEASURE_SECONDS, spawn=SPAWN_SECONDS, poll=POLL_SECONDS):
+        self.path = path or default_path()
+        self.measure = measure
+        self.spawn = spawn
+        self.poll = poll
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._seen = set()        # PIDs already inspected (matched or not)
+        self._procs = {}          # pid -> [entry id, create_time, cpu s, io bytes, rss]
+        self._anchors = {}
+        self._final = False
+        self._partial = False
+        self._load()
+
+    # ----- persistence
+    def _load(self):
+        self.boot = boot_id()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("boot") != self.boot:
+            return   # results of an earlier boot: measure again
+        self._final = data.get("final", False)
+        self._partial = data.get("partial", False)
+        self._anchors = data.get("anchors", {})
+        self._procs = {int(pid): rec for pid, rec in data.get("procs", {}).items()}
+
+    def _save(self):
+        data = {"boot": self.boot, "final": self._final, "partial": self._partial, "anchors": self._anchors,
+                "procs": {str(pid): rec for pid, rec in self._procs.items()}}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    # ----- measuring
+    def start(self, entries=None):
+        """Measure in the background (no-op once this boot's results are final)."""
+        if self._final or (self._thread and self._thread.is_alive()):
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(entries,), name="startup-impact", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def measuring(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self, entries):
+        if entries is None:
+            from modules.startup import backend
+            entries = backend.list_startup_apps()
+        if not self._anchors:
+            boot, session = psutil.boot_time(), session_start()
+            self._anchors = {"boot": boot, "session": session}
+            # started after the window: CPU/I-O include everything since then
+            self._partial = time.time() > max(boot, session) + self.measure
+        units, names = {}, {}
+        for e in entries:
+            if not e.get("enabled"):
+                continue
+            anchor = "boot" if e.get("kind") in _SYSTEM_KINDS else "session"
+            if e.get("unit"):
+                units[e["unit"]] = (e["id"], anchor)
+            key = command_key(e.get("command", ""))
+            if key:
+                names.setdefault(key, (e["id"], anchor))
+        while not self._stop.is_set():
+            done = self.tick(units, names)
+            self._save()
+            if done:
+                return
+            self._stop.wait(self.poll)
+
+    def tick(self, units, names, now=None):
+        """One pass: match new PIDs, poll matched ones. True once the window closed."""
+        now = time.time() if now is None else now
+        closes = max(self._anchors.values()) + self.measure
+        # scan and poll a copy (only this thread changes _procs and _seen);
+        # results() just waits for the swap at the end
+        with self._lock:
+            procs = {pid: list(rec) for pid, rec in self._procs.items()}
+        new = []
+        for pid in psutil.pids():
+            if pid in self._seen:
+                continue
+            self._seen.add(pid)
+            if pid in procs:
+                continue   # restored from an earlier run
+            try:
+                p = psutil.Process(pid)
+                new.append((p.create_time(), pid, p))
+            except psutil.Error:
+                continue
+        # parents before children, so descendants can inherit the entry
+        for created, pid, p in sorted(new, key=lambda t: t[0]):
+            owner = self._match(pid, p, created, units, names, procs)
+            if owner is not None:
+                procs[pid] = [owner, created, 0.0, 0, 0]
+
+        for pid, rec in procs.items():
+            if rec[1] is None:
+                continue   # exited earlier: counters are final
+            try:
+                p = psutil.Process(pid)
+                if p.create_time() != rec[1]:
+                    raise psutil.NoSuchProcess(pid)
+                with p.oneshot():
+                    t = p.cpu_times()
+                    rec[2] = t.user + t.system
+                    rec[4] = max(rec[4], p.memory_info().rss)
+                    try:
+                        io = p.io_counters()
+                        rec[3] = io.read_bytes + io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        pass
+            except psutil.Error:
+                rec[1] = None   # gone: keep its last counters
+        with self._lock:
+            self._procs = procs
+            if now >= closes:
+                self._final = True
+        return self._final
+
+    def _match(self, pid, p, created, units, names, procs):
+        try:
+            parent = procs.get(p.ppid())
+        except psutil.Error:
+            return None
+        # spawned by a startup process within the measured window
+        if parent is not None and created <= max(self._anchors.values()) + self.measure:
+            return parent[0]
+        unit = _cgroup_unit(pid) if units else None
+        hit = units.get(unit) if unit else None
+        if hit is None:
+            try:
+                hit = names.get(p.name().lower())
+                if hit is None:
+                    # comm is cut at 15 chars; the exe name is not
+                    hit = names.get(os.path.basename(p.exe()).lower())
+            except psutil.Error:
+                return None
+        if hit is None:
+            return None
+        entry_id, anchor = hit
+        start = self._anchors[anchor]
+        return entry_id if start - 1.0 <= created <= start + self.spawn else None
+
+    # ----- results
+    def results(self):
+        """entry id -> {"cpu", "io", "rss", "procs", "impact", "final", "partial"}.
+
+        impact is None for partial measurements (started after the window).
+        """
+        with self._lock:
+            out = {}
+            for entry_id, created, cpu, io, rss in self._procs.values():
+                r = out.setdefault(entry_id, {"cpu": 0.0, "io": 0, "rss": 0, "procs": 0})
+                r["cpu"] += cpu
+                r["io"] += io
+                r["rss"] += rss
+                r["procs"] += 1
+            for r in out.values():
+                r["impact"] = None if self._partial else rank(r["cpu"], r["io"])
+                r["final"] = self._final
+                r["partial"] = self._partial
+            return out
+
+
+_tracker = None
+
+
+def get_tracker():
+    global _tracker
+    if _tracker is None:
+        _tracker = ImpactTracker()
+    return _tracker
@@ -0,0 +1,415 @@
+# modules/startup/linux.py
+# Linux startup entries: XDG autostart, systemd units and @reboot cron jobs.
+#
+# Directory listings are cached by the directory's mtime and parsed files by
+# their own (mtime, size), so a refresh stats the known paths and re-parses
+# only what changed. Enabling/disabling never deletes anything; it writes an
+# override the respective mechanism already understands:
+#
+#   xdg      ~/.config/autostart/<name>.desktop copy with Hidden= and
+#            X-GNOME-Autostart-enabled= set (shadows the system entry)
+#   systemd  units installed locally (~/.config/systemd/user, /etc/...): their
+#            *.target.wants symlinks are removed and remembered in
+#            units_state_path() so Enable can put them back; units shipped
+#            in /usr/lib or /lib get a mask (symlink to /dev/null) instead
+#   cron     the @reboot line commented out with DISABLED_MARK
+import json
+import os
+import re
+import subprocess
+import threading
+
+DISABLED_MARK = "#sysmon-disabled# "
+_FIELD_CODE = re.compile(r"\s%[fFuUdDnNickvm]\b|%%")
+_VENDOR_UNIT_DIRS = ("/usr/lib/", "/lib/")    # package-owned unit files: masked, never edited
+
+
+def _config_home():
+    return os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+
+
+def _config_dirs():
+    return [d for d in (os.environ.get("XDG_CONFIG_DIRS") or "/etc/xdg").split(":") if d]
+
+
+def units_state_path():
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "sysmon", "disabled_units.json")
+
+
+def _current_desktops():
+    return {d.lower() for d in os.environ.get("XDG_CURRENT_DESKTOP", "").split(":") if d}
+
+
+def _write_atomic(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# --------------------------------------------------
+# PARSERS
+# --------------------------------------------------
+def parse_ini(text, group):
+    """key -> value for one [group] of a .desktop / unit file (first value wins)."""
+    values = {}
+    current = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            current = line[1:-1]
+            continue
+        if current != group or "=" not in line:
+            continue
+        key, _, value = line.partition("=")
+        values.setdefault(key.strip(), value.strip())
+    return values
+
+
+def set_desktop_keys(text, updates):
+    """text with `updates` set inside [Desktop Entry] (replaced or appended)."""
+    lines = text.splitlines()
+    start = end = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped == "[Desktop Entry]":
+            start = i
+        elif start is not None and stripped.startswith("[") and stripped.endswith("]"):
+            end = i
+            break
+    if start is None:
+        lines.insert(0, "[Desktop Entry]")
+        start = 0
+    end = len(lines) if end is None else end
+    pending = dict(updates)
+    for i in range(start + 1, end):
+        key = lines[i].split("=", 1)[0].strip()
+        if "=" in lines[i] and key in pending:
+            lines[i] = f"{key}={pending.pop(key)}"
+    # after the group's last non-blank line
+    at = end
+    while at > start + 1 and not lines[at - 1].strip():
+        at -= 1
+    lines[at:at] = [f"{k}={v}" for k, v in pending.items()]
+    return "\n".join(lines) + "\n"
+
+
+def _desktop_entry(path, text):
+    d = parse_ini(text, "Desktop Entry")
+    hidden = d.get("Hidden", "").lower() == "true"
+    gnome_off = d.get("X-GNOME-Autostart-enabled", "").lower() == "false"
+    status = "Yes"
+    if hidden or gnome_off:
+        status = "No"
+    else:
+        here = _current_desktops()
+        only = {x.lower() for x in d.get("OnlyShowIn", "").split(";") if x}
+        never = {x.lower() for x in d.get("NotShowIn", "").split(";") if x}
+        if here and ((only and not only & here) or never & here):
+            status = "No (other desktop)"
+    # drop field codes (%f, %U ...), but %% is a literal %
+    exec_line = _FIELD_CODE.sub(lambda m: "%" if m.group() == "%%" else "", d.get("Exec", "")).strip()
+    name = os.path.basename(path)[:-len(".desktop")]
+    return {"kind": "xdg", "name": d.get("Name") or name, "file": os.path.basename(path),
+            "command": exec_line, "enabled": status == "Yes", "status": status}
+
+
+def _unit_entry(unit, text):
+    unit_values = parse_ini(text, "Unit")
+    kind = unit.rsplit(".", 1)[-1].capitalize()
+    exec_line = parse_ini(text, kind).get("ExecStart", "") if kind == "Service" else ""
+    # ExecStart prefixes: - (ignore failure), @ (argv0), : + ! (privileges)
+    return {"command": exec_line.lstrip("-@:+!").strip(),
+            "description": unit_values.get("Description", "")}
+
+
+_CRON_REBOOT = re.compile(r"^\s*@reboot\s+(.*\S)\s*$")
+
+
+def parse_reboot_lines(text, with_user=False):
+    """[(line, command, enabled)] for every @reboot line, including disabled ones."""
+    out = []
+    for line in text.splitlines():
+        enabled = True
+        body = line
+        if line.startswith(DISABLED_MARK):
+            enabled, body = False, line[len(DISABLED_MARK):]
+        m = _CRON_REBOOT.match(body)
+        if not m:
+            continue
+        command = m.group(1)
+        if with_user:   # /etc/crontab, /etc/cron.d: "@reboot user command"
+            command = command.split(None, 1)[-1]
+        out.append((line, command, enabled))
+    return out
+
+
+# --------------------------------------------------
+# SCANNER
+# --------------------------------------------------
+class LinuxStartup:
+    def __init__(self, config_home=None, config_dirs=None, systemd_user_dirs=None,
+                 systemd_system_dirs=None, cron_files=None, user_crontab=True, state_path=None):
+        home = config_home or _config_home()
+        self.user_autostart = os.path.join(home, "autostart")
+        self.system_autostart = [os.path.join(d, "autostart") for d in (config_dirs or _config_dirs())]
+        # enabled units are the *.wants symlinks; the first dir is where masks go
+        self.systemd_dirs = {
+            "systemd-user": systemd_user_dirs or [os.path.join(home, "systemd", "user"), "/etc/systemd/user"],
+            "systemd": systemd_system_dirs or ["/etc/systemd/system"],
+        }
+        self.cron_files = cron_files if cron_files is not None else ["/etc/crontab", "/etc/cron.d"]
+        self.user_crontab = user_crontab
+        self.state_path = state_path or units_state_path()
+        self._lock = threading.Lock()
+        self._listings = {}   # dir -> (mtime_ns, names)
+        self._parsed = {}     # file -> ((mtime_ns, size), result)
+        self._crontab = (None, "")
+
+    # ----- caches
+    def _list(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self._listings.pop(path, None)
+            return []
+        cached = self._listings.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                names = sorted(os.listdir(path))
+            except OSError:
+                names = []
+            cached = self._listings[path] = (mtime, names)
+        return cached[1]
+
+    def _parse(self, path, parser):
+        """parser(path, text) for path, re-run only when the file changed."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._parsed.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                result = parser(path, f.read())
+        except OSError:
+            result = None
+        self._parsed[path] = (key, result)
+        return result
+
+    # ----- discovery
+    def scan(self):
+        """Every startup entry as a dict (kind, id, name, command, location, enabled, status)."""
+        with self._lock:
+            return self._scan_xdg() + self._scan_systemd() + self._scan_cron()
+
+    def _scan_xdg(self):
+        # a file in an earlier (user) dir shadows the same name in later ones
+        seen = {}
+        for d in [self.user_autostart] + self.system_autostart:
+            for name in self._list(d):
+                if name.endswith(".desktop") and name not in seen:
+                    path = os.path.join(d, name)
+                    entry = self._parse(path, _desktop_entry)
+                    if entry is not None:
+                        seen[name] = dict(entry, id=f"xdg:{name}", location=path, path=path)
+        return list(seen.values())
+
+    def _disabled_units(self):
+        """{entry id: {"kind", "unit", "path", "links": [[wants dir, link target]]}} we disabled."""
+        def parse(path, text):
+            try:
+                data = json.loads(text)
+            except ValueError:
+                return {}
+            return data if isinstance(data, dict) else {}
+        return self._parse(self.state_path, parse) or {}
+
+    def _save_disabled_units(self, units):
+        _write_atomic(self.state_path, json.dumps(units, indent=1))
+        self._parsed.pop(self.state_path, None)
+
+    def _masked(self, kind, unit):
+        return any(os.path.realpath(os.path.join(d, unit)) == os.devnull
+                   for d in self.systemd_dirs[kind])
+
+    def _scan_systemd(self):
+        out = []
+        for kind, dirs in self.systemd_dirs.items():
+            seen = set()
+            for base in dirs:
+                for sub in self._list(base):
+                    if not sub.endswith(".target.wants"):
+                        continue
+                    wants = os.path.join(base, sub)
+                    for unit in self._list(wants):
+                        if unit in seen:
+                            continue
+                        seen.add(unit)
+                        target = os.path.realpath(os.path.join(wants, unit))
+                        info = self._parse(target, lambda p, t, u=unit: _unit_entry(u, t)) or {}
+                        enabled = not self._masked(kind, unit)
+                        out.append({"kind": kind, "id": f"{kind}:{unit}", "name": unit,
+                                    # sockets/timers have no ExecStart: show what they are
+                                    "command": info.get("command") or info.get("description", ""),
+                                    "description": info.get("description", ""),
+                                    "location": f"{sub} ({base})", "path": target, "unit": unit,
+                                    "enabled": enabled, "status": "Yes" if enabled else "No (masked)"})
+            # disabled here: no wants link any more, only our record of it
+            for rec in self._disabled_units().values():
+                if rec.get("kind") != kind or rec.get("unit") in seen:
+                    continue
+                unit, target = rec["unit"], rec["path"]
+                seen.add(unit)
+                info = self._parse(target, lambda p, t, u=unit: _unit_entry(u, t)) or {}
+                out.append({"kind": kind, "id": f"{kind}:{unit}", "name": unit,
+                            "command": info.get("command") or info.get("description", ""),
+                            "description": info.get("description", ""),
+                            "location": ", ".join(f"{os.path.basename(w)} ({os.path.dirname(w)})"
+                                                  for w, _ in rec["links"]),
+                            "path": target, "unit": unit, "enabled": False, "status": "No"})
+        return out
+
+    def _read_crontab(self):
+        # the spool dir's mtime changes whenever crontab(1) installs a new table
+        key = None
+        for spool in ("/var/spool/cron/crontabs", "/var/spool/cron"):
+            try:
+                key = os.stat(spool).st_mtime_ns
+                break
+            except OSError:
+                continue
+        if key is not None and self._crontab[0] == key:
+            return self._crontab[1]
+        try:
+            text = subprocess.run(["crontab", "-l"], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            text = ""
+        self._crontab = (key, text)
+        return text
+
+    def _scan_cron(self):
+        out = []
+        if self.user_crontab:
+            for line, command, enabled in parse_reboot_lines(self._read_crontab()):
+                out.append(self._cron_entry("crontab", "crontab -l", line, command, enabled))
+        files = []
+        for path in self.cron_files:
+            if os.path.isdir(path):
+                files.extend(os.path.join(path, n) for n in self._list(path) if not n.startswith("."))
+            else:
+                files.append(path)
+        for path in files:
+            for line, command, enabled in self._parse(path, lambda p, t: parse_reboot_lines(t, True)) or ():
+                out.append(self._cron_entry("cron", path, line, command, enabled))
+        return out
+
+    @staticmethod
+    def _cron_entry(kind, location, line, command, enabled):
+        name = os.path.basename(command.split()[0]) if command.strip() else command
+        return {"kind": kind, "id": f"{kind}:{location}:{line}", "name": f"@reboot {name}",
+                "command": command, "location": location, "path": location, "line": line,
+                "enabled": enabled, "status": "Yes" if enabled else "No"}
+
+    # ----- enable / disable
+    def set_enabled(self, entry, enabled):
+        """Write the override for one scanned entry. Raises OSError on failure."""
+        with self._lock:
+            kind = entry["kind"]
+            if kind == "xdg":
+                self._set_xdg(entry, enabled)
+            elif kind in ("systemd", "systemd-user"):
+                self._set_unit(entry, enabled)
+            elif kind in ("crontab", "cron"):
+                self._set_cron(entry, enabled)
+            else:
+                raise OSError(f"cannot change {kind} entries")
+
+    def _set_xdg(self, entry, enabled):
+        with open(entry["path"], encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        value = "true" if enabled else "false"
+        text = set_desktop_keys(text, {"Hidden": "false" if enabled else "true",
+                                       "X-GNOME-Autostart-enabled": value})
+        # always the user dir: system entries get a shadowing copy
+        _write_atomic(os.path.join(self.user_autostart, entry["file"]), text)
+
+    def _set_unit(self, entry, enabled):
+        kind, unit = entry["kind"], entry["unit"]
+        mask = os.path.join(self.systemd_dirs[kind][0], unit)
+        masked = os.path.islink(mask) and os.path.realpath(mask) == os.devnull
+        units = dict(self._disabled_units())
+        rec = units.get(entry["id"])
+        if enabled:
+            if masked:
+                os.unlink(mask)
+            if rec is not None:
+                for wants, target in rec["links"]:
+                    link = os.path.join(wants, unit)
+                    if not os.path.lexists(link):
+                        os.makedirs(wants, exist_ok=True)
+                        os.symlink(target, link)
+                del units[entry["id"]]
+                self._save_disabled_units(units)
+            return
+        if masked or rec is not None:
+            return   # already disabled
+        if entry["path"].startswith(_VENDOR_UNIT_DIRS):
+            if os.path.lexists(mask):
+                raise OSError(f"{mask} exists and is not a mask")
+            os.makedirs(os.path.dirname(mask), exist_ok=True)
+            os.symlink(os.devnull, mask)
+            return
+        # a local unit: the mask would have to replace the unit file itself,
+        # so take out its wants links (recorded first, so Enable can restore them)
+        links = []
+        for base in self.systemd_dirs[kind]:
+            for sub in self._list(base):
+                link = os.path.join(base, sub, unit)
+                if sub.endswith(".target.wants") and os.path.islink(link):
+                    links.append([os.path.join(base, sub), os.readlink(link)])
+        if not links:
+            raise OSError(f"no .wants link found for {unit}")
+        units[entry["id"]] = {"kind": kind, "unit": unit, "path": entry["path"], "links": links}
+        self._save_disabled_units(units)
+        for wants, _ in links:
+            os.unlink(os.path.join(wants, unit))
+
+    def _set_cron(self, entry, enabled):
+        line = entry["line"]
+        body = line[len(DISABLED_MARK):] if line.startswith(DISABLED_MARK) else line
+        new = body if enabled else DISABLED_MARK + body
+        if entry["kind"] == "crontab":
+            text = subprocess.run(["crontab", "-l"], capture_output=True, text=True, timeout=5).stdout
+        else:
+            with open(entry["path"], encoding="utf-8") as f:
+                text = f.read()
+        lines = text.splitlines()
+        if line not in lines:
+            raise OSError("the cron line changed since it was listed")
+        lines[lines.index(line)] = new
+        text = "\n".join(lines) + "\n"
+        if entry["kind"] == "crontab":
+            done = subprocess.run(["crontab", "-"], input=text, capture_output=True, text=True, timeout=5)
+            if done.returncode:
+                raise OSError(done.stderr.strip() or "crontab failed")
+            self._crontab = (None, "")
+        else:
+            _write_atomic(entry["path"], text)
+
+
+_scanner = None
+
+
+def get_scanner():
+    global _scanner
+    if _scanner is None:
+        _scanner = LinuxStartup()
+    return _scanner
@@ -1,14 +1,15 @@
 # modules/startup/ui.py
 import os
 import platform
+import subprocess
 import threading
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from modules.startup import backend, impact
+
 IS_WINDOWS = platform.system() == "Windows"
-if IS_WINDOWS:
-    import winreg
 
 # THEME A COLORS
 BG_MAIN = "#0f0e0f"
@@ -22,19 +23,21 @@ NEON_CYAN = "#00FFD6"
 GLOW = "#146B84" 
 
 CORNER = 12
+IMPACT_REFRESH_MS = 5000   # while boot/login impact is still being measured
+_IMPACT_ORDER = {"high": 0, "medium": 1, "low": 2}
 
 
 class StartupUI(ctk.CTkFrame):
-    def _init_(self, parent, *args, **kwargs):
-        super()._init_(parent, fg_color=BG_MAIN)
+    def __init__(self, parent, *args, **kwargs):
+        super().__init__(parent, fg_color=BG_MAIN)
         self.parent = parent
+        self.entries = {}      # tree iid -> entry dict from the backend
+        self._loading = False
+        self._visible = False
+        self._impact_job = None
         self.pack(fill="both", expand=True)
         self._build_ui()
-
-        if IS_WINDOWS:
-            self.load_entries()
-        else:
-            self.tree.insert("", "end", values=("Not supported", "", "", ""))
+        self.load_entries()
 
     # --------------------------------------------------
     # BUILD UI
@@ -54,9 +57,12 @@ class StartupUI(ctk.CTkFrame):
         top.pack(fill="x", padx=padx, pady=(4, 16))
 
         self.btn_refresh = ctk.CTkButton(top, text="Refresh", width=125, command=self.load_entries)
-        self.btn_enable = ctk.CTkButton(top, text="Enable", width=125, fg_color="#00d29c")
-        self.btn_disable = ctk.CTkButton(top, text="Disable", width=125, fg_color="#e66b6b")
-        self.btn_open = ctk.CTkButton(top, text="Open Location", width=150, fg_color=NEON_ACCENT)
+        self.btn_enable = ctk.CTkButton(top, text="Enable", width=125, fg_color="#00d29c",
+                                        command=self._enable_selected)
+        self.btn_disable = ctk.CTkButton(top, text="Disable", width=125, fg_color="#e66b6b",
+                                         command=self._disable_selected)
+        self.btn_open = ctk.CTkButton(top, text="Open Location", width=150, fg_color=NEON_ACCENT,
+                                      command=self._open_location_selected)
 
         self.btn_refresh.grid(row=0, column=0, padx=(0,12))
         self.btn_enable.grid(row=0, column=1, padx=(0,12))
@@ -78,7 +84,7 @@ class StartupUI(ctk.CTkFrame):
         table = ctk.CTkFrame(inner, fg_color="transparent")
         table.pack(fill="both", expand=True, padx=12, pady=8)
 
-        cols = ("name", "command", "location", "enabled")
+        cols = ("name", "command", "location", "enabled", "impact")
         self.tree = ttk.Treeview(table, columns=cols, show="headings")
 
         # Headings
@@ -86,12 +92,14 @@ class StartupUI(ctk.CTkFrame):
         self.tree.heading("command", text="Command")
         self.tree.heading("location", text="Location")
         self.tree.heading("enabled", text="Enabled")
+        self.tree.heading("impact", text="Impact")
 
         # Columns width
         self.tree.column("name", width=220, anchor="w")
-        self.tree.column("command", width=650, anchor="w")
+        self.tree.column("command", width=540, anchor="w")
         self.tree.column("location", width=250, anchor="w")
         self.tree.column("enabled", width=80, anchor="center")
+        self.tree.column("impact", width=130, anchor="center")
 
         # Scrollbars
         vsb = ttk.Scrollbar(table, orient="vertical", command=self.tree.yview)
@@ -126,48 +134,93 @@ class StartupUI(ctk.CTkFrame):
     # LOAD ENTRIES
     # --------------------------------------------------
     def load_entries(self):
+        # scanning (file parsing, crontab -l) runs off the Tk thread;
+        # only _populate touches the tree
+        if self._loading:
+            return
+        self._loading = True
         threading.Thread(target=self._worker, daemon=True).start()
 
     def _worker(self):
-        if not IS_WINDOWS:
+        try:
+            entries = backend.list_startup_apps()
+        except Exception:
+            entries = []
+        self.after(0, self._populate, entries)
+
+    def _populate(self, entries):
+        self._loading = False
+        selected = self.tree.selection()
+        self.tree.delete(*self.tree.get_children())
+        self.entries = {}
+        results = impact.get_tracker().results()
+
+        def order(e):
+            r = results.get(e["id"])
+            return not e["enabled"], _IMPACT_ORDER.get(r and r["impact"], 3), e["name"].lower()
+
+        entries.sort(key=order)
+        if not entries:
+            self.tree.insert("", "end", values=("No startup entries found", "", "", "", ""))
             return
-
-        # Clear table
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-
-        run_keys = [
-            (winreg.HKEY_CURRENT_USER,  r"Software\Microsoft\Windows\CurrentVersion\Run"),
-            (winreg.HKEY_LOCAL_MACHINE, r"Software\Microsoft\Windows\CurrentVersion\Run")
-        ]
-
-        entries = []
-        seen = set()
-
-        for root, path in run_keys:
-            try:
-                with winreg.OpenKey(root, path) as k:
-                    i = 0
-                    while True:
-                        try:
-                            name, value, _ = winreg.EnumValue(k, i)
-                            if name not in seen:
-                                seen.add(name)
-                                loc = "HKCU" if root == winreg.HKEY_CURRENT_USER else "HKLM"
-                                entries.append((name, value, f"{loc}:{path}", "Yes"))
-                            i += 1
-                        except OSError:
-                            break
-            except:
+        for idx, e in enumerate(entries):
+            tag = "even" if idx % 2 == 0 else "odd"
+            iid = e["id"]
+            if iid in self.entries:
                 continue
+            self.entries[iid] = e
+            self.tree.insert("", "end", iid=iid, tags=(tag,),
+                             values=(e["name"], e["command"], e["location"], e["status"],
+                                     self._impact_label(results.get(iid))))
+        keep = [i for i in selected if i in self.entries]
+        if keep:
+            self.tree.selection_set(keep)
+        self._schedule_impact()
 
-        # Sort by name
-        entries.sort(key=lambda x: x[0].lower())
+    # --------------------------------------------------
+    # IMPACT
+    # --------------------------------------------------
+    @staticmethod
+    def _impact_label(result):
+        if result is None:
+            return "—"
+        if result["impact"] is None:
+            return "Not measured"   # dashboard started after the login window
+        label = f"{result['impact'].capitalize()} ({result['cpu']:.1f} s)"
+        if not result["final"]:
+            label += " …"      # still measuring
+        return label
+
+    def _schedule_impact(self):
+        if self._impact_job is None and self._visible and impact.get_tracker().measuring():
+            self._impact_job = self.after(IMPACT_REFRESH_MS, self._refresh_impact)
+
+    def _refresh_impact(self):
+        self._impact_job = None
+        results = impact.get_tracker().results()
+        for iid in self.entries:
+            self.tree.set(iid, "impact", self._impact_label(results.get(iid)))
+        self._schedule_impact()
 
-        # Insert into table
-        for idx, e in enumerate(entries):
-            tag = "even" if idx % 2 == 0 else "odd"
-            self.tree.insert("", "end", values=e, tags=(tag,))
+    # --------------------------------------------------
+    # LIFECYCLE
+    # --------------------------------------------------
+    def start(self):
+        self._visible = True
+        self._schedule_impact()
+
+    def pause(self):
+        self._visible = False
+        if self._impact_job is not None:
+            self.after_cancel(self._impact_job)
+            self._impact_job = None
+
+    def resume(self):
+        self._visible = True
+        self._refresh_impact()
+
+    def dispose(self):
+        self.pause()
 
     # --------------------------------------------------
     # BUTTON ACTIONS
@@ -176,29 +229,52 @@ class StartupUI(ctk.CTkFrame):
         sel = self.tree.selection()
         if not sel:
             return None
-        return self.tree.item(sel[0])["values"]
+        return self.entries.get(sel[0])
 
     def _open_location_selected(self):
-        row = self._get_selected()
-        if not row:
+        entry = self._get_selected()
+        if not entry:
             return
 
-        cmd = row[1]
-        if '"' in cmd:
-            try:
-                path = cmd.split('"')[1]
-            except:
-                path = cmd
-        else:
-            path = cmd.split(" ")[0]
-
-        if os.path.exists(path):
+        path = entry.get("path") or ""
+        if not os.path.exists(path):
+            cmd = entry["command"]
+            if '"' in cmd:
+                try:
+                    path = cmd.split('"')[1]
+                except:
+                    path = cmd
+            else:
+                path = cmd.split(" ")[0]
+
+        if not os.path.exists(path):
+            messagebox.showwarning("Not Found", f"Cannot open:\n{path}")
+        elif IS_WINDOWS:
             os.startfile(os.path.dirname(path))
         else:
-            messagebox.showwarning("Not Found", f"Cannot open:\n{path}")
+            subprocess.Popen(["xdg-open", os.path.dirname(path)], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL)
+
+    def _set_selected(self, enabled):
+        entry = self._get_selected()
+        if not entry or entry["enabled"] == enabled:
+            return
+
+        def work():
+            ok = (backend.enable_startup if enabled else backend.disable_startup)(entry)
+            self.after(0, self._after_change, entry, enabled, ok)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _after_change(self, entry, enabled, ok):
+        if not ok:
+            action = "enable" if enabled else "disable"
+            messagebox.showwarning("Startup Apps", f"Could not {action} {entry['name']}.\n"
+                                   "System-wide entries need administrator rights.")
+        self.load_entries()
 
     def _enable_selected(self):
-        messagebox.showinfo("Info", "Enable requires registry write. I can add this safely if you want.")
+        self._set_selected(True)
 
     def _disable_selected(self):
-        messagebox.showinfo("Info", "Disable requires registry write. I can add this safely if you want.")
+        self._set_selected(False)
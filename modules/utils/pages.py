@@ -0,0 +1,76 @@
+# modules/utils/pages.py
+# Keeps every page alive after its first visit and only hides/shows it.
+#
+# Page lifecycle (all optional on the page object):
+#   start()   - called once, right after the page is built
+#   pause()   - page is hidden: stop sampling and rendering
+#   resume()  - page is visible again
+#   dispose() - app is closing: release everything
+#
+# Factories may be "package.module:Class" strings; the module is then only
+# imported when the page is first shown (or preloaded after first paint).
+import importlib
+import customtkinter as ctk
+from modules.utils import startup_profile
+
+
+def _call(page, method):
+    fn = getattr(page, method, None)
+    if fn is not None:
+        fn()
+
+
+class PageManager:
+    def __init__(self, container, factories):
+        """factories: {name: callable(parent_frame) -> page, or "module:attr"}"""
+        self.container = container
+        self.factories = dict(factories)
+        self.frames = {}
+        self.pages = {}
+        self.current = None
+
+    def show(self, name):
+        if name == self.current:
+            return self.pages[name]
+        if self.current is not None:
+            _call(self.pages[self.current], "pause")
+            self.frames[self.current].pack_forget()
+
+        if name in self.pages:
+            self.frames[name].pack(fill="both", expand=True)
+            _call(self.pages[name], "resume")
+        else:
+            frame = ctk.CTkFrame(self.container, fg_color="transparent", corner_radius=0)
+            frame.pack(fill="both", expand=True)
+            self.frames[name] = frame
+            factory = self.load(name)
+            with startup_profile.phase(f"build page {name}"):
+                self.pages[name] = factory(frame)
+                _call(self.pages[name], "start")
+        self.current = name
+        return self.pages[name]
+
+    def load(self, name):
+        """Resolve (importing if needed) the factory of a page without building it."""
+        factory = self.factories[name]
+        if isinstance(factory, str):
+            module, _, attr = factory.partition(":")
+            with startup_profile.phase(f"import {module}"):
+                factory = getattr(importlib.import_module(module), attr)
+            self.factories[name] = factory
+        return factory
+
+    def pending(self):
+        """Pages whose module has not been imported yet."""
+        return [name for name, f in self.factories.items() if isinstance(f, str)]
+
+    def dispose(self):
+        for name, page in self.pages.items():
+            try:
+                _call(page, "dispose")
+            except Exception:
+                pass
+            self.frames[name].destroy()
+        self.pages.clear()
+        self.frames.clear()
+        self.current = None
@@ -0,0 +1,145 @@
+# modules/utils/sampler.py
+# One background collector shared by every page.
+#
+# Sources (a name + a function returning a snapshot) are registered once with
+# their own interval. A single thread wakes up every tick, calls each *due*
+# source exactly once and publishes the snapshot to all subscribers. Sources
+# with no subscribers are never sampled, so hidden pages cost nothing.
+import threading
+import time
+
+TICK = 0.25          # scheduler resolution (seconds)
+MAX_LOAD = 0.25      # max fraction of wall time a single source may use
+
+
+class _Source:
+    __slots__ = ("name", "fn", "interval", "next_due", "subscribers", "latest", "cost")
+
+    def __init__(self, name, fn, interval):
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.next_due = 0.0
+        self.subscribers = []
+        self.latest = None
+        self.cost = 0.0  # smoothed seconds spent per call
+
+
+class Sampler:
+    def __init__(self, tick=TICK, max_load=MAX_LOAD):
+        self.tick = tick
+        self.max_load = max_load
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # --------------------------------------------------
+    # REGISTRATION
+    # --------------------------------------------------
+    def add_source(self, name, fn, interval=TICK):
+        with self._lock:
+            if name in self._sources:
+                return
+            self._sources[name] = _Source(name, fn, interval)
+
+    def set_interval(self, name, interval):
+        with self._lock:
+            src = self._sources[name]
+            src.interval = interval
+            src.next_due = 0.0
+        self._wake.set()
+
+    def subscribe(self, name, callback):
+        """Call callback(snapshot) from the sampler thread on every sample of `name`."""
+        with self._lock:
+            src = self._sources[name]
+            if callback not in src.subscribers:
+                src.subscribers.append(callback)
+            src.next_due = 0.0
+        self._ensure_running()
+        self._wake.set()
+
+    def unsubscribe(self, name, callback):
+        with self._lock:
+            src = self._sources.get(name)
+            if src and callback in src.subscribers:
+                src.subscribers.remove(callback)
+
+    def latest(self, name):
+        src = self._sources.get(name)
+        return src.latest if src else None
+
+    def stats(self):
+        """Per source: (interval, effective interval, avg cost in seconds, subscribers)."""
+        with self._lock:
+            return {s.name: (s.interval, self._effective_interval(s), s.cost, len(s.subscribers))
+                    for s in self._sources.values()}
+
+    # --------------------------------------------------
+    # SCHEDULER
+    # --------------------------------------------------
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="sampler", daemon=True)
+            self._thread.start()
+
+    def _effective_interval(self, src):
+        # stretch the interval of sources that are too expensive for their rate
+        if self.max_load and src.cost > 0:
+            return max(src.interval, src.cost / self.max_load)
+        return src.interval
+
+    def _loop(self):
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                due = [s for s in self._sources.values()
+                       if s.subscribers and s.next_due <= now]
+            for src in due:
+                started = time.monotonic()
+                try:
+                    snapshot = src.fn()
+                except Exception:
+                    snapshot = None
+                elapsed = time.monotonic() - started
+                src.cost = elapsed if src.cost == 0 else src.cost * 0.8 + elapsed * 0.2
+                src.next_due = started + self._effective_interval(src)
+                if snapshot is None:
+                    continue
+                src.latest = snapshot
+                with self._lock:
+                    subscribers = list(src.subscribers)
+                for cb in subscribers:
+                    try:
+                        cb(snapshot)
+                    except Exception:
+                        pass
+
+            with self._lock:
+                active = [s.next_due for s in self._sources.values() if s.subscribers]
+            if active:
+                timeout = max(0.0, min(min(active) - time.monotonic(), self.tick))
+            else:
+                timeout = None  # nothing to do until someone subscribes
+            self._wake.wait(timeout)
+            self._wake.clear()
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler():
+    """Process-wide sampler with the built-in performance, device and process sources."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            from modules.performance import backend as perf_backend
+            from modules.performance import devices
+            from modules.processes import backend as proc_backend
+            _sampler = Sampler()
+            _sampler.add_source("performance", perf_backend.sample, perf_backend.SAMPLE_INTERVAL)
+            _sampler.add_source("devices", devices.sample, devices.SAMPLE_INTERVAL)
+            _sampler.add_source("processes", proc_backend.sample_processes, proc_backend.SAMPLE_INTERVAL)
+        return _sampler
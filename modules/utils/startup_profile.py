@@ -0,0 +1,117 @@
+# modules/utils/startup_profile.py
+# --profile-startup: where does cold start time go?
+#
+# An import hook times the execution of every module imported after
+# install() (self time = own body, excluding nested imports), and phase()
+# marks time construction steps such as building the window or a page.
+# report() groups imports by top-level package so a regression in e.g.
+# matplotlib or our own modules is easy to spot.
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+
+_t0 = time.perf_counter()
+_imports = []       # (module name, total seconds, self seconds)
+_phases = []        # (name, start offset, seconds)
+_stack = []         # child time accumulated per active import
+_installed = None
+
+
+class _TimingLoader(importlib.abc.Loader):
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        _stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            children = _stack.pop()
+            if _stack:
+                _stack[-1] += total
+            _imports.append((module.__name__, total, total - children))
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader)
+                return spec
+        return None
+
+
+def install(start=None):
+    """Start recording imports; `start` is the perf_counter() taken at process start."""
+    global _installed, _t0
+    if start is not None:
+        _t0 = start
+    if _installed is None:
+        _installed = _TimingFinder()
+        sys.meta_path.insert(0, _installed)
+
+
+def enabled():
+    return _installed is not None
+
+
+def elapsed():
+    return time.perf_counter() - _t0
+
+
+@contextmanager
+def phase(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _installed is not None:
+            _phases.append((name, start - _t0, time.perf_counter() - start))
+
+
+def mark(name):
+    """Record a point in time (e.g. first paint) as a zero-length phase."""
+    if _installed is not None:
+        _phases.append((name, elapsed(), 0.0))
+
+
+def report(budget_ms=None, top=15):
+    """Text report; returns (text, within_budget)."""
+    by_package = {}
+    for name, _total, self_time in _imports:
+        pkg = name.split(".")[0]
+        if pkg == "modules":
+            pkg = ".".join(name.split(".")[:2])
+        by_package[pkg] = by_package.get(pkg, 0.0) + self_time
+
+    lines = ["startup profile", "---------------", "phases (offset from process start):"]
+    for name, offset, seconds in _phases:
+        took = f"{seconds * 1000:8.1f} ms" if seconds else "        -  "
+        lines.append(f"  {offset * 1000:8.1f} ms  {took}  {name}")
+
+    lines.append(f"imports by package ({len(_imports)} modules, self time):")
+    for pkg, seconds in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"  {seconds * 1000:8.1f} ms  {pkg}")
+    lines.append("slowest modules (including their imports):")
+    for name, total, _self in sorted(_imports, key=lambda r: -r[1])[:top]:
+        lines.append(f"  {total * 1000:8.1f} ms  {name}")
+
+    paint = next((offset for name, offset, _ in _phases if name == "first paint"), None)
+    ok = True
+    if budget_ms is not None and paint is not None:
+        ok = paint * 1000 <= budget_ms
+        lines.append(f"first paint {paint * 1000:.0f} ms, budget {budget_ms:.0f} ms: {'OK' if ok else 'OVER BUDGET'}")
+    return "\n".join(lines), ok